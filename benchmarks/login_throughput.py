@@ -0,0 +1,84 @@
+"""Login throughput per KDF cost setting.
+
+Drives the same ``verify_password`` the login page calls, so every KDF runs on
+the shared pool bounded by ``HASH_WORKERS``. ``--sessions`` concurrent session
+threads submit logins; ``--hash-workers`` sets the pool size for each run.
+
+Columns: ``logins/s`` is throughput, ``wait ms`` the mean time a session
+waited for ``verify_password`` (queueing included), and ``kdf ms`` the time one
+worker spends per login (workers / throughput), i.e. the KDF cost itself.
+
+Run from the project root:
+
+    python -m benchmarks.login_throughput [--logins 64] [--sessions 16] [--hash-workers 1 2 4]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import time
+
+from src.Tools import password_hashing
+from src.Tools.password_hashing import (
+    PBKDF2_ALGORITHM,
+    SCRYPT_ALGORITHM,
+    _legacy_hash,
+    hash_password_sync,
+    set_hash_workers,
+    verify_password,
+)
+
+COST_SETTINGS = [
+    ("legacy sha256", None, None),
+    (PBKDF2_ALGORITHM, PBKDF2_ALGORITHM, 100_000),
+    (PBKDF2_ALGORITHM, PBKDF2_ALGORITHM, 260_000),
+    (PBKDF2_ALGORITHM, PBKDF2_ALGORITHM, 600_000),
+    (SCRYPT_ALGORITHM, SCRYPT_ALGORITHM, 14),
+    (SCRYPT_ALGORITHM, SCRYPT_ALGORITHM, 15),
+]
+
+
+def stored_hash_for(password: str, algorithm: str | None, cost: int | None) -> str:
+    if algorithm is None:
+        return _legacy_hash(password)
+    return hash_password_sync(password, algorithm=algorithm, cost=cost)
+
+
+def run(logins: int, sessions: int, algorithm: str | None, cost: int | None) -> tuple[float, float]:
+    """Return (logins per second, mean seconds a session waited per login)."""
+    password = "correct horse battery staple"
+    stored = stored_hash_for(password, algorithm, cost)
+
+    def login(_) -> float:
+        start = time.perf_counter()
+        assert verify_password(password, stored)
+        return time.perf_counter() - start
+
+    # Session threads only wait on verify_password; the KDF work itself is
+    # capped by the module's HASH_WORKERS pool, as in the app.
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        start = time.perf_counter()
+        waits = list(pool.map(login, range(logins)))
+        elapsed = time.perf_counter() - start
+    return logins / elapsed, sum(waits) / len(waits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--hash-workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{'kdf':<16}{'cost':>10}{'workers':>10}{'logins/s':>12}{'wait ms':>12}{'kdf ms':>12}")
+    for label, algorithm, cost in COST_SETTINGS:
+        for workers in args.hash_workers:
+            set_hash_workers(workers)
+            rate, wait = run(args.logins, args.sessions, algorithm, cost)
+            workers = password_hashing.HASH_WORKERS
+            print(
+                f"{label:<16}{str(cost or '-'):>10}{workers:>10}{rate:>12.1f}"
+                f"{1000 * wait:>12.1f}{1000 * workers / rate:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,89 @@
 from pathlib import Path
 from datetime import datetime
 import json
+import logging
 import os
+import time
+import uuid
 
 import gspread
+import numpy as np
 import pandas as pd
-import streamlit as st
 from google.oauth2.service_account import Credentials
 
+try:
+    from src.Database.circuit_breaker import CircuitBreaker
+    from src.Database.invalidation import TRANSACTIONS_TOPIC, has_pending_invalidation, publish_invalidation
+    from src.Database.outbox import get_outbox, idempotency_key
+    from src.Database.runtime import (
+        cache_clear,
+        cache_data,
+        cache_get,
+        cache_put,
+        cache_resource,
+        get_secrets,
+        observe_version,
+    )
+    from src.Database.snapshot_store import invalidate_snapshot, peek_snapshot, shared_snapshot
+    from src.Database.write_coordinator import SUBMISSIONS_SCOPE, get_write_coordinator
+    from src.Tools.data_clean import build_transaction_snapshot, clean_transaction_data, extract_week_numbers, freeze_frame
+    from src.Tools.fund_summary import (
+        SUMMARY_COLUMNS,
+        apply_contribution,
+        build_fund_summary,
+        build_member_payloads,
+        load_summary_file,
+        paid_weeks_from_bits,
+        save_summary_file,
+        summary_from_rows,
+        summary_path,
+        summary_row,
+        summary_to_rows,
+    )
+    from src.Tools.leaderboard import Leaderboard
+    from src.Tools.log_index import LogIndex
+    from src.Tools.member_registry import UNMATCHED, MemberCoverage, MemberRegistry, normalize_name
+    from src.Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
+    from src.Tools.projection import project_fund
+    from src.Tools.returns_allocation import allocate_returns, parse_return_events
+    from src.Tools.tenants import count, current_tenant, tenant_bound, tenant_key
+except ModuleNotFoundError:
+    from Database.circuit_breaker import CircuitBreaker
+    from Database.invalidation import TRANSACTIONS_TOPIC, has_pending_invalidation, publish_invalidation
+    from Database.outbox import get_outbox, idempotency_key
+    from Database.runtime import (
+        cache_clear,
+        cache_data,
+        cache_get,
+        cache_put,
+        cache_resource,
+        get_secrets,
+        observe_version,
+    )
+    from Database.snapshot_store import invalidate_snapshot, peek_snapshot, shared_snapshot
+    from Database.write_coordinator import SUBMISSIONS_SCOPE, get_write_coordinator
+    from Tools.data_clean import build_transaction_snapshot, clean_transaction_data, extract_week_numbers, freeze_frame
+    from Tools.fund_summary import (
+        SUMMARY_COLUMNS,
+        apply_contribution,
+        build_fund_summary,
+        build_member_payloads,
+        load_summary_file,
+        paid_weeks_from_bits,
+        save_summary_file,
+        summary_from_rows,
+        summary_path,
+        summary_row,
+        summary_to_rows,
+    )
+    from Tools.leaderboard import Leaderboard
+    from Tools.log_index import LogIndex
+    from Tools.member_registry import UNMATCHED, MemberCoverage, MemberRegistry, normalize_name
+    from Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
+    from Tools.projection import project_fund
+    from Tools.returns_allocation import allocate_returns, parse_return_events
+    from Tools.tenants import count, current_tenant, tenant_bound, tenant_key
+
 try:
     from dotenv import load_dotenv
 except ModuleNotFoundError:  # pragma: no cover
@@ -16,14 +92,41 @@ except ModuleNotFoundError:  # pragma: no cover
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 CREDENTIALS_PATH = Path(__file__).resolve().parents[2] / "Database_credentials.json"
 
-SHEETS_ID = "1B8A_dYd9HpO7tjKDtofsby_cXvGqouCrklhZ-iSiO8Q"
-WORKSHEET_NAME = "TRANSACTION"
+AUTH_WORKSHEET_NAME = "AUTHENTICATION"
+
+TRANSACTION_COLUMNS = ["NAME", "AMOUNT PAID", "DATE", "WEEK"]
+COMPACTED_COLUMNS = TRANSACTION_COLUMNS + ["ENTRIES"]
+COMPACTED_SUFFIX = "_COMPACTED"
+ARCHIVE_SUFFIX = "_ARCHIVE"
+SUMMARY_SUFFIX = "_SUMMARY"
+RETURNS_SUFFIX = "_RETURNS"
+AUTH_COLUMNS = ["USERNAME", "PASSWORD"]
+LAYOUT_TTL = 600
+
+# Each partition (program year) owns one META row, found by the worksheet name
+# in column A: column B holds a server-side fingerprint of the worksheet and
+# column C a revision marker bumped on every append, so staleness can be
+# checked with one tiny read.
+VERSION_WORKSHEET_NAME = "META"
+VERSION_PROBE_TTL = 45
+PARTITION_CACHE_ENTRIES = 8
+
+# Process-wide state below is keyed by tenant (breakers) or tenant_key(worksheet).
+_breakers: dict[str, CircuitBreaker] = {}
+_transaction_status: dict[str, dict] = {}
+# Cache manager namespaces (per tenant, keyed by worksheet) for the last batch
+# read and the incrementally maintained leaderboard.
+PREFETCH_NAMESPACE = "prefetched_transactions"
+LEADERBOARD_NAMESPACE = "leaderboards"
+
+logger = logging.getLogger(__name__)
 
 if load_dotenv is not None:
     load_dotenv()
 
 
-@st.cache_resource(show_spinner=False)
+# One authorized client (and its HTTP connection pool) serves every tenant.
+@cache_resource(show_spinner=False, shared=True)
 def _get_client():
     creds = _load_credentials()
     return gspread.authorize(creds)
@@ -31,6 +134,7 @@ def _get_client():
 
 def _load_credentials() -> Credentials:
     attempted_sources = []
+    secrets = get_secrets()
 
     def normalize_info(data: dict) -> dict:
         info = dict(data)
@@ -53,17 +157,17 @@ def _load_credentials() -> Credentials:
         "gcp",
     ]
     for key in candidate_sections:
-        if key in st.secrets:
-            creds = try_info(dict(st.secrets[key]), f"st.secrets[{key}]")
+        if key in secrets:
+            creds = try_info(dict(secrets[key]), f"st.secrets[{key}]")
             if creds is not None:
                 return creds
 
-    creds = try_info(dict(st.secrets), "st.secrets(root)")
+    creds = try_info(dict(secrets), "st.secrets(root)")
     if creds is not None:
         return creds
 
-    if "connections" in st.secrets and "gsheets" in st.secrets["connections"]:
-        creds = try_info(dict(st.secrets["connections"]["gsheets"]), "st.secrets[connections][gsheets]")
+    if "connections" in secrets and "gsheets" in secrets["connections"]:
+        creds = try_info(dict(secrets["connections"]["gsheets"]), "st.secrets[connections][gsheets]")
         if creds is not None:
             return creds
 
@@ -95,27 +199,688 @@ def _load_credentials() -> Credentials:
     )
 
 
-def _get_sheet():
-    return _get_client().open_by_key(SHEETS_ID).worksheet(WORKSHEET_NAME)
+@cache_resource(show_spinner=False)
+def _get_spreadsheet():
+    return _get_client().open_by_key(current_tenant().sheet_id)
 
 
-@st.cache_data(ttl=45, show_spinner=False)
-def _get_transaction_data_cached() -> pd.DataFrame:
-    sheet = _get_sheet()
-    values = sheet.get_all_values()
-    if not values:
-        return pd.DataFrame()
-    return pd.DataFrame(values[1:], columns=values[0])
+def _sheets_breaker() -> CircuitBreaker:
+    # Per tenant, so one family's sheet outage does not trip the others.
+    slug = current_tenant().slug
+    return _breakers.setdefault(slug, CircuitBreaker(f"Google Sheets transactions ({slug})"))
+
+
+def _partition(program: ProgramConfig | None = None) -> str:
+    return (program or get_active_program()).worksheet
+
+
+def _get_sheet(worksheet: str | None = None):
+    return _get_spreadsheet().worksheet(worksheet or _partition())
+
+
+def _compacted_worksheet(worksheet: str) -> str:
+    return f"{worksheet}{COMPACTED_SUFFIX}"
+
+
+def _archive_worksheet(worksheet: str) -> str:
+    return f"{worksheet}{ARCHIVE_SUFFIX}"
+
+
+def _summary_worksheet(worksheet: str) -> str:
+    return f"{worksheet}{SUMMARY_SUFFIX}"
+
+
+def _returns_worksheet(worksheet: str) -> str:
+    return f"{worksheet}{RETURNS_SUFFIX}"
+
+
+def _version_row(worksheet: str) -> int | None:
+    return _get_workbook_layout()["version_rows"].get(worksheet)
+
+
+def _version_range(worksheet: str) -> str | None:
+    row = _version_row(worksheet)
+    return f"{VERSION_WORKSHEET_NAME}!A{row}:C{row}" if row else None
+
+
+def _parse_version_row(worksheet: str, values: list) -> str | None:
+    # A row that no longer names this worksheet means META was edited since
+    # the layout was cached; None tells the caller to drop the layout.
+    if not values or str(values[0]).strip() != worksheet:
+        return None
+    return "|".join(str(v) for v in values[1:3] if str(v) != "")
+
+
+def _fingerprint_formula(worksheet: str) -> str:
+    return f'=COUNTA({worksheet}!A:Z)&"-"&SUMPRODUCT(LEN({worksheet}!A:Z))'
+
+
+def _version_snapshot_key(worksheet: str) -> str:
+    return tenant_key(f"transactions:{worksheet}:version")
+
+
+def _data_snapshot_key(worksheet: str) -> str:
+    return tenant_key(f"transactions:{worksheet}")
+
+
+def _ttl_version() -> str:
+    return f"ttl-{int(time.time() // VERSION_PROBE_TTL)}"
+
+
+def _column_letter(index: int) -> str:
+    return gspread.utils.rowcol_to_a1(1, index + 1)[:-1]
+
+
+@cache_data(ttl=LAYOUT_TTL, show_spinner=False)
+def _get_workbook_layout() -> dict:
+    spreadsheet = _get_spreadsheet()
+    titles = [ws.title for ws in spreadsheet.worksheets()]
+    partitions = [p.worksheet for p in list_programs()]
+    wanted = partitions + [_compacted_worksheet(w) for w in partitions] + [AUTH_WORKSHEET_NAME]
+    header_sheets = [title for title in wanted if title in titles]
+    ranges = [f"{title}!1:1" for title in header_sheets]
+    if VERSION_WORKSHEET_NAME in titles:
+        ranges.append(f"{VERSION_WORKSHEET_NAME}!A:A")
+    headers, version_rows = {}, {}
+    if ranges:
+        response = spreadsheet.values_batch_get(ranges)
+        value_ranges = [vr.get("values", []) for vr in response.get("valueRanges", [])]
+        value_ranges += [[]] * (len(ranges) - len(value_ranges))
+        for title, values in zip(header_sheets, value_ranges):
+            headers[title] = [str(h) for h in values[0]] if values else []
+        if VERSION_WORKSHEET_NAME in titles:
+            for index, row in enumerate(value_ranges[-1], start=1):
+                if row and str(row[0]).strip():
+                    version_rows.setdefault(str(row[0]).strip(), index)
+    return {"titles": titles, "headers": headers, "version_rows": version_rows}
+
+
+def _projected_ranges(sheet_name: str, header: list[str], wanted: list[str]) -> tuple[list[str], list[str]]:
+    header_upper = [h.strip().upper() for h in header]
+    names, ranges = [], []
+    for col in wanted:
+        if col in header_upper:
+            index = header_upper.index(col)
+            letter = _column_letter(index)
+            names.append(col)
+            # Row 1 comes along so the caller can check the cached layout.
+            ranges.append(f"{sheet_name}!{letter}1:{letter}")
+    return names, ranges
+
+
+def _strip_headers(names: list[str], columns: list[list[str]]) -> tuple[bool, list[list[str]]]:
+    """Split the header cell off each projected column; report whether every
+    header still matches the column the layout said it was.
+    """
+    matches = all(col and str(col[0]).strip().upper() == name for name, col in zip(names, columns))
+    return matches, [list(col[1:]) for col in columns]
+
+
+def _pad_columns(columns: list[list[str]]) -> list[list[str]]:
+    length = max((len(col) for col in columns), default=0)
+    return [list(col) + [""] * (length - len(col)) for col in columns]
+
+
+def fetch_workbook_batch(
+    include_auth: bool = False,
+    worksheet: str | None = None,
+    _retry: bool = True,
+    include_transactions: bool = True,
+) -> dict:
+    # One values.batchGet for the partition's version marker, its projected
+    # live and compacted transaction columns and (optionally) the
+    # AUTHENTICATION columns. If a column moved since the layout was cached,
+    # the layout is dropped and the batch re-read once. With
+    # include_transactions=False the transaction columns are left out and
+    # only fetched, in a second batch, when the version marker moved.
+    worksheet = worksheet or _partition()
+    layout = _get_workbook_layout()
+    headers = layout["headers"]
+    version_range = _version_range(worksheet)
+
+    txn_names, txn_ranges, cmp_names, cmp_ranges = [], [], [], []
+    if include_transactions:
+        txn_names, txn_ranges = _projected_ranges(worksheet, headers.get(worksheet, []), TRANSACTION_COLUMNS)
+        compacted = _compacted_worksheet(worksheet)
+        cmp_names, cmp_ranges = _projected_ranges(compacted, headers.get(compacted, []), COMPACTED_COLUMNS)
+    auth_names, auth_ranges = [], []
+    if include_auth:
+        auth_names, auth_ranges = _projected_ranges(
+            AUTH_WORKSHEET_NAME, headers.get(AUTH_WORKSHEET_NAME, []), AUTH_COLUMNS
+        )
+
+    ranges = ([version_range] if version_range else []) + txn_ranges + cmp_ranges + auth_ranges
+    value_ranges = []
+    if ranges:
+        count("sheet_reads")
+        response = _get_spreadsheet().values_batch_get(ranges, params={"majorDimension": "COLUMNS"})
+        value_ranges = [vr.get("values", []) for vr in response.get("valueRanges", [])]
+        value_ranges += [[]] * (len(ranges) - len(value_ranges))
+
+    marker = ""
+    if version_range:
+        marker = _parse_version_row(worksheet, [col[0] if col else "" for col in value_ranges.pop(0)])
+    version = marker or _ttl_version()
+
+    columns = [vr[0] if vr else [] for vr in value_ranges]
+    sections = len(txn_ranges), len(cmp_ranges), len(auth_ranges)
+    checks = [
+        _strip_headers(names, columns[start : start + size])
+        for names, start, size in zip(
+            (txn_names, cmp_names, auth_names), (0, sections[0], sections[0] + sections[1]), sections
+        )
+    ]
+    if (marker is None or not all(matches for matches, _ in checks)) and _retry:
+        _get_workbook_layout.clear()
+        return fetch_workbook_batch(include_auth, worksheet, False, include_transactions)
+    columns = [col for _, section in checks for col in section]
+
+    txn_columns = _pad_columns(columns[: len(txn_ranges)])
+    transactions = pd.DataFrame(dict(zip(txn_names, txn_columns))) if txn_names else pd.DataFrame()
+    columns = columns[len(txn_ranges):]
 
+    cmp_columns = _pad_columns(columns[: len(cmp_ranges)])
+    if cmp_names and cmp_columns and cmp_columns[0]:
+        compacted_frame = pd.DataFrame(dict(zip(cmp_names, cmp_columns)))
+        transactions = pd.concat([transactions, compacted_frame], ignore_index=True)
+    columns = columns[len(cmp_ranges):]
 
-def clear_transaction_cache() -> None:
+    result = {"version": version, "transactions": transactions}
+    if include_auth:
+        auth_columns = _pad_columns(columns)
+        result["auth"] = [dict(zip(auth_names, row)) for row in zip(*auth_columns)]
+
+    if not include_transactions:
+        if version != _known_transaction_version(worksheet):
+            result["transactions"] = fetch_workbook_batch(worksheet=worksheet)["transactions"]
+        else:
+            del result["transactions"]
+        return result
+
+    cache_put(
+        PREFETCH_NAMESPACE,
+        worksheet,
+        {"fetched_at": time.time(), "version": version, "transactions": transactions},
+        worksheet,
+        version,
+    )
+    return result
+
+
+def _known_transaction_version(worksheet: str) -> str | None:
+    hit, prefetched = cache_get(PREFETCH_NAMESPACE, worksheet)
+    if hit:
+        return prefetched["version"]
+    return _transaction_status.get(tenant_key(worksheet), {}).get("version")
+
+
+def _read_version_marker(worksheet: str) -> str:
+    version_range = _version_range(worksheet)
+    if version_range is None:
+        return ""
+    count("sheet_reads")
+    try:
+        response = _get_spreadsheet().values_get(version_range)
+    except gspread.exceptions.APIError as exc:
+        # 400 means the META sheet is gone; anything else is an outage.
+        if getattr(exc, "code", None) != 400:
+            raise
+        _get_workbook_layout.clear()
+        return ""
+    values = response.get("values", [])
+    marker = _parse_version_row(worksheet, values[0] if values else [])
+    if marker is None:
+        _get_workbook_layout.clear()
+    return marker or ""
+
+
+def _probe_transaction_version(worksheet: str) -> str:
+    hit, prefetched = cache_get(PREFETCH_NAMESPACE, worksheet, ttl=VERSION_PROBE_TTL)
+    if hit:
+        return prefetched["version"]
+
+    marker = _sheets_breaker().call(_read_version_marker, worksheet)
+    if not marker:
+        # No META row yet: fall back to plain time-based expiry.
+        return _ttl_version()
+    return marker
+
+
+@cache_data(ttl=VERSION_PROBE_TTL, max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False)
+def _get_transaction_version(worksheet: str) -> str:
+    return shared_snapshot(
+        _version_snapshot_key(worksheet),
+        lambda: _probe_transaction_version(worksheet),
+        max_age=VERSION_PROBE_TTL,
+    )
+
+
+def _bump_transaction_version(worksheet: str) -> None:
+    spreadsheet = _get_spreadsheet()
+    body = {"values": [[worksheet, _fingerprint_formula(worksheet), uuid.uuid4().hex]]}
+    params = {"valueInputOption": "USER_ENTERED"}
+    version_range = _version_range(worksheet)
+    if version_range is not None:
+        try:
+            spreadsheet.values_update(version_range, params=params, body=body)
+            return
+        except gspread.exceptions.APIError as exc:
+            # 400 means the META sheet is gone; anything else is an outage,
+            # and appending a second row for the worksheet would not help.
+            if getattr(exc, "code", None) != 400:
+                logger.warning("Could not bump the version marker for %s: %s", worksheet, exc)
+                return
+    # No row for this worksheet yet (or META went away): append one by name.
+    try:
+        try:
+            spreadsheet.worksheet(VERSION_WORKSHEET_NAME)
+        except gspread.exceptions.WorksheetNotFound:
+            spreadsheet.add_worksheet(VERSION_WORKSHEET_NAME, rows=max(len(list_programs()), 1), cols=3)
+        spreadsheet.values_append(f"{VERSION_WORKSHEET_NAME}!A1", params=params, body=body)
+    except gspread.exceptions.APIError as exc:
+        logger.warning("Could not bump the version marker for %s: %s", worksheet, exc)
+    _get_workbook_layout.clear()
+
+
+def _read_transaction_frame(worksheet: str, version: str) -> pd.DataFrame:
+    hit, prefetched = cache_get(PREFETCH_NAMESPACE, worksheet)
+    if hit and prefetched["version"] == version:
+        return prefetched["transactions"]
+    return fetch_workbook_batch(worksheet=worksheet)["transactions"]
+
+
+def _fetch_transaction_frame(worksheet: str, version: str) -> pd.DataFrame:
+    return _sheets_breaker().call(_read_transaction_frame, worksheet, version)
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_transaction_data_cached(worksheet: str, version: str) -> pd.DataFrame:
+    frame = shared_snapshot(
+        _data_snapshot_key(worksheet),
+        lambda: _fetch_transaction_frame(worksheet, version),
+        version=version,
+    )
+    return freeze_frame(frame)
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_transaction_snapshot_cached(worksheet: str, version: str) -> pd.DataFrame:
+    return build_transaction_snapshot(_get_transaction_data_cached(worksheet, version))
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_log_index_cached(worksheet: str, version: str, registry: MemberRegistry | None) -> LogIndex:
+    return LogIndex(_get_transaction_snapshot_cached(worksheet, version), version, registry)
+
+
+def _read_summary_sheet(worksheet: str) -> dict | None:
+    try:
+        response = _get_spreadsheet().values_get(f"{_summary_worksheet(worksheet)}!A:F")
+    except gspread.exceptions.APIError as exc:
+        if getattr(exc, "code", None) != 400:
+            raise
+        return None
+    return summary_from_rows(response.get("values", []))
+
+
+def _write_summary_sheet(worksheet: str, summary: dict) -> None:
+    try:
+        sheet = _ensure_worksheet(_summary_worksheet(worksheet), SUMMARY_COLUMNS)
+        sheet.batch_clear(["A2:F"])
+        _get_spreadsheet().values_update(
+            f"{sheet.title}!A1",
+            params={"valueInputOption": "RAW"},
+            body={"values": summary_to_rows(summary)},
+        )
+    except gspread.exceptions.APIError as exc:
+        logger.warning("Could not write the summary sheet for %s: %s", worksheet, exc)
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_fund_summary_cached(worksheet: str, version: str) -> dict:
+    # Local file first, then the partition's SUMMARY worksheet; the full log
+    # is only loaded when neither matches the current data version.
+    path = summary_path(worksheet)
+    summary = load_summary_file(path)
+    if summary is not None and summary.get("version") == version:
+        return summary
+
+    summary = _sheets_breaker().call(_read_summary_sheet, worksheet)
+    if summary is None or summary["version"] != version:
+        summary = build_fund_summary(_get_transaction_snapshot_cached(worksheet, version), version)
+        _write_summary_sheet(worksheet, summary)
+    save_summary_file(path, summary)
+    return summary
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_member_coverage_cached(worksheet: str, version: str, registry: MemberRegistry) -> MemberCoverage:
+    return MemberCoverage(_get_fund_summary_cached(worksheet, version), registry)
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_submission_keys_cached(worksheet: str, version: str) -> frozenset[str]:
+    summary = _get_fund_summary_cached(worksheet, version)
+    return frozenset(
+        idempotency_key(worksheet, name, f"week {week}")
+        for name, member in summary["members"].items()
+        for week in paid_weeks_from_bits(member["paid_weeks"])
+    )
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_fund_projection_cached(worksheet: str, version: str, year: int, open_week: int) -> dict:
+    return project_fund(_get_fund_summary_cached(worksheet, version), get_program(year), open_week)
+
+
+def _read_return_rows(worksheet: str) -> list[list]:
+    try:
+        response = _get_spreadsheet().values_get(f"{_returns_worksheet(worksheet)}!A:C")
+    except gspread.exceptions.APIError as exc:
+        if getattr(exc, "code", None) != 400:
+            raise
+        return []
+    return response.get("values", [])
+
+
+# Return events are entered by hand and do not bump META, so they expire on
+# the probe TTL instead of the data version.
+@cache_data(ttl=VERSION_PROBE_TTL, max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False)
+def _get_return_events(worksheet: str, year: int) -> tuple:
+    return parse_return_events(_sheets_breaker().call(_read_return_rows, worksheet), get_program(year))
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_return_allocation_cached(worksheet: str, version: str, year: int, events: tuple) -> pd.DataFrame:
+    # Indexed by member name, so a member's row is a hash lookup.
+    allocation = allocate_returns(_get_transaction_snapshot_cached(worksheet, version), events, get_program(year))
+    return allocation.set_index("NAME", drop=False)
+
+
+@cache_resource(max_entries=PARTITION_CACHE_ENTRIES, show_spinner=False, versioned=True)
+def _get_member_payloads_cached(worksheet: str, version: str, registry: MemberRegistry) -> dict:
+    return build_member_payloads(_get_fund_summary_cached(worksheet, version), registry)
+
+
+def clear_transaction_cache(broadcast: bool = False) -> None:
+    cache_clear(PREFETCH_NAMESPACE)
+    _get_transaction_version.clear()
     _get_transaction_data_cached.clear()
+    _get_transaction_snapshot_cached.clear()
+    _get_fund_summary_cached.clear()
+    _get_member_payloads_cached.clear()
+    _get_submission_keys_cached.clear()
+    _get_fund_projection_cached.clear()
+    _get_return_allocation_cached.clear()
+    _get_log_index_cached.clear()
+    _get_member_coverage_cached.clear()
+    if broadcast:
+        for program in list_programs():
+            invalidate_snapshot(_version_snapshot_key(program.worksheet))
+        publish_invalidation(tenant_key(TRANSACTIONS_TOPIC))
 
 
-def get_transaction_data(force_refresh: bool = False) -> pd.DataFrame:
+def _sync_transaction_cache(force_refresh: bool, worksheet: str) -> None:
     if force_refresh:
+        invalidate_snapshot(_version_snapshot_key(worksheet))
+        _get_workbook_layout.clear()
         clear_transaction_cache()
-    return _get_transaction_data_cached().copy()
+    elif has_pending_invalidation(tenant_key(TRANSACTIONS_TOPIC)):
+        clear_transaction_cache()
+
+
+def _serve_transactions(build, worksheet: str) -> pd.DataFrame:
+    status = _transaction_status.setdefault(tenant_key(worksheet), {"version": None, "as_of": None, "degraded": False})
+    try:
+        version = _get_transaction_version(worksheet)
+        frame = build(worksheet, version)
+    except Exception:
+        # Degraded read-only mode: serve the last good snapshot, from this
+        # process if we have one, otherwise from the shared store.
+        version = status["version"]
+        as_of = status["as_of"]
+        if version is None:
+            stored = peek_snapshot(_data_snapshot_key(worksheet))
+            if stored is None:
+                raise
+            version, _, updated = stored
+            as_of = datetime.fromtimestamp(updated)
+        frame = build(worksheet, version)
+        status.update(version=version, as_of=as_of, degraded=True)
+        return frame
+
+    # Only a version that built successfully retires the previous one, so a
+    # degraded fallback to the last good version can still be cached.
+    observe_version(worksheet, version)
+    status.update(version=version, as_of=datetime.now(), degraded=False)
+    return frame
+
+
+def get_transaction_data(force_refresh: bool = False, program: ProgramConfig | None = None) -> pd.DataFrame:
+    worksheet = _partition(program)
+    _sync_transaction_cache(force_refresh, worksheet)
+    return _serve_transactions(_get_transaction_data_cached, worksheet).copy(deep=False)
+
+
+def get_transaction_snapshot(force_refresh: bool = False, program: ProgramConfig | None = None) -> pd.DataFrame:
+    worksheet = _partition(program)
+    _sync_transaction_cache(force_refresh, worksheet)
+    return _serve_transactions(_get_transaction_snapshot_cached, worksheet).copy(deep=False)
+
+
+def get_log_index(
+    force_refresh: bool = False,
+    program: ProgramConfig | None = None,
+    registry: MemberRegistry | None = None,
+) -> LogIndex:
+    worksheet = _partition(program)
+    _sync_transaction_cache(force_refresh, worksheet)
+    return _serve_transactions(lambda ws, version: _get_log_index_cached(ws, version, registry), worksheet)
+
+
+def get_fund_summary(force_refresh: bool = False, program: ProgramConfig | None = None) -> dict:
+    worksheet = _partition(program)
+    _sync_transaction_cache(force_refresh, worksheet)
+    return _serve_transactions(_get_fund_summary_cached, worksheet)
+
+
+def get_member_coverage(registry: MemberRegistry, program: ProgramConfig | None = None) -> MemberCoverage:
+    # Summary names are mapped to registry IDs once per (data version, registry).
+    worksheet = _partition(program)
+    _sync_transaction_cache(False, worksheet)
+    return _serve_transactions(lambda ws, version: _get_member_coverage_cached(ws, version, registry), worksheet)
+
+
+def rebuild_fund_summary(program: ProgramConfig | None = None) -> dict:
+    worksheet = _partition(program)
+    _sync_transaction_cache(True, worksheet)
+    version = _get_transaction_version(worksheet)
+    summary = build_fund_summary(_get_transaction_snapshot_cached(worksheet, version), version)
+    _write_summary_sheet(worksheet, summary)
+    save_summary_file(summary_path(worksheet), summary)
+    _get_fund_summary_cached.clear()
+    _get_member_payloads_cached.clear()
+    _get_member_coverage_cached.clear()
+    return summary
+
+
+def get_submission_keys(program: ProgramConfig | None = None) -> frozenset[str]:
+    worksheet = _partition(program)
+    _sync_transaction_cache(False, worksheet)
+    return _serve_transactions(_get_submission_keys_cached, worksheet)
+
+
+def get_fund_projection(program: ProgramConfig | None = None) -> dict:
+    program = program or get_active_program()
+    worksheet = _partition(program)
+    open_week = program.current_open_week(datetime.now().date())
+    _sync_transaction_cache(False, worksheet)
+    return _serve_transactions(
+        lambda ws, version: _get_fund_projection_cached(ws, version, program.year, open_week), worksheet
+    )
+
+
+def get_return_allocation(program: ProgramConfig | None = None) -> pd.DataFrame | None:
+    # None until the partition's RETURNS sheet has at least one event, so
+    # funds without returns never load the full log for this.
+    program = program or get_active_program()
+    worksheet = _partition(program)
+    _sync_transaction_cache(False, worksheet)
+    try:
+        events = _get_return_events(worksheet, program.year)
+    except Exception:
+        return None
+    if not events:
+        return None
+    return _serve_transactions(
+        lambda ws, version: _get_return_allocation_cached(ws, version, program.year, events), worksheet
+    )
+
+
+def get_member_payloads(
+    registry: MemberRegistry, force_refresh: bool = False, program: ProgramConfig | None = None
+) -> dict:
+    worksheet = _partition(program)
+    _sync_transaction_cache(force_refresh, worksheet)
+    return _serve_transactions(lambda ws, version: _get_member_payloads_cached(ws, version, registry), worksheet)
+
+
+def get_leaderboard(
+    registry: MemberRegistry, force_refresh: bool = False, program: ProgramConfig | None = None
+) -> Leaderboard:
+    # Keyed by member ID. Rebuilt only when the data version or the registry
+    # moves past what this process has already applied; local appends update
+    # it in place.
+    worksheet = _partition(program)
+    payloads = get_member_payloads(registry, force_refresh=force_refresh, program=program)
+    hit, cached = cache_get(LEADERBOARD_NAMESPACE, worksheet)
+    if hit and cached["board"].version == payloads["version"] and cached["registry"] == payloads["registry"]:
+        return cached["board"]
+    members = payloads["members"]
+    board = Leaderboard(
+        {member_id: m["total"] for member_id, m in members.items()},
+        labels={member_id: m["name"] for member_id, m in members.items()},
+    )
+    board.version = payloads["version"]
+    cached = {"board": board, "registry": payloads["registry"]}
+    cache_put(LEADERBOARD_NAMESPACE, worksheet, cached, worksheet, board.version)
+    return board
+
+
+def get_transaction_history_snapshot(force_refresh: bool = False) -> pd.DataFrame:
+    frames = [
+        get_transaction_snapshot(force_refresh=force_refresh, program=program).assign(**{"PROGRAM YEAR": program.year})
+        for program in list_programs()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def get_transaction_data_status(program: ProgramConfig | None = None) -> dict:
+    status = _transaction_status.get(tenant_key(_partition(program)), {})
+    return {"version": status.get("version"), "as_of": status.get("as_of"), "degraded": status.get("degraded", False)}
+
+
+def _ensure_worksheet(title: str, header: list[str]):
+    spreadsheet = _get_spreadsheet()
+    try:
+        return spreadsheet.worksheet(title)
+    except gspread.exceptions.WorksheetNotFound:
+        new_sheet = spreadsheet.add_worksheet(title, rows=1000, cols=max(len(header), 1))
+        new_sheet.update([list(header)], "A1")
+        _get_workbook_layout.clear()
+        return new_sheet
+
+
+def _ensure_partition(worksheet: str) -> list[str]:
+    layout = _get_workbook_layout()
+    header = layout["headers"].get(worksheet)
+    if header:
+        return header
+    if worksheet not in layout["titles"]:
+        _ensure_worksheet(worksheet, TRANSACTION_COLUMNS)
+        return list(TRANSACTION_COLUMNS)
+    return _get_sheet(worksheet).row_values(1)
+
+
+def _build_row(header_upper: list[str], name: str, amount_paid: float, week: str, date_str: str) -> list:
+    row = [""] * len(header_upper)
+
+    def set_col(col_name: str, value) -> None:
+        if col_name in header_upper:
+            row[header_upper.index(col_name)] = value
+
+    set_col("NAME", normalize_name(name))
+    set_col("AMOUNT PAID", float(amount_paid))
+    set_col("DATE", date_str)
+    set_col("WEEK", str(week).strip().lower())
+    return row
+
+
+def _read_append_context(worksheet: str) -> tuple[str, list[str]]:
+    # The META marker and the live header in one read, so rows are laid out
+    # by the header as it is now rather than as the layout cache saw it.
+    ranges = [f"{worksheet}!1:1"]
+    version_range = _version_range(worksheet)
+    include_version = version_range is not None
+    if include_version:
+        ranges.append(version_range)
+    count("sheet_reads")
+    try:
+        response = _get_spreadsheet().values_batch_get(ranges)
+    except gspread.exceptions.APIError as exc:
+        # 400 means the META sheet is gone since the layout was cached.
+        if getattr(exc, "code", None) != 400 or not include_version:
+            raise
+        include_version = False
+        response = _get_spreadsheet().values_batch_get(ranges[:1])
+    value_ranges = [vr.get("values", []) for vr in response.get("valueRanges", [])]
+    value_ranges += [[]] * (len(ranges) - len(value_ranges))
+    header = [str(h) for h in value_ranges[0][0]] if value_ranges[0] else []
+    marker = ""
+    if include_version:
+        marker = _parse_version_row(worksheet, value_ranges[1][0] if value_ranges[1] else [])
+        if marker is None:
+            _get_workbook_layout.clear()
+    return marker or "", header
+
+
+def _append_rows(worksheet: str, records: list[tuple]) -> None:
+    """Append ``(name, amount_paid, week, date_str)`` records to ``worksheet``.
+
+    Raises only if the rows were not appended. Once ``values.append``
+    succeeds the write counts as delivered: a failing summary update is
+    logged, and the version is bumped and caches cleared regardless, so the
+    outbox never replays rows that are already in the sheet.
+    """
+    cached_header = _ensure_partition(worksheet)
+    previous_version, header = _read_append_context(worksheet)
+    if header != cached_header:
+        _get_workbook_layout.clear()
+    header = header or cached_header
+    header_upper = [h.strip().upper() for h in header]
+    missing = [col for col in TRANSACTION_COLUMNS if col not in header_upper]
+    if missing:
+        raise ValueError(f"{worksheet} header is missing {', '.join(missing)}")
+    rows = [_build_row(header_upper, *record) for record in records]
+    count("sheet_writes")
+    _get_spreadsheet().values_append(
+        f"{worksheet}!A1",
+        params={"valueInputOption": "USER_ENTERED"},
+        body={"values": rows},
+    )
+    published = False
+    try:
+        published = _update_fund_summary(worksheet, previous_version, rows, header)
+    except Exception:
+        logger.exception("Incremental summary update for %s failed, readers will rebuild", worksheet)
+    finally:
+        try:
+            if not published:
+                _bump_transaction_version(worksheet)
+        except Exception:
+            logger.exception("Could not bump the version marker for %s", worksheet)
+        finally:
+            clear_transaction_cache(broadcast=True)
 
 
 def append_transaction(
@@ -123,25 +888,259 @@ def append_transaction(
     amount_paid: float,
     week: str,
     date_str: str | None = None,
+    program: ProgramConfig | None = None,
 ) -> None:
-    ws = _get_sheet()
+    if date_str is None:
+        date_str = datetime.now().strftime("%d/%m/%Y")
+
+    _deliver_submission(_partition(program), name, amount_paid, week, date_str)
+
+
+def append_transactions(records: pd.DataFrame, program: ProgramConfig | None = None) -> int:
+    # Bulk variant of submit_transaction: the records are claimed through the
+    # write coordinator like single submissions, and the ones nobody else
+    # holds land in one values.append call. Expects NAME, AMOUNT PAID, DATE
+    # (dd/mm/YYYY), WEEK. Returns the number of rows written; raises only
+    # when nothing was written.
+    if records.empty:
+        return 0
+    worksheet = _partition(program)
+    rows = {
+        idempotency_key(worksheet, name, week): (name, amount_paid, week, date_str)
+        for name, amount_paid, date_str, week in records[TRANSACTION_COLUMNS].itertuples(index=False)
+    }
+    written = get_write_coordinator().claim_many(
+        SUBMISSIONS_SCOPE,
+        rows,
+        lambda fresh: _append_rows(worksheet, [rows[key] for key in fresh]),
+        lambda: get_submission_keys(program),
+    )
+    return len(written)
+
+
+def _fingerprint_count(version: str) -> int | None:
+    try:
+        return int(version.split("|")[0].split("-")[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+def _update_fund_summary(worksheet: str, previous_version: str, rows: list[list], header: list[str]) -> bool:
+    """Publish an append as one read and one values.batchUpdate.
+
+    The read fetches the new fingerprint and the SUMMARY sheet. The write sets
+    a new META revision, rewrites the changed members' SUMMARY rows and stamps
+    the new version on every row. Only safe when the summary matched the sheet
+    right before this append and the fingerprint shows no other rows landed in
+    between; returns False otherwise so the caller bumps META and readers
+    rebuild.
+    """
+    version_row = _version_row(worksheet)
+    if not previous_version or version_row is None:
+        return False
+    summary_ws = _summary_worksheet(worksheet)
+    count("sheet_reads")
+    response = _get_spreadsheet().values_batch_get([_version_range(worksheet), f"{summary_ws}!A:F"])
+    value_ranges = [vr.get("values", []) for vr in response.get("valueRanges", [])] + [[], []]
+    meta, summary_values = value_ranges[0], value_ranges[1]
+    if not meta or str(meta[0][0]).strip() != worksheet:
+        return False
+    fingerprint = str(meta[0][1]) if len(meta[0]) > 1 else ""
+
+    filled_cells = sum(1 for row in rows for value in row if str(value).strip())
+    before, after = _fingerprint_count(previous_version), _fingerprint_count(fingerprint)
+    if before is None or after is None or after != before + filled_cells:
+        return False
+    summary = summary_from_rows(summary_values)
+    if summary is None or summary["version"] != previous_version:
+        return False
+
+    revision = uuid.uuid4().hex
+    new_version = f"{fingerprint}|{revision}"
+    entries = build_transaction_snapshot(pd.DataFrame(rows, columns=header)).dropna(subset=["AMOUNT PAID"])
+    entries = entries[entries["NAME"].str.strip() != ""]
+    contributions = [
+        (
+            str(name),
+            float(amount),
+            None if pd.isna(week_number) else int(week_number),
+            None if pd.isna(year_month) else str(year_month),
+        )
+        for name, amount, week_number, year_month in zip(
+            entries["NAME"], entries["AMOUNT PAID"], entries["WEEK NUMBER"], entries["YEAR-MONTH"]
+        )
+    ]
+    for name, amount, week_number, year_month in contributions:
+        apply_contribution(summary, name, amount, week_number, year_month, new_version)
+
+    # New members land after the existing rows, matching dict order.
+    positions = {name: index + 2 for index, name in enumerate(summary["members"])}
+    data = [{"range": f"{VERSION_WORKSHEET_NAME}!C{version_row}", "values": [[revision]]}]
+    for name in dict.fromkeys(name for name, *_ in contributions):
+        row = positions[name]
+        values = summary_row(name, summary["members"][name], new_version)[:-1]
+        data.append({"range": f"{summary_ws}!A{row}:E{row}", "values": [values]})
+    data.append({"range": f"{summary_ws}!F2:F{len(positions) + 1}", "values": [[new_version]] * len(positions)})
+    count("sheet_writes")
+    _get_spreadsheet().values_batch_update({"valueInputOption": "RAW", "data": data})
+
+    save_summary_file(summary_path(worksheet), summary)
+    hit, cached = cache_get(LEADERBOARD_NAMESPACE, worksheet)
+    if hit and cached["board"].version == previous_version:
+        board, registry = cached["board"], cached["registry"]
+        member_ids = [registry.id_of(name) for name, *_ in contributions]
+        # A name the board's registry has no ID for means a rebuild anyway.
+        if UNMATCHED not in member_ids:
+            for member_id, (name, amount, _, _) in zip(member_ids, contributions):
+                board.add(member_id, amount, label=name)
+            board.version = new_version
+            cache_put(LEADERBOARD_NAMESPACE, worksheet, cached, worksheet, new_version)
+    return True
+
+
+def _cell(value) -> dict:
+    if isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value):
+        return {"userEnteredValue": {"numberValue": float(value)}}
+    return {"userEnteredValue": {"stringValue": "" if pd.isna(value) else str(value)}}
+
+
+def _row_data(values) -> dict:
+    return {"values": [_cell(v) for v in values]}
+
+
+def _contiguous_runs(indices: np.ndarray) -> list[tuple[int, int]]:
+    runs = []
+    for index in indices.tolist():
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
+def compact_closed_weeks(through_week: int, program: ProgramConfig | None = None) -> dict:
+    """Move rows for weeks <= ``through_week`` to the archive worksheet and
+    replace them with one summary row per member/week in the compacted
+    worksheet. Archive, summary and delete happen in one atomic batchUpdate.
+    """
+    worksheet = _partition(program)
+    spreadsheet = _get_spreadsheet()
+    sheet = _get_sheet(worksheet)
+    values = sheet.get_all_values()
+    if len(values) < 2:
+        return {"archived_rows": 0, "summary_rows": 0}
+
+    header, rows = values[0], values[1:]
+    width = len(header)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    clean = clean_transaction_data(pd.DataFrame([row[:width] for row in rows], columns=header))
+    closed_mask = (extract_week_numbers(clean["WEEK"]) <= through_week).to_numpy()
+    if not closed_mask.any():
+        return {"archived_rows": 0, "summary_rows": 0}
+
+    closed = clean[closed_mask]
+    summary = closed.groupby(["NAME", "WEEK"], as_index=False).agg(
+        **{
+            "AMOUNT PAID": ("AMOUNT PAID", "sum"),
+            "DATE": ("DATE", "max"),
+            "ENTRIES": ("WEEK", "size"),
+        }
+    )
+    summary["DATE"] = summary["DATE"].dt.strftime("%d/%m/%Y").fillna("")
 
+    archive_ws = _ensure_worksheet(_archive_worksheet(worksheet), header)
+    compacted_ws = _ensure_worksheet(_compacted_worksheet(worksheet), COMPACTED_COLUMNS)
+
+    closed_positions = np.flatnonzero(closed_mask)
+    # Sheet row index 0 is the header, so data row i lives at index i + 1.
+    runs = _contiguous_runs(closed_positions + 1)
+    requests = [
+        {
+            "appendCells": {
+                "sheetId": archive_ws.id,
+                "rows": [_row_data(rows[i]) for i in closed_positions.tolist()],
+                "fields": "userEnteredValue",
+            }
+        },
+        {
+            "appendCells": {
+                "sheetId": compacted_ws.id,
+                "rows": [_row_data(row) for row in summary[COMPACTED_COLUMNS].itertuples(index=False)],
+                "fields": "userEnteredValue",
+            }
+        },
+    ]
+    requests.extend(
+        {"deleteDimension": {"range": {"sheetId": sheet.id, "dimension": "ROWS", "startIndex": start, "endIndex": end}}}
+        for start, end in reversed(runs)
+    )
+    count("sheet_writes")
+    spreadsheet.batch_update({"requests": requests})
+
+    _get_workbook_layout.clear()
+    _bump_transaction_version(worksheet)
+    clear_transaction_cache(broadcast=True)
+    return {"archived_rows": int(closed_mask.sum()), "summary_rows": int(len(summary))}
+
+
+def _deliver_submission(worksheet: str, name: str, amount_paid: float, week: str, date_str: str) -> None:
+    # A retry can follow an append that landed but was reported as failed
+    # (a timeout after the server applied it), and the replay's key check may
+    # be up to a probe TTL old. Read the META row fresh and skip the write if
+    # the sheet already holds this member/week.
+    if idempotency_key(worksheet, name, week) in _current_submission_keys(worksheet):
+        return
+    _append_rows(worksheet, [(name, amount_paid, week, date_str)])
+
+
+def _current_submission_keys(worksheet: str) -> frozenset[str]:
+    version = _sheets_breaker().call(_read_version_marker, worksheet) or _get_transaction_version(worksheet)
+    return _get_submission_keys_cached(worksheet, version)
+
+
+def _delivered_submission_keys(partitions: set[str]) -> set[str]:
+    # Appends bump META and broadcast, so a version probe is enough to see
+    # rows delivered before a crash; no full re-download needed.
+    keys = set()
+    for worksheet in partitions:
+        _sync_transaction_cache(False, worksheet)
+        keys |= _serve_transactions(_get_submission_keys_cached, worksheet)
+    return keys
+
+
+def _start_outbox_worker():
+    outbox = get_outbox()
+    outbox.start_worker(tenant_bound(_deliver_submission), tenant_bound(_delivered_submission_keys))
+    return outbox
+
+
+def submit_transaction(
+    name: str,
+    amount_paid: float,
+    week: str,
+    date_str: str | None = None,
+    program: ProgramConfig | None = None,
+) -> bool:
     if date_str is None:
         date_str = datetime.now().strftime("%d/%m/%Y")
 
-    header = ws.row_values(1)
-    header_upper = [h.strip().upper() for h in header]
-    row = [""] * len(header_upper)
+    worksheet = _partition(program)
+    outbox = _start_outbox_worker()
+    return get_write_coordinator().claim(
+        SUBMISSIONS_SCOPE,
+        idempotency_key(worksheet, name, week),
+        lambda: outbox.enqueue(worksheet, name, amount_paid, week, date_str),
+        lambda: get_submission_keys(program),
+    )
 
-    def set_col(col_name: str, value) -> None:
-        if col_name in header_upper:
-            row[header_upper.index(col_name)] = value
 
-    set_col("NAME", str(name).strip().title())
-    set_col("AMOUNT PAID", float(amount_paid))
-    set_col("DATE", date_str)
-    set_col("WEEK", str(week).strip().lower())
+def get_pending_submission_weeks(name: str, program: ProgramConfig | None = None) -> list[str]:
+    return _start_outbox_worker().pending_weeks(_partition(program), name)
 
-    ws.append_row(row, value_input_option="USER_ENTERED")
-    clear_transaction_cache()
 
+def get_pending_submissions(program: ProgramConfig | None = None) -> set[tuple[str, int]]:
+    entries = get_outbox().pending_entries(_partition(program))
+    if not entries:
+        return set()
+    weeks = extract_week_numbers(pd.Series([week for _, week in entries], dtype=object))
+    return {(name, int(week)) for (name, _), week in zip(entries, weeks) if pd.notna(week)}
@@ -1,11 +1,26 @@
 from pathlib import Path
+from datetime import datetime
 import json
 import os
 
 import gspread
-import streamlit as st
 from google.oauth2.service_account import Credentials
 
+try:
+    from src.Database.circuit_breaker import CircuitBreaker
+    from src.Database.GOOGLE_SHEETS import fetch_workbook_batch
+    from src.Database.invalidation import AUTH_TOPIC, has_pending_invalidation, publish_invalidation
+    from src.Database.runtime import cache_data, cache_resource, get_secrets
+    from src.Tools.member_registry import MemberRegistry
+    from src.Tools.tenants import current_tenant, tenant_key
+except ModuleNotFoundError:
+    from Database.circuit_breaker import CircuitBreaker
+    from Database.GOOGLE_SHEETS import fetch_workbook_batch
+    from Database.invalidation import AUTH_TOPIC, has_pending_invalidation, publish_invalidation
+    from Database.runtime import cache_data, cache_resource, get_secrets
+    from Tools.member_registry import MemberRegistry
+    from Tools.tenants import current_tenant, tenant_key
+
 try:
     from dotenv import load_dotenv
 except ModuleNotFoundError:  # pragma: no cover
@@ -14,13 +29,17 @@ except ModuleNotFoundError:  # pragma: no cover
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 CREDENTIALS_PATH = Path(__file__).resolve().parents[2] / "Database_credentials.json"
 
-FAMILY_CONTRIBUTION_SHEET_ID = "1B8A_dYd9HpO7tjKDtofsby_cXvGqouCrklhZ-iSiO8Q"
+AUTH_CACHE_TTL = 60
+REGISTRY_CACHE_ENTRIES = 4
+
+_auth_breakers: dict[str, CircuitBreaker] = {}
+_auth_statuses: dict[str, dict] = {}
 
 if load_dotenv is not None:
     load_dotenv()
 
 
-@st.cache_resource(show_spinner=False)
+@cache_resource(show_spinner=False, shared=True)
 def _get_client():
     creds = _load_credentials()
     return gspread.authorize(creds)
@@ -28,6 +47,7 @@ def _get_client():
 
 def _load_credentials() -> Credentials:
     attempted_sources = []
+    secrets = get_secrets()
 
     def normalize_info(data: dict) -> dict:
         info = dict(data)
@@ -50,17 +70,17 @@ def _load_credentials() -> Credentials:
         "gcp",
     ]
     for key in candidate_sections:
-        if key in st.secrets:
-            creds = try_info(dict(st.secrets[key]), f"st.secrets[{key}]")
+        if key in secrets:
+            creds = try_info(dict(secrets[key]), f"st.secrets[{key}]")
             if creds is not None:
                 return creds
 
-    creds = try_info(dict(st.secrets), "st.secrets(root)")
+    creds = try_info(dict(secrets), "st.secrets(root)")
     if creds is not None:
         return creds
 
-    if "connections" in st.secrets and "gsheets" in st.secrets["connections"]:
-        creds = try_info(dict(st.secrets["connections"]["gsheets"]), "st.secrets[connections][gsheets]")
+    if "connections" in secrets and "gsheets" in secrets["connections"]:
+        creds = try_info(dict(secrets["connections"]["gsheets"]), "st.secrets[connections][gsheets]")
         if creds is not None:
             return creds
 
@@ -92,17 +112,76 @@ def _load_credentials() -> Credentials:
     )
 
 
+def _auth_breaker() -> CircuitBreaker:
+    slug = current_tenant().slug
+    return _auth_breakers.setdefault(slug, CircuitBreaker(f"Google Sheets authentication ({slug})"))
+
+
+def _auth_status() -> dict:
+    return _auth_statuses.setdefault(current_tenant().slug, {"records": None, "as_of": None, "degraded": False})
+
+
 def get_authentication_data():
-    return _get_client().open_by_key(FAMILY_CONTRIBUTION_SHEET_ID).worksheet("AUTHENTICATION")
+    return _get_client().open_by_key(current_tenant().auth_sheet_id).worksheet("AUTHENTICATION")
 
 
-@st.cache_data(ttl=60, show_spinner=False)
-def get_auth_records():
+def _read_auth_records():
+    tenant = current_tenant()
+    if tenant.auth_sheet_id == tenant.sheet_id:
+        # Same workbook: the auth columns ride along with the version marker,
+        # and the transaction columns are only read when that marker moved.
+        return fetch_workbook_batch(include_auth=True, include_transactions=False)["auth"]
     return get_authentication_data().get_all_records()
 
 
-def clear_auth_cache() -> None:
-    get_auth_records.clear()
+def _fetch_auth_records():
+    return _auth_breaker().call(_read_auth_records)
+
+
+# Password hashes stay in this process; they never go to the host-wide
+# snapshot store.
+@cache_data(ttl=AUTH_CACHE_TTL, show_spinner=False)
+def _get_auth_records_cached():
+    return _fetch_auth_records()
+
+
+def get_auth_records():
+    if has_pending_invalidation(tenant_key(AUTH_TOPIC)):
+        clear_auth_cache()
+    status = _auth_status()
+    try:
+        records = _get_auth_records_cached()
+    except Exception:
+        records = status["records"]
+        if records is None:
+            raise
+        status.update(degraded=True)
+        return records
+
+    status.update(records=records, as_of=datetime.now(), degraded=False)
+    return records
+
+
+@cache_resource(max_entries=REGISTRY_CACHE_ENTRIES, show_spinner=False)
+def _get_member_registry_cached(usernames: tuple) -> MemberRegistry:
+    return MemberRegistry(usernames)
+
+
+def get_member_registry() -> MemberRegistry:
+    # Keyed on the username column, so the registry is rebuilt only when an
+    # account is added; everything keyed by it follows automatically.
+    return _get_member_registry_cached(tuple(str(row.get("USERNAME", "")) for row in get_auth_records()))
+
+
+def get_auth_data_status() -> dict:
+    status = _auth_status()
+    return {key: status[key] for key in ("as_of", "degraded")}
+
+
+def clear_auth_cache(broadcast: bool = False) -> None:
+    _get_auth_records_cached.clear()
+    if broadcast:
+        publish_invalidation(tenant_key(AUTH_TOPIC))
 
 
 def view_authentication_data():
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+import os
+import sys
+import threading
+import time
+
+MB = 1024 * 1024
+CACHE_MAX_BYTES = int(float(os.getenv("CACHE_MAX_MB", "512")) * MB)
+CACHE_NAMESPACE_MAX_BYTES = int(float(os.getenv("CACHE_NAMESPACE_MAX_MB", "256")) * MB)
+SIZEOF_MAX_DEPTH = 6
+RETIRED_VERSIONS_KEPT = 8
+
+
+def _namespace_budgets() -> dict[str, int]:
+    # CACHE_BUDGETS="_get_transaction_data_cached=128,_get_log_index_cached=64" (MB)
+    budgets = {}
+    for item in os.getenv("CACHE_BUDGETS", "").split(","):
+        name, _, megabytes = item.partition("=")
+        if name.strip() and megabytes.strip():
+            budgets[name.strip()] = int(float(megabytes) * MB)
+    return budgets
+
+
+def sizeof(value, _seen: set | None = None, _depth: int = 0) -> int:
+    """Approximate resident bytes of ``value``.
+
+    DataFrames and Series report ``memory_usage(deep=True)``, arrays their
+    ``nbytes``; containers and plain objects are walked to a fixed depth, each
+    object counted once.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+        except ValueError:
+            # pandas cannot walk read-only object arrays; count their items here.
+            return _frame_bytes(value)
+        except TypeError:
+            pass
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(value, 0)
+    if _depth >= SIZEOF_MAX_DEPTH or isinstance(value, (str, bytes, bytearray, int, float, bool)):
+        return size
+    if isinstance(value, dict):
+        return size + sum(sizeof(k, seen, _depth + 1) + sizeof(v, seen, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(sizeof(item, seen, _depth + 1) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + sizeof(vars(value), seen, _depth + 1)
+    return size
+
+
+def _frame_bytes(value) -> int:
+    usage = value.memory_usage(deep=False)
+    size = int(usage.sum() if hasattr(usage, "sum") else usage)
+    columns = [column for _, column in value.items()] if hasattr(value, "columns") else [value]
+    for column in columns:
+        if column.dtype == object:
+            size += sum(sys.getsizeof(item) for item in column.array)
+    return size
+
+
+class _Stats:
+    __slots__ = ("hits", "misses", "evictions", "bytes", "entries")
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.bytes = self.entries = 0
+
+
+class CacheManager:
+    """One LRU over every cached value in the process, with byte budgets.
+
+    Entries are grouped by namespace (one per cached function, written
+    ``tenant/function`` for tenant-scoped caches). A put evicts
+    least-recently-used entries first from its own namespace until it fits
+    that namespace's budget, then from its tenant until the tenant budget
+    holds, then from anywhere until the global budget holds. Entries may carry
+    a ``(scope, version)`` pair; ``observe_version`` drops every entry of that
+    scope cached under a different version and retires the version it
+    replaces, so a slow build for a retired version is not stored afterwards.
+    Versions not seen yet are accepted: callers observe a version only once a
+    build for it has succeeded.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, namespace_max_bytes: int = CACHE_NAMESPACE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.namespace_max_bytes = namespace_max_bytes
+        self.budgets = _namespace_budgets()
+        self._entries: OrderedDict = OrderedDict()
+        self._stats: dict[str, _Stats] = {}
+        self._versions: dict[str, str] = {}
+        self._retired: dict[str, OrderedDict] = {}
+        self._tenant_bytes: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+
+    def budget(self, namespace: str) -> int:
+        function = namespace.rpartition("/")[2]
+        return min(self.budgets.get(function, self.namespace_max_bytes), self.max_bytes)
+
+    def _stat(self, namespace: str) -> _Stats:
+        return self._stats.setdefault(namespace, _Stats())
+
+    def get(self, namespace: str, key, ttl: float | None = None, track: bool = True):
+        """Return ``(True, value)`` on a hit and ``(False, None)`` on a miss.
+
+        ``track=False`` leaves the hit/miss counts alone, for a re-check of a
+        lookup that was already counted.
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and ttl is not None and time.time() - entry["stored_at"] >= ttl:
+                self._drop((namespace, key))
+                entry = None
+            stat = self._stat(namespace)
+            if entry is None:
+                stat.misses += track
+                return False, None
+            stat.hits += track
+            self._entries.move_to_end((namespace, key))
+            return True, entry["value"]
+
+    def put(
+        self,
+        namespace: str,
+        key,
+        value,
+        scope: str | None = None,
+        version: str | None = None,
+        tenant: str | None = None,
+        tenant_budget: int | None = None,
+    ) -> None:
+        size = sizeof(value)
+        budget = self.budget(namespace)
+        with self._lock:
+            if scope is not None and version is not None and version in self._retired.get(scope, ()):
+                # Computed under a version that has already been retired.
+                return
+            self._drop((namespace, key))
+            if size > budget:
+                return
+            self._entries[(namespace, key)] = {
+                "value": value,
+                "size": size,
+                "scope": scope,
+                "version": version,
+                "tenant": tenant,
+                "stored_at": time.time(),
+            }
+            stat = self._stat(namespace)
+            stat.bytes += size
+            stat.entries += 1
+            self.total_bytes += size
+            if tenant is not None:
+                self._tenant_bytes[tenant] = self._tenant_bytes.get(tenant, 0) + size
+            self._evict(lambda k: k[0] == namespace, lambda: stat.bytes > budget)
+            if tenant is not None and tenant_budget is not None:
+                self._evict(
+                    lambda k: self._entries[k]["tenant"] == tenant,
+                    lambda: self._tenant_bytes.get(tenant, 0) > tenant_budget,
+                )
+            self._evict(lambda k: True, lambda: self.total_bytes > self.max_bytes)
+
+    def _evict(self, matches, over_budget) -> None:
+        for key in [k for k in list(self._entries) if matches(k)]:
+            if not over_budget():
+                return
+            self._drop(key)
+            self._stat(key[0]).evictions += 1
+
+    def _drop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        stat = self._stat(key[0])
+        stat.bytes -= entry["size"]
+        stat.entries -= 1
+        self.total_bytes -= entry["size"]
+        if entry["tenant"] is not None:
+            self._tenant_bytes[entry["tenant"]] -= entry["size"]
+
+    def trim_namespace(self, namespace: str, max_entries: int) -> None:
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == namespace]
+            for key in keys[: max(len(keys) - max_entries, 0)]:
+                self._drop(key)
+                self._stat(namespace).evictions += 1
+
+    def observe_version(self, scope: str, version: str) -> None:
+        with self._lock:
+            previous = self._versions.get(scope)
+            if previous == version:
+                return
+            self._versions[scope] = version
+            retired = self._retired.setdefault(scope, OrderedDict())
+            retired.pop(version, None)
+            if previous is not None:
+                retired[previous] = None
+                while len(retired) > RETIRED_VERSIONS_KEPT:
+                    retired.popitem(last=False)
+            stale = [k for k, e in self._entries.items() if e["scope"] == scope and e["version"] != version]
+            for key in stale:
+                self._drop(key)
+
+    def clear(self, namespace: str | None = None) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                self._drop(key)
+
+    def tenant_bytes(self, tenant: str) -> int:
+        with self._lock:
+            return self._tenant_bytes.get(tenant, 0)
+
+    def stats(self, tenant: str | None = None) -> list[dict]:
+        with self._lock:
+            rows = []
+            for namespace, stat in sorted(self._stats.items()):
+                owner, _, function = namespace.rpartition("/")
+                if tenant is not None and owner not in (tenant, ""):
+                    continue
+                lookups = stat.hits + stat.misses
+                rows.append(
+                    {
+                        "TENANT": owner or "shared",
+                        "NAMESPACE": function,
+                        "ENTRIES": stat.entries,
+                        "BYTES": stat.bytes,
+                        "BUDGET": self.budget(namespace),
+                        "HITS": stat.hits,
+                        "MISSES": stat.misses,
+                        "HIT RATE %": round(stat.hits / lookups * 100, 1) if lookups else 0.0,
+                        "EVICTIONS": stat.evictions,
+                    }
+                )
+            return rows
+
+
+_manager = CacheManager()
+
+
+def get_cache_manager() -> CacheManager:
+    return _manager
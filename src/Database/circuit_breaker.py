@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+
+FAILURE_THRESHOLD = int(os.getenv("SHEETS_BREAKER_FAILURES", "3"))
+COOLDOWN_SECONDS = float(os.getenv("SHEETS_BREAKER_COOLDOWN", "60"))
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """Process-wide breaker around a remote dependency.
+
+    After ``failure_threshold`` consecutive failures calls fail fast for
+    ``cooldown_seconds``; then exactly one caller is let through as a
+    recovery probe while everyone else keeps failing fast.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, cooldown_seconds: float = COOLDOWN_SECONDS):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._last_success = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    @property
+    def last_success(self) -> float:
+        return self._last_success
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return
+            if self._state == STATE_OPEN and time.time() - self._opened_at >= self.cooldown_seconds:
+                self._state = STATE_HALF_OPEN
+                return
+            raise CircuitOpenError(f"{self.name} is unavailable; retrying after cool-down.")
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._last_success = time.time()
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = STATE_OPEN
+                self._opened_at = time.time()
+
+    def call(self, fn, *args, **kwargs):
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
@@ -0,0 +1,129 @@
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+try:
+    from src.Database.private_files import DATA_DIR, connect_private
+except ModuleNotFoundError:
+    from Database.private_files import DATA_DIR, connect_private
+
+TRANSACTIONS_TOPIC = "transactions"
+AUTH_TOPIC = "auth"
+
+BUS_BACKEND = os.getenv("CACHE_BUS_BACKEND", "sqlite").strip().lower()
+BUS_PATH = Path(os.getenv("CACHE_BUS_PATH", "").strip() or DATA_DIR / "cache_bus.sqlite3")
+EVENT_RETENTION_SECONDS = 3600
+
+
+class InvalidationBus:
+    """Broadcasts "topic changed" events between app replicas.
+
+    Writers call ``publish`` after a successful write; readers call ``poll``
+    before serving cached data and drop their local snapshot when it returns True.
+    """
+
+    def publish(self, topic: str) -> None:
+        raise NotImplementedError
+
+    def poll(self, topic: str) -> bool:
+        raise NotImplementedError
+
+
+class NullInvalidationBus(InvalidationBus):
+    def publish(self, topic: str) -> None:
+        return None
+
+    def poll(self, topic: str) -> bool:
+        return False
+
+
+class SQLiteInvalidationBus(InvalidationBus):
+    """Local stand-in for a real message bus: replicas on one host share a SQLite file."""
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._origin = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, "
+                "origin TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS events_topic ON events (topic, id)")
+            row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+        self._last_seen: dict[str, int] = {}
+        self._start_id = int(row[0])
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect_private(self._path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(self, topic: str) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO events (topic, origin, created) VALUES (?, ?, ?)",
+            (topic, self._origin, now),
+        )
+        conn.execute("DELETE FROM events WHERE created < ?", (now - EVENT_RETENTION_SECONDS,))
+
+    def poll(self, topic: str) -> bool:
+        row = self._connect().execute(
+            "SELECT COALESCE(MAX(id), 0) FROM events WHERE topic = ? AND origin != ?",
+            (topic, self._origin),
+        ).fetchone()
+        latest = int(row[0])
+        with self._lock:
+            seen = self._last_seen.get(topic, self._start_id)
+            if latest <= seen:
+                return False
+            self._last_seen[topic] = latest
+        return True
+
+
+_BACKENDS = {
+    "none": lambda: NullInvalidationBus(),
+    "sqlite": lambda: SQLiteInvalidationBus(BUS_PATH),
+}
+_bus: InvalidationBus | None = None
+_bus_lock = threading.Lock()
+
+
+def register_bus_backend(name: str, factory) -> None:
+    _BACKENDS[name.strip().lower()] = factory
+
+
+def get_bus() -> InvalidationBus:
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                factory = _BACKENDS.get(BUS_BACKEND, _BACKENDS["sqlite"])
+                try:
+                    _bus = factory()
+                except (OSError, sqlite3.Error):
+                    _bus = NullInvalidationBus()
+    return _bus
+
+
+def publish_invalidation(topic: str) -> None:
+    try:
+        get_bus().publish(topic)
+    except sqlite3.Error:
+        pass
+
+
+def has_pending_invalidation(topic: str) -> bool:
+    try:
+        return get_bus().poll(topic)
+    except sqlite3.Error:
+        return False
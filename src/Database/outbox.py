@@ -0,0 +1,240 @@
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from src.Database.private_files import DATA_DIR, connect_private
+    from src.Tools.member_registry import normalize_name
+    from src.Tools.program_config import get_active_program
+    from src.Tools.tenants import DEFAULT_TENANT, current_tenant
+except ModuleNotFoundError:
+    from Database.private_files import DATA_DIR, connect_private
+    from Tools.member_registry import normalize_name
+    from Tools.program_config import get_active_program
+    from Tools.tenants import DEFAULT_TENANT, current_tenant
+
+OUTBOX_PATH = Path(os.getenv("SUBMISSION_OUTBOX_PATH", "").strip() or DATA_DIR / "submission_outbox.sqlite3")
+WORKER_INTERVAL_SECONDS = 5.0
+CLAIM_SECONDS = 60
+MAX_BACKOFF_SECONDS = 300
+# Sent rows are dropped once the sheet shows them; this bounds how long one
+# that never shows up (deleted by an admin) keeps blocking a resubmission.
+SENT_RETENTION_SECONDS = 3600
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+
+
+def idempotency_key(partition: str, name: str, week: str) -> str:
+    return f"{partition}|{normalize_name(name)}|{str(week).strip().lower()}"
+
+
+class SubmissionOutbox:
+    """Write-ahead journal for contribution submissions.
+
+    A submission is acknowledged once it is journaled; a background worker
+    replays pending entries to their partition with exponential backoff.
+    Entries are keyed by partition, member and week, so each program year
+    starts with a clean slate.
+    """
+
+    def __init__(self, path: Path, legacy_partition: str = ""):
+        self._path = Path(path)
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS submissions ("
+            "key TEXT PRIMARY KEY, name TEXT NOT NULL, amount REAL NOT NULL, week TEXT NOT NULL, "
+            "date_str TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "next_attempt REAL NOT NULL DEFAULT 0, claimed_until REAL NOT NULL DEFAULT 0, "
+            "last_error TEXT, created REAL NOT NULL, updated REAL NOT NULL, "
+            "partition TEXT NOT NULL DEFAULT '')"
+        )
+        self._migrate(legacy_partition)
+
+    def _migrate(self, legacy_partition: str) -> None:
+        # Journals from before partitioned keys hold rows for the original
+        # worksheet under "name|week" keys.
+        conn = self._connect()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+        if "partition" not in columns:
+            conn.execute("ALTER TABLE submissions ADD COLUMN partition TEXT NOT NULL DEFAULT ''")
+        if legacy_partition:
+            conn.execute(
+                "UPDATE OR IGNORE submissions SET partition = ?, key = ? || '|' || key WHERE partition = ''",
+                (legacy_partition, legacy_partition),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect_private(self._path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, partition: str, name: str, amount: float, week: str, date_str: str) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO submissions "
+            "(key, partition, name, amount, week, date_str, status, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                idempotency_key(partition, name, week),
+                partition,
+                normalize_name(name),
+                float(amount),
+                str(week).strip().lower(),
+                date_str,
+                STATUS_PENDING,
+                now,
+                now,
+            ),
+        )
+        self._wake.set()
+        return cursor.rowcount > 0
+
+    def pending_weeks(self, partition: str, name: str) -> list[str]:
+        rows = self._connect().execute(
+            "SELECT week FROM submissions WHERE partition = ? AND name = ? AND status = ?",
+            (partition, normalize_name(name), STATUS_PENDING),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending_entries(self, partition: str) -> list[tuple[str, str]]:
+        rows = self._connect().execute(
+            "SELECT name, week FROM submissions WHERE partition = ? AND status = ?", (partition, STATUS_PENDING)
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def pending_count(self) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM submissions WHERE status = ?", (STATUS_PENDING,)
+        ).fetchone()
+        return int(row[0])
+
+    def _claim_due(self) -> list[tuple]:
+        now = time.time()
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT key, partition, name, amount, week, date_str, attempts FROM submissions "
+            "WHERE status = ? AND next_attempt <= ? AND claimed_until < ? ORDER BY created",
+            (STATUS_PENDING, now, now),
+        ).fetchall()
+        claimed = []
+        for row in rows:
+            cursor = conn.execute(
+                "UPDATE submissions SET claimed_until = ? WHERE key = ? AND status = ? AND claimed_until < ?",
+                (now + CLAIM_SECONDS, row[0], STATUS_PENDING, now),
+            )
+            if cursor.rowcount > 0:
+                claimed.append(row)
+        return claimed
+
+    def _mark_sent(self, key: str) -> None:
+        self._connect().execute(
+            "UPDATE submissions SET status = ?, claimed_until = 0, last_error = NULL, updated = ? WHERE key = ?",
+            (STATUS_SENT, time.time(), key),
+        )
+
+    def _sent_partitions(self) -> set[str]:
+        rows = self._connect().execute(
+            "SELECT DISTINCT partition FROM submissions WHERE status = ?", (STATUS_SENT,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def _prune_sent(self, delivered_keys: set[str]) -> None:
+        conn = self._connect()
+        rows = conn.execute("SELECT key FROM submissions WHERE status = ?", (STATUS_SENT,)).fetchall()
+        conn.executemany(
+            "DELETE FROM submissions WHERE key = ? AND status = ?",
+            [(row[0], STATUS_SENT) for row in rows if row[0] in delivered_keys],
+        )
+        conn.execute(
+            "DELETE FROM submissions WHERE status = ? AND updated < ?",
+            (STATUS_SENT, time.time() - SENT_RETENTION_SECONDS),
+        )
+
+    def _mark_failed(self, key: str, attempts: int, error: Exception) -> None:
+        now = time.time()
+        backoff = min(WORKER_INTERVAL_SECONDS * 2**attempts, MAX_BACKOFF_SECONDS)
+        self._connect().execute(
+            "UPDATE submissions SET attempts = ?, next_attempt = ?, claimed_until = 0, last_error = ?, updated = ? "
+            "WHERE key = ?",
+            (attempts + 1, now + backoff, f"{type(error).__name__}: {error}", now, key),
+        )
+
+    def replay(self, deliver, already_delivered=None) -> int:
+        """Deliver due entries with ``deliver(partition, name, amount, week,
+        date_str)``. ``already_delivered(partitions)`` returns the keys the
+        sheet already holds; those entries are marked sent without a write,
+        and sent entries it reports are dropped from the journal.
+        """
+        claimed = self._claim_due()
+        partitions = {row[1] for row in claimed} | self._sent_partitions()
+        if not partitions:
+            return 0
+
+        delivered_keys = set()
+        if already_delivered is not None:
+            try:
+                delivered_keys = already_delivered(partitions)
+            except Exception:
+                delivered_keys = set()
+        self._prune_sent(delivered_keys)
+
+        sent = 0
+        for key, partition, name, amount, week, date_str, attempts in claimed:
+            if key in delivered_keys:
+                self._mark_sent(key)
+                continue
+            try:
+                deliver(partition, name, amount, week, date_str)
+            except Exception as exc:
+                self._mark_failed(key, attempts, exc)
+                continue
+            self._mark_sent(key)
+            sent += 1
+        return sent
+
+    def start_worker(self, deliver, already_delivered=None) -> None:
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+
+            def run() -> None:
+                while True:
+                    self._wake.wait(WORKER_INTERVAL_SECONDS)
+                    self._wake.clear()
+                    try:
+                        self.replay(deliver, already_delivered)
+                    except sqlite3.Error:
+                        pass
+
+            self._worker = threading.Thread(target=run, name="submission-outbox", daemon=True)
+            self._worker.start()
+
+
+_outboxes: dict[str, SubmissionOutbox] = {}
+_outbox_lock = threading.Lock()
+
+
+def outbox_path(slug: str) -> Path:
+    if slug == DEFAULT_TENANT:
+        return OUTBOX_PATH
+    return OUTBOX_PATH.with_name(f"{OUTBOX_PATH.stem}.{slug}{OUTBOX_PATH.suffix}")
+
+
+def get_outbox() -> SubmissionOutbox:
+    # One journal (and one replay worker) per tenant.
+    slug = current_tenant().slug
+    if slug not in _outboxes:
+        with _outbox_lock:
+            if slug not in _outboxes:
+                _outboxes[slug] = SubmissionOutbox(outbox_path(slug), get_active_program().worksheet)
+    return _outboxes[slug]
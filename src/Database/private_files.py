@@ -0,0 +1,21 @@
+from pathlib import Path
+import os
+import sqlite3
+
+DATA_DIR = Path(os.getenv("APP_DATA_DIR", "").strip() or Path(__file__).resolve().parents[2] / ".data")
+DIR_MODE = 0o700
+FILE_MODE = 0o600
+
+
+def private_path(path: Path) -> Path:
+    """Create ``path`` (and its directory) readable by the app user only."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True, mode=DIR_MODE)
+    os.close(os.open(path, os.O_CREAT | os.O_RDWR, FILE_MODE))
+    os.chmod(path, FILE_MODE)
+    return path
+
+
+def connect_private(path: Path, **kwargs) -> sqlite3.Connection:
+    # SQLite gives its -wal/-shm files the database file's permissions.
+    return sqlite3.connect(str(private_path(path)), **kwargs)
@@ -0,0 +1,200 @@
+from contextlib import contextmanager
+from functools import wraps
+import copy
+import os
+import threading
+
+try:
+    import streamlit as st
+except ModuleNotFoundError:  # pragma: no cover
+    st = None
+
+try:
+    from src.Database.cache_manager import MB, get_cache_manager
+    from src.Tools.tenants import TENANTS, current_tenant, tenant_key
+except ModuleNotFoundError:
+    from Database.cache_manager import MB, get_cache_manager
+    from Tools.tenants import TENANTS, current_tenant, tenant_key
+
+CACHE_BACKEND = os.getenv("DATA_CACHE_BACKEND", "auto").strip().lower()
+
+# (namespace, key) -> [lock, users]; an entry lives only while someone is
+# building or waiting for that key.
+_compute_locks: dict[tuple, list] = {}
+_compute_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _computing(namespace: str, key):
+    with _compute_locks_guard:
+        entry = _compute_locks.setdefault((namespace, key), [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _compute_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _compute_locks[(namespace, key)]
+
+
+class MemoryCache:
+    """In-process stand-in for ``st.cache_data``/``st.cache_resource``.
+
+    Every entry lives in the shared ``CacheManager``, one namespace per
+    wrapped function, so all caches share byte budgets, LRU eviction and hit
+    statistics. Entries expire after ``ttl`` seconds and beyond
+    ``max_entries``. With ``versioned=True`` the first two arguments are read
+    as ``(scope, version)`` and the entry is dropped once a newer version of
+    that scope is observed. ``cache_data`` hands out copies, like Streamlit;
+    the wrapped function keeps Streamlit's ``.clear()``. Concurrent misses on
+    one key wait for a single build instead of each running the function.
+
+    Entries belong to the current tenant (namespace ``tenant/function``) and
+    count against its budget, unless the cache is declared ``shared=True``.
+    """
+
+    def _memoize(self, ttl=None, max_entries=None, versioned=False, shared=False, copy_values=False):
+        def decorator(fn):
+            manager = get_cache_manager()
+
+            def namespace() -> str:
+                return fn.__qualname__ if shared else f"{current_tenant().slug}/{fn.__qualname__}"
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                name = namespace()
+                key = (args, tuple(sorted(kwargs.items())))
+                hit, value = manager.get(name, key, ttl)
+                if not hit:
+                    with _computing(name, key):
+                        hit, value = manager.get(name, key, ttl, track=False)
+                        if not hit:
+                            value = fn(*args, **kwargs)
+                            scope, version = (
+                                (tenant_key(args[0]), args[1]) if versioned and len(args) > 1 else (None, None)
+                            )
+                            tenant = None if shared else current_tenant().slug
+                            manager.put(name, key, value, scope, version, tenant, None if shared else tenant_budget())
+                            if max_entries is not None:
+                                manager.trim_namespace(name, max_entries)
+                return copy.deepcopy(value) if copy_values else value
+
+            wrapper.clear = lambda: manager.clear(namespace())
+            return wrapper
+
+        return decorator
+
+    def cache_data(self, ttl=None, max_entries=None, show_spinner=False, versioned=False, shared=False):
+        return self._memoize(ttl=ttl, max_entries=max_entries, versioned=versioned, shared=shared, copy_values=True)
+
+    def cache_resource(self, ttl=None, max_entries=None, show_spinner=False, versioned=False, shared=False):
+        return self._memoize(ttl=ttl, max_entries=max_entries, versioned=versioned, shared=shared)
+
+
+class StreamlitCache:
+    # Streamlit has no notion of data versions; the version argument is part
+    # of the cache key, so stale entries simply age out. The tenant slug is
+    # added to the key as a leading argument.
+    def _per_tenant(self, decorate, shared):
+        def decorator(fn):
+            if shared:
+                return decorate(fn)
+
+            @wraps(fn)
+            def keyed(tenant, *args, **kwargs):
+                return fn(*args, **kwargs)
+
+            cached = decorate(keyed)
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                return cached(current_tenant().slug, *args, **kwargs)
+
+            wrapper.clear = cached.clear
+            return wrapper
+
+        return decorator
+
+    def cache_data(self, versioned=False, shared=False, **kwargs):
+        return self._per_tenant(st.cache_data(**kwargs), shared)
+
+    def cache_resource(self, versioned=False, shared=False, **kwargs):
+        return self._per_tenant(st.cache_resource(**kwargs), shared)
+
+
+def tenant_budget(slug: str | None = None) -> int:
+    # Explicit cache_mb wins; otherwise tenants split the global budget evenly.
+    tenant = TENANTS.get(slug) if slug else current_tenant()
+    if tenant is not None and tenant.cache_mb:
+        return int(tenant.cache_mb * MB)
+    return get_cache_manager().max_bytes // max(len(TENANTS), 1)
+
+
+_BACKENDS = {
+    "memory": lambda: MemoryCache(),
+    "streamlit": lambda: StreamlitCache(),
+}
+_backend = None
+
+
+def register_cache_backend(name: str, factory) -> None:
+    _BACKENDS[name.strip().lower()] = factory
+
+
+def get_cache_backend():
+    global _backend
+    if _backend is None:
+        name = CACHE_BACKEND
+        if name not in _BACKENDS:
+            # The managed in-process cache is the default everywhere, so one
+            # byte budget covers the app, the CLI and background jobs.
+            name = "memory"
+        _backend = _BACKENDS[name]()
+    return _backend
+
+
+def cache_data(**kwargs):
+    return get_cache_backend().cache_data(**kwargs)
+
+
+def cache_resource(**kwargs):
+    return get_cache_backend().cache_resource(**kwargs)
+
+
+def cache_stats(tenant: str | None = None) -> list[dict]:
+    return get_cache_manager().stats(tenant)
+
+
+def observe_version(scope: str, version: str) -> None:
+    get_cache_manager().observe_version(tenant_key(scope), version)
+
+
+# Direct access to a tenant namespace of the cache manager, for state that is
+# updated in place rather than memoized (prefetched reads, leaderboards).
+def cache_get(name: str, key, ttl: float | None = None):
+    """Return ``(True, value)`` on a hit and ``(False, None)`` on a miss."""
+    return get_cache_manager().get(f"{current_tenant().slug}/{name}", key, ttl)
+
+
+def cache_put(name: str, key, value, scope: str | None = None, version: str | None = None) -> None:
+    slug = current_tenant().slug
+    scope = tenant_key(scope) if scope is not None else None
+    get_cache_manager().put(f"{slug}/{name}", key, value, scope, version, slug, tenant_budget())
+
+
+def cache_clear(name: str) -> None:
+    get_cache_manager().clear(f"{current_tenant().slug}/{name}")
+
+
+def get_secrets():
+    # st.secrets raises when no secrets.toml exists; headless callers then
+    # fall through to the environment/file credential sources.
+    if st is None:
+        return {}
+    try:
+        st.secrets.to_dict()
+    except Exception:
+        return {}
+    return st.secrets
@@ -0,0 +1,223 @@
+from pathlib import Path
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+try:
+    from src.Database.private_files import DATA_DIR, connect_private
+except ModuleNotFoundError:
+    from Database.private_files import DATA_DIR, connect_private
+
+STORE_BACKEND = os.getenv("SNAPSHOT_STORE_BACKEND", "sqlite").strip().lower()
+STORE_PATH = Path(os.getenv("SNAPSHOT_STORE_PATH", "").strip() or DATA_DIR / "snapshots.sqlite3")
+REFRESH_LEASE_SECONDS = 30
+REFRESH_WAIT_SECONDS = 10.0
+REFRESH_POLL_INTERVAL = 0.1
+
+
+KIND_JSON = "json"
+KIND_PARQUET = "parquet"
+# Decoding errors of either format; pyarrow's ArrowInvalid is a ValueError.
+DECODE_ERRORS = (ValueError, TypeError, OSError)
+
+
+def encode_value(value) -> tuple[str, bytes]:
+    """Serialize a snapshot without pickle: frames as Parquet, the rest as JSON.
+
+    Raises TypeError for values that are neither."""
+    if isinstance(value, pd.DataFrame):
+        buffer = io.BytesIO()
+        value.to_parquet(buffer)
+        return KIND_PARQUET, buffer.getvalue()
+    return KIND_JSON, json.dumps(value).encode("utf-8")
+
+
+def decode_value(kind: str, payload: bytes):
+    if kind == KIND_PARQUET:
+        return pd.read_parquet(io.BytesIO(payload))
+    if kind == KIND_JSON:
+        return json.loads(payload.decode("utf-8"))
+    raise ValueError(f"Unknown snapshot encoding: {kind}")
+
+
+class SnapshotStore:
+    """Host-wide (L2) cache tier shared by every replica.
+
+    ``get_or_refresh`` elects a single refresher per key through a lease, so
+    N replicas cost one Sheets read instead of N. Only public data belongs
+    here (transaction frames and version markers), never credentials.
+    """
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def put(self, key: str, value, version: str = "") -> None:
+        raise NotImplementedError
+
+    def invalidate(self, key: str) -> None:
+        raise NotImplementedError
+
+    def try_acquire(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def release(self, key: str) -> None:
+        raise NotImplementedError
+
+    def get_or_refresh(self, key: str, loader, version: str | None = None, max_age: float | None = None):
+        def fresh(entry) -> bool:
+            if entry is None:
+                return False
+            entry_version, _, updated = entry
+            if version is not None and entry_version != version:
+                return False
+            return max_age is None or time.time() - updated <= max_age
+
+        entry = self.get(key)
+        if fresh(entry):
+            return entry[1]
+
+        deadline = time.time() + REFRESH_WAIT_SECONDS
+        while True:
+            if self.try_acquire(key):
+                try:
+                    entry = self.get(key)
+                    if fresh(entry):
+                        return entry[1]
+                    value = loader()
+                    self.put(key, value, version or "")
+                    return value
+                finally:
+                    self.release(key)
+
+            if time.time() >= deadline:
+                return loader()
+
+            time.sleep(REFRESH_POLL_INTERVAL)
+            entry = self.get(key)
+            if fresh(entry):
+                return entry[1]
+
+
+class NullSnapshotStore(SnapshotStore):
+    def get(self, key: str):
+        return None
+
+    def put(self, key: str, value, version: str = "") -> None:
+        return None
+
+    def invalidate(self, key: str) -> None:
+        return None
+
+    def try_acquire(self, key: str) -> bool:
+        return True
+
+    def release(self, key: str) -> None:
+        return None
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._holder = uuid.uuid4().hex
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, kind TEXT NOT NULL, payload BLOB NOT NULL, "
+            "updated REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "key TEXT PRIMARY KEY, holder TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect_private(self._path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connect().execute(
+            "SELECT version, kind, payload, updated FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], decode_value(row[1], row[2]), float(row[3])
+
+    def put(self, key: str, value, version: str = "") -> None:
+        kind, payload = encode_value(value)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, version, kind, payload, updated) VALUES (?, ?, ?, ?, ?)",
+            (key, version, kind, sqlite3.Binary(payload), time.time()),
+        )
+
+    def invalidate(self, key: str) -> None:
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def try_acquire(self, key: str) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO leases (key, holder, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET holder = excluded.holder, expires = excluded.expires "
+            "WHERE leases.expires < ? OR leases.holder = excluded.holder",
+            (key, self._holder, now + REFRESH_LEASE_SECONDS, now),
+        )
+        return cursor.rowcount > 0
+
+    def release(self, key: str) -> None:
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND holder = ?", (key, self._holder))
+
+
+_BACKENDS = {
+    "none": lambda: NullSnapshotStore(),
+    "sqlite": lambda: SQLiteSnapshotStore(STORE_PATH),
+}
+_store: SnapshotStore | None = None
+_store_lock = threading.Lock()
+
+
+def register_store_backend(name: str, factory) -> None:
+    _BACKENDS[name.strip().lower()] = factory
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                factory = _BACKENDS.get(STORE_BACKEND, _BACKENDS["sqlite"])
+                try:
+                    _store = factory()
+                except (OSError, sqlite3.Error):
+                    _store = NullSnapshotStore()
+    return _store
+
+
+def shared_snapshot(key: str, loader, version: str | None = None, max_age: float | None = None):
+    try:
+        return get_snapshot_store().get_or_refresh(key, loader, version=version, max_age=max_age)
+    except (sqlite3.Error, *DECODE_ERRORS):
+        return loader()
+
+
+def peek_snapshot(key: str):
+    try:
+        return get_snapshot_store().get(key)
+    except (sqlite3.Error, *DECODE_ERRORS):
+        return None
+
+
+def invalidate_snapshot(key: str) -> None:
+    try:
+        get_snapshot_store().invalidate(key)
+    except sqlite3.Error:
+        pass
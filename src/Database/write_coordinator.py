@@ -0,0 +1,101 @@
+from contextlib import ExitStack, contextmanager
+import threading
+import time
+
+try:
+    from src.Tools.tenants import current_tenant
+except ModuleNotFoundError:
+    from Tools.tenants import current_tenant
+
+SUBMISSIONS_SCOPE = "submissions"
+SIGNUPS_SCOPE = "signups"
+# A claim covers the gap until cached reads show the write; past this it is
+# dropped even if they never do (row deleted, cache stuck on a stale version).
+CLAIM_TTL_SECONDS = 600
+
+
+class WriteCoordinator:
+    """Serializes check-then-write per key inside one process.
+
+    A key is taken if it is in ``known_keys()`` (built from cached reads) or
+    was written by this process since; the check and the write run under a
+    lock for that key only, so unrelated writes never wait on each other.
+    Claims are released once ``known_keys()`` reports them, or after
+    ``CLAIM_TTL_SECONDS``. Submission keys carry their partition, so claims
+    never leak across program years.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: dict[str, list] = {}
+        self._claimed: dict[str, dict[str, float]] = {}
+
+    @contextmanager
+    def key_lock(self, key: str):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def is_claimed(self, scope: str, key: str) -> bool:
+        with self._guard:
+            return key in self._claimed.get(scope, {})
+
+    def _release_known(self, scope: str, known) -> None:
+        expired = time.monotonic() - CLAIM_TTL_SECONDS
+        with self._guard:
+            claimed = self._claimed.get(scope, {})
+            for key in [key for key, claimed_at in claimed.items() if key in known or claimed_at < expired]:
+                del claimed[key]
+
+    def _record(self, scope: str, keys) -> None:
+        now = time.monotonic()
+        with self._guard:
+            claimed = self._claimed.setdefault(scope, {})
+            for key in keys:
+                claimed[key] = now
+
+    def claim(self, scope: str, key: str, write, known_keys) -> bool:
+        with self.key_lock(f"{scope}:{key}"):
+            known = known_keys()
+            self._release_known(scope, known)
+            if self.is_claimed(scope, key) or key in known:
+                return False
+            if write() is False:
+                return False
+            self._record(scope, [key])
+            return True
+
+    def claim_many(self, scope: str, keys, write, known_keys) -> list[str]:
+        """Bulk ``claim``: ``write(fresh)`` receives the keys nobody holds yet
+        and the ones written are returned. Locks are taken in sorted order so
+        overlapping batches cannot deadlock.
+        """
+        keys = list(dict.fromkeys(keys))
+        with ExitStack() as stack:
+            for key in sorted(keys):
+                stack.enter_context(self.key_lock(f"{scope}:{key}"))
+            known = known_keys()
+            self._release_known(scope, known)
+            fresh = [key for key in keys if key not in known and not self.is_claimed(scope, key)]
+            if not fresh or write(fresh) is False:
+                return []
+            self._record(scope, fresh)
+            return fresh
+
+
+_coordinators: dict[str, WriteCoordinator] = {}
+_coordinators_lock = threading.Lock()
+
+
+def get_write_coordinator() -> WriteCoordinator:
+    # Per tenant: the same member name in two families is two different keys.
+    with _coordinators_lock:
+        return _coordinators.setdefault(current_tenant().slug, WriteCoordinator())
@@ -1,50 +1,120 @@
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+import gspread
+
 try:
     from src.Database.GOOGLE_SHEETS_AUTH import clear_auth_cache, get_auth_records, get_authentication_data
+    from src.Database.write_coordinator import SIGNUPS_SCOPE, get_write_coordinator
+    from src.Tools.member_registry import normalize_name
+    from src.Tools.password_hashing import HashPoolBusyError, hash_password, needs_rehash, verify_password
+    from src.Tools.tenants import current_tenant, tenant_bound
 except ModuleNotFoundError:
     from Database.GOOGLE_SHEETS_AUTH import clear_auth_cache, get_auth_records, get_authentication_data
+    from Database.write_coordinator import SIGNUPS_SCOPE, get_write_coordinator
+    from Tools.member_registry import normalize_name
+    from Tools.password_hashing import HashPoolBusyError, hash_password, needs_rehash, verify_password
+    from Tools.tenants import current_tenant, tenant_bound
 
-SALT = "super_random_secret_string"
+USERNAME_COLUMN = "USERNAME"
+PASSWORD_COLUMN = "PASSWORD"
+BUSY_MESSAGE = "Sign-in is busy right now. Please try again in a moment."
 
+logger = logging.getLogger(__name__)
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256((SALT + password).encode("utf-8")).hexdigest()
+# Hash upgrades (a KDF plus three sheet calls) run here, after the login has
+# returned; one thread is plenty since each account is upgraded once.
+_upgrade_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-upgrade")
+_pending_upgrades: set[tuple[str, str]] = set()
+_upgrade_lock = threading.Lock()
 
 
 def store_creds(username: str, password: str):
-    username = str(username or "").strip().title()
+    username = normalize_name(username)
     password = str(password or "")
     if not username or not password:
         return False, "Username and password are required."
 
-    auth_sheet = get_authentication_data()
-
-    records = get_auth_records()
-
-    existing_users = [str(row.get("USERNAME", "")).strip().title() for row in records]
-
-    if username in existing_users:
+    def existing_users() -> set[str]:
+        return {normalize_name(row.get(USERNAME_COLUMN)) for row in get_auth_records()}
+
+    def create_user() -> None:
+        hashed_password = hash_password(password)
+        get_authentication_data().append_row([username, hashed_password])
+        clear_auth_cache(broadcast=True)
+
+    # Check and append run under a per-username lock, so two sessions signing
+    # up the same name cannot both pass the existence check.
+    try:
+        created = get_write_coordinator().claim(SIGNUPS_SCOPE, username, create_user, existing_users)
+    except HashPoolBusyError:
+        return False, BUSY_MESSAGE
+    if not created:
         return False, "Username already exists. Please choose a different one."
 
-    hashed_password = hash_password(password)
-    auth_sheet.append_row([username, hashed_password])
-    clear_auth_cache()
-
     return True, "User created successfully."
 
 
+def _upgrade_password_hash(username: str, password: str) -> None:
+    # Best effort: the stored hash still verifies, so a failed upgrade is
+    # retried on the member's next login.
+    try:
+        worksheet = get_authentication_data()
+        # Resolve columns and the row from the live sheet: the cached records
+        # may be stale and their key order says nothing about column order.
+        header = worksheet.row_values(1)
+        column = header.index(PASSWORD_COLUMN) + 1
+        usernames = worksheet.col_values(header.index(USERNAME_COLUMN) + 1)
+        row = next(
+            (number for number, value in enumerate(usernames[1:], start=2) if normalize_name(value) == username),
+            None,
+        )
+        if row is None:
+            return
+        worksheet.update_cell(row, column, hash_password(password))
+        clear_auth_cache(broadcast=True)
+    except (gspread.exceptions.GSpreadException, OSError, ValueError, HashPoolBusyError) as exc:
+        logger.warning("Could not upgrade the password hash for %s: %s", username, exc)
+
+
+def _schedule_hash_upgrade(username: str, password: str) -> None:
+    key = (current_tenant().slug, username)
+    with _upgrade_lock:
+        if key in _pending_upgrades:
+            return
+        _pending_upgrades.add(key)
+
+    def run() -> None:
+        try:
+            _upgrade_password_hash(username, password)
+        finally:
+            with _upgrade_lock:
+                _pending_upgrades.discard(key)
+
+    _upgrade_executor.submit(tenant_bound(run))
+
+
 def verify_creds(username: str, password: str):
-    username = str(username or "").strip().title()
+    username = normalize_name(username)
     password = str(password or "")
     if not username or not password:
         return False, "Username and password are required."
 
-    hashed_input = hash_password(password)
     records = get_auth_records()
 
     for row in records:
-        if str(row.get("USERNAME", "")).strip().title() == username and row.get("PASSWORD") == hashed_input:
-            return True, "Logged in successfully!" 
+        if normalize_name(row.get(USERNAME_COLUMN)) != username:
+            continue
+        stored_hash = str(row.get(PASSWORD_COLUMN, ""))
+        try:
+            verified = verify_password(password, stored_hash)
+        except HashPoolBusyError:
+            return False, BUSY_MESSAGE
+        if verified:
+            if needs_rehash(stored_hash):
+                _schedule_hash_upgrade(username, password)
+            return True, "Logged in successfully!"
 
     return False, "Invalid username or password."
 
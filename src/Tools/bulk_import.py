@@ -0,0 +1,110 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.Tools.data_clean import clean_transaction_data, extract_week_numbers
+    from src.Tools.program_config import ProgramConfig
+except ModuleNotFoundError:
+    from Tools.data_clean import clean_transaction_data, extract_week_numbers
+    from Tools.program_config import ProgramConfig
+
+IMPORT_COLUMNS = ["NAME", "AMOUNT PAID", "DATE", "WEEK"]
+COLUMN_ALIASES = {"AMOUNT": "AMOUNT PAID", "MEMBER": "NAME", "WEEK NUMBER": "WEEK"}
+
+
+def normalize_upload(upload: pd.DataFrame) -> pd.DataFrame:
+    df = upload.rename(columns=lambda col: str(col).strip().upper())
+    df = df.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if v not in df.columns})
+    missing = [col for col in IMPORT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return df[IMPORT_COLUMNS].astype(str)
+
+
+def _first_gap_positions(members: pd.Series, positions: pd.Series, scheduled_count: int) -> pd.Series:
+    # For each member, the schedule position of the earliest week that is
+    # neither already paid nor in this import.
+    paid = np.zeros((members.nunique(), scheduled_count + 1), dtype=bool)
+    codes, uniques = pd.factorize(members)
+    paid[codes, positions.to_numpy()] = True
+    paid[:, scheduled_count] = False
+    return pd.Series(paid.argmin(axis=1), index=uniques)
+
+
+def _week_frame(entries) -> pd.DataFrame:
+    frame = pd.DataFrame(list(entries), columns=["NAME", "WEEK NUMBER"], dtype=object)
+    return frame.astype({"NAME": str, "WEEK NUMBER": float})
+
+
+def validate_import(
+    upload: pd.DataFrame,
+    program: ProgramConfig,
+    paid_weeks: dict[str, set[int]],
+    pending: set[tuple[str, int]],
+    today: date,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split an uploaded CSV into rows to append and rows rejected with a
+    REASON, applying the submit page's rules to every row at once."""
+    raw = normalize_upload(upload)
+    df = clean_transaction_data(raw)
+    other_dates = pd.to_datetime(raw["DATE"], errors="coerce", dayfirst=True, format="mixed")
+    df["DATE"] = df["DATE"].fillna(other_dates)
+    df["WEEK NUMBER"] = extract_week_numbers(raw["WEEK"]).astype(float)
+
+    scheduled = program.scheduled_weeks()
+    position = pd.Series(np.arange(len(scheduled)), index=scheduled)
+    df["POSITION"] = df["WEEK NUMBER"].map(position)
+    open_week = program.current_open_week(today)
+
+    # Existing (member, week) pairs as frames, matched against the upload in
+    # one isin per source instead of a lookup per row.
+    paid = _week_frame((name, week) for name, weeks in paid_weeks.items() for week in weeks)
+    pending_frame = _week_frame(pending)
+    member_week = pd.MultiIndex.from_arrays([df["NAME"].astype(str), df["WEEK NUMBER"]])
+    already_paid = member_week.isin(pd.MultiIndex.from_frame(paid))
+    already_pending = member_week.isin(pd.MultiIndex.from_frame(pending_frame))
+
+    checks = [
+        (df["NAME"].str.strip().isin(["", "Nan", "None"]).to_numpy(), "Missing name"),
+        (df["AMOUNT PAID"].isna().to_numpy(), "Invalid amount"),
+        (
+            (df["AMOUNT PAID"] != program.weekly_contribution).to_numpy(),
+            f"Amount must be {program.weekly_contribution:,.0f}",
+        ),
+        (df["DATE"].isna().to_numpy(), "Invalid date"),
+        ((df["DATE"] > pd.Timestamp(today)).to_numpy(), "Date is in the future"),
+        (df["WEEK NUMBER"].isna().to_numpy(), "Invalid week"),
+        (df["POSITION"].isna().to_numpy(), "Week is outside the program"),
+        ((df["WEEK NUMBER"] > open_week).to_numpy(), "Week is not open yet"),
+        (already_paid, "Week already paid"),
+        (already_pending, "Week already submitted (pending sync)"),
+        (df.duplicated(subset=["NAME", "WEEK NUMBER"], keep="first").to_numpy(), "Duplicate row in file"),
+    ]
+    df["REASON"] = np.select([mask for mask, _ in checks], [reason for _, reason in checks], default="")
+
+    # Ordering: weeks are paid in schedule order, so an imported week may not
+    # leave an earlier scheduled week unpaid.
+    candidates = df[df["REASON"] == ""]
+    if not candidates.empty:
+        existing = pd.concat([paid, pending_frame], ignore_index=True)
+        existing = existing[existing["NAME"].isin(candidates["NAME"])]
+        existing = existing.assign(POSITION=existing["WEEK NUMBER"].map(position)).dropna(subset=["POSITION"])
+        members = pd.concat([candidates["NAME"].astype(str), existing["NAME"]], ignore_index=True)
+        positions = pd.concat([candidates["POSITION"], existing["POSITION"]], ignore_index=True).astype(int)
+        gaps = _first_gap_positions(members, positions, len(scheduled))
+
+        candidate_positions = candidates["POSITION"].astype(int).to_numpy()
+        candidate_gaps = candidates["NAME"].map(gaps).to_numpy()
+        skips = candidate_positions > candidate_gaps
+        gap_weeks = pd.Series(np.asarray(scheduled)[candidate_gaps[skips]], dtype=str)
+        df.loc[candidates.index[skips], "REASON"] = ("Week " + gap_weeks + " is still unpaid").to_numpy(dtype=object)
+
+    df["DATE"] = df["DATE"].dt.strftime("%d/%m/%Y")
+    df["WEEK"] = "week " + df["WEEK NUMBER"].astype("Int64").astype(str)
+
+    accepted = df[df["REASON"] == ""][IMPORT_COLUMNS].reset_index(drop=True)
+    rejected = raw.assign(REASON=df["REASON"])[df["REASON"] != ""]
+    rejected.insert(0, "ROW", rejected.index + 2)
+    return accepted, rejected.reset_index(drop=True)
@@ -0,0 +1,142 @@
+import os
+
+import pandas as pd
+import plotly.graph_objects as go
+
+CHART_TOP_N = 20
+CHART_PAGE_SIZE = 25
+HEATMAP_PAGE_SIZE = 50
+WEBGL_POINT_THRESHOLD = 1000
+MAX_FIGURE_BYTES = int(os.getenv("MAX_FIGURE_BYTES", "1000000"))
+OTHERS_LABEL = "Others"
+OVERSIZED_MESSAGE = "This chart is too large to draw here. Narrow the view or use the CSV download."
+
+
+def top_n_with_others(df: pd.DataFrame, label: str, value: str, n: int = CHART_TOP_N) -> pd.DataFrame:
+    """Keep the ``n`` largest rows and fold the rest into one "Others" row."""
+    ranked = df.sort_values([value, label], ascending=[False, True])
+    if len(ranked) <= n:
+        return ranked[[label, value]].reset_index(drop=True)
+    rest = ranked.iloc[n:]
+    others = pd.DataFrame({label: [f"{OTHERS_LABEL} ({len(rest)})"], value: [rest[value].sum()]})
+    return pd.concat([ranked.iloc[:n][[label, value]], others], ignore_index=True)
+
+
+def page_count(rows: int, page_size: int = CHART_PAGE_SIZE) -> int:
+    return max((rows + page_size - 1) // page_size, 1)
+
+
+def paginate(df: pd.DataFrame, page: int, page_size: int = CHART_PAGE_SIZE) -> pd.DataFrame:
+    page = min(max(page, 1), page_count(len(df), page_size))
+    return df.iloc[(page - 1) * page_size : page * page_size]
+
+
+def member_week_matrix(paid_weeks: dict[str, set[int]], weeks: list[int]) -> pd.DataFrame:
+    # 1 = paid, 0 = missing; one row per member, one column per scheduled week.
+    position = {week: i for i, week in enumerate(weeks)}
+    rows = []
+    for name in sorted(paid_weeks):
+        row = [0] * len(weeks)
+        for week in paid_weeks[name]:
+            if week in position:
+                row[position[week]] = 1
+        rows.append(row)
+    return pd.DataFrame(rows, index=sorted(paid_weeks), columns=weeks, dtype="int8")
+
+
+def figure_bytes(fig: go.Figure) -> int:
+    return len(fig.to_json().encode("utf-8"))
+
+
+def within_payload_cap(fig: go.Figure, max_bytes: int = MAX_FIGURE_BYTES) -> bool:
+    return figure_bytes(fig) <= max_bytes
+
+
+def oversized_figure(title: str) -> go.Figure:
+    """Stand-in sent instead of a figure over the payload cap."""
+    fig = go.Figure()
+    fig.add_annotation(text=OVERSIZED_MESSAGE, x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False)
+    fig.update_layout(
+        title=title,
+        height=200,
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    return fig
+
+
+def _capped(fig: go.Figure, title: str, max_bytes: int) -> go.Figure:
+    return fig if within_payload_cap(fig, max_bytes) else oversized_figure(title)
+
+
+def _downsample(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    if len(df) <= max_points:
+        return df
+    step = -(-len(df) // max_points)
+    # keep the last point so the line still ends on the latest value
+    return pd.concat([df.iloc[::step], df.iloc[[-1]]]).drop_duplicates()
+
+
+def bar_chart(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    title: str,
+    color: str,
+    orientation: str = "v",
+    text_template: str | None = None,
+    max_bytes: int = MAX_FIGURE_BYTES,
+) -> go.Figure:
+    fig = go.Figure(
+        go.Bar(
+            x=df[x],
+            y=df[y],
+            orientation=orientation,
+            marker_color=color,
+            text=df[x] if orientation == "h" else df[y],
+            texttemplate=text_template,
+        )
+    )
+    fig.update_layout(title=title, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
+    return _capped(fig, title, max_bytes)
+
+
+def line_chart(df: pd.DataFrame, x: str, y: str, title: str, color: str, max_bytes: int = MAX_FIGURE_BYTES) -> go.Figure:
+    """Line chart that switches to WebGL above ``WEBGL_POINT_THRESHOLD`` points
+    and thins the series until the figure fits ``max_bytes``."""
+    max_points = len(df)
+    while True:
+        data = _downsample(df, max(max_points, 2))
+        scatter = go.Scattergl if len(data) > WEBGL_POINT_THRESHOLD else go.Scatter
+        fig = go.Figure(scatter(x=data[x], y=data[y], mode="lines+markers", line=dict(color=color, width=3)))
+        fig.update_layout(title=title, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
+        if max_points <= 2 or within_payload_cap(fig, max_bytes):
+            return fig
+        max_points //= 2
+
+
+def heatmap_chart(
+    matrix: pd.DataFrame, title: str, colors: list[str], max_bytes: int = MAX_FIGURE_BYTES
+) -> go.Figure:
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix.to_numpy(),
+            x=[f"W{week}" for week in matrix.columns],
+            y=list(matrix.index),
+            colorscale=[[0, colors[0]], [1, colors[1]]],
+            zmin=0,
+            zmax=1,
+            showscale=False,
+            xgap=1,
+            ygap=1,
+            hovertemplate="%{y} · %{x}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=title,
+        height=max(320, 18 * len(matrix) + 80),
+        margin=dict(l=10, r=10, t=50, b=10),
+        yaxis=dict(autorange="reversed"),
+    )
+    return _capped(fig, title, max_bytes)
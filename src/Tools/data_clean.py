@@ -1,18 +1,26 @@
+import numpy as np
 import pandas as pd
 
+try:
+    from src.Tools.member_registry import normalize_names
+except ModuleNotFoundError:
+    from Tools.member_registry import normalize_names
+
+TEXT_COLUMNS = ["NAME", "WEEK", "YEAR-MONTH"]
+
 
 def clean_transaction_data(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame(columns=["NAME", "AMOUNT PAID", "DATE", "WEEK"])
 
-    df = df.copy()
+    df = df.copy(deep=False)
     df.columns = df.columns.str.strip().str.upper()
 
     for col in ["NAME", "AMOUNT PAID", "DATE", "WEEK"]:
         if col not in df.columns:
             df[col] = ""
 
-    df["NAME"] = df["NAME"].astype(str).str.strip().str.title()
+    df["NAME"] = normalize_names(df["NAME"])
 
     df["AMOUNT PAID"] = (
         df["AMOUNT PAID"]
@@ -29,3 +37,43 @@ def clean_transaction_data(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
+
+def extract_week_numbers(weeks: pd.Series) -> pd.Series:
+    return pd.to_numeric(weeks.astype(str).str.extract(r"(\d+)", expand=False), errors="coerce")
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` backed by read-only views of its arrays.
+
+    Cached frames are shared by every session in the process; freezing them
+    turns an accidental in-place write (``.loc[...] = ``) into an error instead
+    of silently changing everyone's data. The views share ``df``'s memory, so
+    nothing is copied. Adding or replacing columns on a copy still works.
+    Object columns are left as they are (pandas cannot measure read-only
+    object arrays); snapshot text columns are Arrow-backed and immutable.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, np.dtype) and values.dtype != object:
+            values = values.to_numpy().view()
+            values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def build_transaction_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    snapshot = clean_transaction_data(df)
+    snapshot["WEEK NUMBER"] = extract_week_numbers(snapshot["WEEK"])
+    snapshot["DATE"] = pd.to_datetime(snapshot["DATE"], errors="coerce")
+    snapshot["YEAR-MONTH"] = snapshot["DATE"].dt.strftime("%Y-%m")
+
+    # Compacted summary rows carry how many original entries they replace.
+    entries = pd.to_numeric(snapshot["ENTRIES"], errors="coerce") if "ENTRIES" in snapshot.columns else None
+    snapshot["COMPACTED"] = entries.notna() if entries is not None else False
+    snapshot["ENTRIES"] = entries.fillna(1).astype(int) if entries is not None else 1
+
+    for col in TEXT_COLUMNS:
+        snapshot[col] = snapshot[col].astype("string[pyarrow]")
+
+    return freeze_frame(snapshot)
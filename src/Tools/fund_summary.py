@@ -0,0 +1,234 @@
+from pathlib import Path
+import json
+import os
+
+import pandas as pd
+
+try:
+    from src.Database.private_files import DATA_DIR, private_path
+    from src.Tools.member_registry import MemberRegistry
+    from src.Tools.tenants import current_tenant
+except ModuleNotFoundError:
+    from Database.private_files import DATA_DIR, private_path
+    from Tools.member_registry import MemberRegistry
+    from Tools.tenants import current_tenant
+
+SUMMARY_DIR = Path(os.getenv("FUND_SUMMARY_DIR", "").strip() or DATA_DIR / "fund_summary")
+SUMMARY_COLUMNS = ["NAME", "TOTAL", "ENTRIES", "PAID WEEKS", "MONTHLY", "VERSION"]
+
+
+def week_bits(weeks) -> int:
+    bits = 0
+    for week in weeks:
+        bits |= 1 << int(week)
+    return bits
+
+
+def paid_weeks_from_bits(bits: int) -> set[int]:
+    weeks, week = set(), 0
+    while bits:
+        if bits & 1:
+            weeks.add(week)
+        bits >>= 1
+        week += 1
+    return weeks
+
+
+def _empty_summary(version: str) -> dict:
+    return {"version": version, "fund_total": 0.0, "entries": 0, "fund_monthly": {}, "members": {}}
+
+
+def _with_fund_totals(summary: dict) -> dict:
+    fund_monthly: dict[str, float] = {}
+    for member in summary["members"].values():
+        for month, amount in member["monthly"].items():
+            fund_monthly[month] = fund_monthly.get(month, 0.0) + amount
+    summary["fund_monthly"] = dict(sorted(fund_monthly.items()))
+    summary["fund_total"] = float(sum(m["total"] for m in summary["members"].values()))
+    summary["entries"] = int(sum(m["entries"] for m in summary["members"].values()))
+    return summary
+
+
+def build_fund_summary(snapshot: pd.DataFrame, version: str) -> dict:
+    # O(members) aggregate of the transaction snapshot: totals, monthly
+    # inflow and a paid-week bitset per member.
+    summary = _empty_summary(version)
+    df = snapshot.dropna(subset=["NAME", "AMOUNT PAID"])
+    if df.empty:
+        return summary
+
+    names = df["NAME"].astype(str)
+    totals = df.groupby(names)["AMOUNT PAID"].sum()
+    entries = df.groupby(names)["ENTRIES"].sum()
+    monthly = df.dropna(subset=["YEAR-MONTH"]).groupby([names, df["YEAR-MONTH"].astype(str)])["AMOUNT PAID"].sum()
+    weeks = df.dropna(subset=["WEEK NUMBER"])
+    paid = weeks.groupby(weeks["NAME"].astype(str))["WEEK NUMBER"].unique()
+
+    members = {
+        name: {"total": float(total), "entries": int(entries[name]), "paid_weeks": 0, "monthly": {}}
+        for name, total in totals.items()
+    }
+    for (name, month), amount in monthly.items():
+        members[name]["monthly"][month] = float(amount)
+    for name, member_weeks in paid.items():
+        members[name]["paid_weeks"] = week_bits(member_weeks)
+
+    summary["members"] = members
+    return _with_fund_totals(summary)
+
+
+def apply_contribution(
+    summary: dict,
+    name: str,
+    amount: float,
+    week_number: int | None,
+    year_month: str | None,
+    version: str,
+) -> dict:
+    member = summary["members"].setdefault(name, {"total": 0.0, "entries": 0, "paid_weeks": 0, "monthly": {}})
+    member["total"] += float(amount)
+    member["entries"] += 1
+    if week_number is not None:
+        member["paid_weeks"] |= 1 << int(week_number)
+    if year_month:
+        member["monthly"][year_month] = member["monthly"].get(year_month, 0.0) + float(amount)
+
+    summary["fund_total"] += float(amount)
+    summary["entries"] += 1
+    if year_month:
+        summary["fund_monthly"][year_month] = summary["fund_monthly"].get(year_month, 0.0) + float(amount)
+        summary["fund_monthly"] = dict(sorted(summary["fund_monthly"].items()))
+    summary["version"] = version
+    return summary
+
+
+def monthly_frame(monthly: dict[str, float]) -> pd.DataFrame:
+    if not monthly:
+        return pd.DataFrame(columns=["MONTH", "AMOUNT PAID"])
+    return pd.DataFrame(
+        {
+            "MONTH": pd.to_datetime([f"{month}-01" for month in monthly]),
+            "AMOUNT PAID": list(monthly.values()),
+        }
+    )
+
+
+def build_member_payloads(summary: dict, registry: MemberRegistry) -> dict:
+    # Everything a member's dashboard needs, computed for all members in one
+    # pass so a page load is a dict lookup keyed by member ID. Summary names
+    # without an account get IDs after the registered ones.
+    registry = registry.extend(sorted(summary["members"]))
+    members = summary["members"]
+    names = list(members)
+    fund_total = float(summary["fund_total"])
+
+    totals = pd.Series([members[name]["total"] for name in names], index=names, dtype=float)
+    ranks = totals.rank(method="min", ascending=False)
+    equity = totals / fund_total * 100 if fund_total > 0 else totals * 0.0
+
+    monthly = pd.DataFrame(
+        [(name, month, amount) for name in names for month, amount in members[name]["monthly"].items()],
+        columns=["NAME", "MONTH", "AMOUNT PAID"],
+    )
+    monthly["MONTH"] = pd.to_datetime(monthly["MONTH"] + "-01")
+    series = {
+        name: frame[["MONTH", "AMOUNT PAID"]].sort_values("MONTH").reset_index(drop=True)
+        for name, frame in monthly.groupby("NAME")
+    }
+
+    payloads = {
+        registry.id_of(name): {
+            "id": registry.id_of(name),
+            "name": name,
+            "total": float(totals[name]),
+            "equity_pct": float(equity[name]),
+            "rank": int(ranks[name]),
+            "monthly": series.get(name, monthly_frame({})),
+            "paid_weeks": members[name]["paid_weeks"],
+        }
+        for name in names
+    }
+    return {
+        "version": summary["version"],
+        "fund_total": fund_total,
+        "member_count": len(names),
+        "fund_monthly": monthly_frame(summary["fund_monthly"]),
+        "registry": registry,
+        "members": payloads,
+    }
+
+
+def empty_member_payload(name: str) -> dict:
+    return {"id": None, "name": name, "total": 0.0, "equity_pct": 0.0, "rank": None, "monthly": monthly_frame({}), "paid_weeks": 0}
+
+
+def summary_row(name: str, member: dict, version: str) -> list:
+    return [
+        name,
+        member["total"],
+        member["entries"],
+        hex(member["paid_weeks"]),
+        json.dumps(member["monthly"], sort_keys=True),
+        version,
+    ]
+
+
+def summary_to_rows(summary: dict) -> list[list]:
+    # Rows follow the members dict, so member i sits on sheet row i + 2 and
+    # an append can rewrite just the rows it changed.
+    rows = [list(SUMMARY_COLUMNS)]
+    rows.extend(summary_row(name, member, summary["version"]) for name, member in summary["members"].items())
+    return rows
+
+
+def summary_from_rows(rows: list[list]) -> dict | None:
+    if len(rows) < 2:
+        return None
+    header = [str(h).strip().upper() for h in rows[0]]
+    if header[: len(SUMMARY_COLUMNS)] != SUMMARY_COLUMNS:
+        return None
+
+    version = None
+    members = {}
+    for row in rows[1:]:
+        row = list(row) + [""] * (len(SUMMARY_COLUMNS) - len(row))
+        name, total, entries, paid_weeks, monthly, row_version = row[: len(SUMMARY_COLUMNS)]
+        if version is None:
+            version = str(row_version)
+        elif str(row_version) != version:
+            return None
+        try:
+            members[str(name)] = {
+                "total": float(total),
+                "entries": int(entries),
+                "paid_weeks": int(str(paid_weeks), 16),
+                "monthly": {str(k): float(v) for k, v in json.loads(monthly or "{}").items()},
+            }
+        except (TypeError, ValueError):
+            return None
+
+    summary = _empty_summary(version or "")
+    summary["members"] = members
+    return _with_fund_totals(summary)
+
+
+def summary_path(worksheet: str) -> Path:
+    # One directory per tenant: member totals never share a folder across families.
+    return SUMMARY_DIR / current_tenant().slug / f"{worksheet}.json"
+
+
+def load_summary_file(path: Path) -> dict | None:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_summary_file(path: Path, summary: dict) -> None:
+    path = Path(path)
+    try:
+        tmp_path = private_path(path.with_suffix(".tmp"))
+        tmp_path.write_text(json.dumps(summary), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        pass
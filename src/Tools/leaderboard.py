@@ -0,0 +1,90 @@
+from bisect import bisect_left, insort
+import threading
+
+COMPETITION = "competition"
+DENSE = "dense"
+
+
+class Leaderboard:
+    """Member totals kept in rank order as contributions arrive.
+
+    Entries are stored as ``(-total, key)`` in a sorted list, so rank
+    lookups are a bisect and top-K is a slice. Keys are member IDs (or names);
+    ``labels`` maps them to the names shown in ``top``. Ties share a rank:
+    competition ranking (1, 2, 2, 4) or dense ranking (1, 2, 2, 3).
+    """
+
+    def __init__(self, totals: dict | None = None, labels: dict | None = None):
+        self._lock = threading.Lock()
+        self._totals: dict = {}
+        self._labels: dict = dict(labels or {})
+        self._entries: list[tuple] = []
+        # Distinct negated totals (sorted) with how many members share each.
+        self._levels: list[float] = []
+        self._level_counts: dict[float, int] = {}
+        self.version: str | None = None
+        for name, total in (totals or {}).items():
+            self._insert(name, float(total))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._totals
+
+    def label(self, key) -> str:
+        return self._labels.get(key, key)
+
+    def _insert(self, key, total: float) -> None:
+        self._totals[key] = total
+        insort(self._entries, (-total, key))
+        count = self._level_counts.get(-total, 0)
+        if count == 0:
+            insort(self._levels, -total)
+        self._level_counts[-total] = count + 1
+
+    def _remove(self, key) -> None:
+        total = self._totals.pop(key)
+        del self._entries[bisect_left(self._entries, (-total, key))]
+        count = self._level_counts[-total] - 1
+        if count == 0:
+            del self._level_counts[-total]
+            del self._levels[bisect_left(self._levels, -total)]
+        else:
+            self._level_counts[-total] = count
+
+    def add(self, key, amount: float, version: str | None = None, label: str | None = None) -> None:
+        with self._lock:
+            total = self._totals.get(key, 0.0)
+            if key in self._totals:
+                self._remove(key)
+            self._insert(key, total + float(amount))
+            if label is not None:
+                self._labels[key] = label
+            if version is not None:
+                self.version = version
+
+    def total(self, key) -> float:
+        return self._totals.get(key, 0.0)
+
+    def _rank_of(self, total: float, method: str) -> int:
+        if method == DENSE:
+            return bisect_left(self._levels, -total) + 1
+        # (-total,) sorts before every (-total, key), whatever the key type.
+        return bisect_left(self._entries, (-total,)) + 1
+
+    def rank(self, key, method: str = COMPETITION) -> int | None:
+        with self._lock:
+            if key not in self._totals:
+                return None
+            return self._rank_of(self._totals[key], method)
+
+    def top(self, k: int, method: str = COMPETITION) -> list[dict]:
+        with self._lock:
+            return [
+                {"RANK": self._rank_of(-neg_total, method), "NAME": self.label(key), "AMOUNT PAID": -neg_total}
+                for neg_total, key in self._entries[:k]
+            ]
+
+    def rows(self, method: str = COMPETITION) -> list[dict]:
+        return self.top(len(self._entries), method)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from src.Tools.member_registry import MemberRegistry
+except ModuleNotFoundError:
+    from Tools.member_registry import MemberRegistry
+
+LOG_COLUMNS = ["NAME", "AMOUNT PAID", "DATE", "WEEK"]
+LOG_PAGE_SIZE = 50
+_EMPTY = np.array([], dtype=np.intp)
+
+
+class LogIndex:
+    """Contribution log sorted newest first, with hash indexes on member ID and week.
+
+    Queries return positions into the sorted frame in date order, so filtering
+    and paging are array slices instead of a sort over the whole log. Names are
+    mapped to registry IDs once, when the index is built.
+    """
+
+    def __init__(self, snapshot: pd.DataFrame, version: str | None = None, registry: MemberRegistry | None = None):
+        df = snapshot.dropna(subset=["NAME", "AMOUNT PAID"])
+        self.frame = df.sort_values(
+            ["DATE", "NAME"], ascending=[False, True], na_position="last", kind="stable", ignore_index=True
+        )
+        self.version = version
+        names = self.frame["NAME"].astype(str)
+        self.registry = (registry or MemberRegistry()).extend(names.unique())
+        self.member_ids = self.registry.ids_of(names)
+        self._by_member = pd.Series(np.arange(len(self.frame))).groupby(self.member_ids).indices
+        self._by_week = {int(week): rows for week, rows in self.frame.groupby("WEEK NUMBER").indices.items()}
+        self._search_text = (
+            names.str.lower()
+            + " "
+            + self.frame["WEEK"].astype(str).str.lower()
+            + " "
+            + self.frame["DATE"].dt.strftime("%d/%m/%Y").fillna("")
+        )
+        self.members = sorted((self.registry.name_of(i) for i in self._by_member if i >= 0), key=str.lower)
+        self.weeks = sorted(self._by_week)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def query(self, search: str = "", member: str | None = None, week: int | None = None) -> np.ndarray:
+        positions = np.arange(len(self.frame))
+        if member:
+            member_id = self.registry.id_of(member)
+            positions = self._by_member.get(member_id, _EMPTY) if member_id >= 0 else _EMPTY
+        if week is not None:
+            positions = np.intersect1d(positions, self._by_week.get(week, _EMPTY), assume_unique=True)
+        term = search.strip().lower()
+        if term and len(positions):
+            hits = self._search_text.iloc[positions].str.contains(term, regex=False).to_numpy()
+            positions = positions[hits]
+        return positions
+
+    def page(self, positions: np.ndarray, page: int, page_size: int = LOG_PAGE_SIZE) -> pd.DataFrame:
+        start = (max(page, 1) - 1) * page_size
+        rows = self.frame.iloc[positions[start : start + page_size]][LOG_COLUMNS].copy()
+        rows["DATE"] = rows["DATE"].dt.strftime("%d/%m/%Y")
+        return rows
+
+    def rows(self, positions: np.ndarray) -> pd.DataFrame:
+        rows = self.frame.iloc[positions][LOG_COLUMNS].copy()
+        rows["DATE"] = rows["DATE"].dt.strftime("%d/%m/%Y")
+        return rows
@@ -0,0 +1,48 @@
+import streamlit as st
+
+try:
+    from src.Tools.charts import page_count
+    from src.Tools.log_index import LOG_PAGE_SIZE, LogIndex
+except ModuleNotFoundError:
+    from Tools.charts import page_count
+    from Tools.log_index import LOG_PAGE_SIZE, LogIndex
+
+
+def render_log_viewer(index: LogIndex, key: str, member: str | None = None, file_name: str = "contribution_log.csv") -> None:
+    """Search, filter and page through ``index``; only the visible page is sent
+    to the browser. Pass ``member`` to lock the viewer to one member."""
+    f1, f2, f3 = st.columns([2, 1, 1])
+    with f1:
+        search = st.text_input("Search", key=f"{key}_search", placeholder="Name, week or dd/mm/YYYY")
+    with f2:
+        if member is None:
+            selected = st.selectbox("Member", ["All"] + index.members, key=f"{key}_member")
+            member_filter = None if selected == "All" else selected
+        else:
+            member_filter = member
+            st.text_input("Member", value=member, disabled=True, key=f"{key}_member_locked")
+    with f3:
+        selected_week = st.selectbox("Week", ["All"] + index.weeks, key=f"{key}_week")
+    week_filter = None if selected_week == "All" else int(selected_week)
+
+    positions = index.query(search, member_filter, week_filter)
+    pages = page_count(len(positions), LOG_PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = int(st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page"))
+
+    if not len(positions):
+        st.info("No rows match these filters.")
+        return
+
+    st.dataframe(index.page(positions, page), use_container_width=True, hide_index=True)
+    st.caption(f"{len(positions):,} rows · page {page} of {pages}")
+    if st.button("Prepare CSV Of Matching Rows", key=f"{key}_prepare", use_container_width=True):
+        st.download_button(
+            f"Download {len(positions):,} Rows (CSV)",
+            data=index.rows(positions).to_csv(index=False).encode("utf-8"),
+            file_name=file_name,
+            mime="text/csv",
+            use_container_width=True,
+            key=f"{key}_download",
+        )
@@ -0,0 +1,140 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+ADMIN_USERNAME = "Admin"
+UNMATCHED = -1
+
+
+def normalize_name(name) -> str:
+    return str(name or "").strip().title()
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    return names.astype(str).str.strip().str.title()
+
+
+class MemberRegistry:
+    """Stable integer IDs for the accounts in the AUTHENTICATION sheet.
+
+    IDs follow sheet order, which only ever grows by appending, so a member
+    keeps their ID across reloads. ``extend`` adds names that have no account
+    (bulk imports, typos) after the registered ones so nothing is dropped;
+    ``unmatched`` lists them. Two registries with the same names compare equal,
+    which lets a registry be part of a cache key.
+    """
+
+    def __init__(self, usernames=()):
+        self.names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._version: str | None = None
+        for username in usernames:
+            name = normalize_name(username)
+            if name != ADMIN_USERNAME:
+                self._add(name)
+        self.registered = len(self.names)
+
+    def _add(self, name: str) -> None:
+        if name and name not in self._ids:
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._version = None
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            digest = hashlib.sha1("\n".join(self.names).encode("utf-8")).hexdigest()[:12]
+            self._version = f"{self.registered}-{len(self.names)}|{digest}"
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return normalize_name(name) in self._ids
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MemberRegistry) and self.version == other.version
+
+    def __hash__(self) -> int:
+        return hash(self.version)
+
+    def __reduce__(self):
+        # Streamlit hashes cache arguments by pickling them.
+        return (_rebuild_registry, (tuple(self.names[: self.registered]), tuple(self.names[self.registered :])))
+
+    def id_of(self, name) -> int:
+        return self._ids.get(normalize_name(name), UNMATCHED)
+
+    def name_of(self, member_id: int) -> str:
+        return self.names[member_id]
+
+    def is_registered(self, member_id: int) -> bool:
+        return 0 <= member_id < self.registered
+
+    @property
+    def unmatched(self) -> list[str]:
+        return self.names[self.registered :]
+
+    def extend(self, names) -> "MemberRegistry":
+        registry = _rebuild_registry(tuple(self.names[: self.registered]), tuple(self.names[self.registered :]))
+        for name in names:
+            registry._add(normalize_name(name))
+        return registry
+
+    def ids_of(self, names: pd.Series) -> np.ndarray:
+        """Map a column of names to IDs with one lookup per distinct name."""
+        codes, uniques = pd.factorize(names)
+        lookup = np.array([self.id_of(name) for name in uniques] + [UNMATCHED], dtype=np.int32)
+        # factorize marks missing names -1, which indexes the trailing UNMATCHED.
+        return lookup[codes]
+
+
+def _rebuild_registry(registered: tuple, extra: tuple) -> MemberRegistry:
+    registry = MemberRegistry()
+    for name in registered:
+        registry._add(name)
+    registry.registered = len(registry.names)
+    for name in extra:
+        registry._add(name)
+    return registry
+
+
+class MemberCoverage:
+    """The fund summary re-keyed by member ID for one data version.
+
+    Totals live in an array indexed by ID and paid weeks in a list of
+    bitsets, so coverage, filtering and per-member lookups are integer
+    indexing rather than name comparisons. Members are listed in name order.
+    """
+
+    def __init__(self, summary: dict, registry: MemberRegistry):
+        self.version = summary["version"]
+        self.registry = registry.extend(sorted(summary["members"]))
+        self.totals = np.zeros(len(self.registry))
+        self.paid_bits = [0] * len(self.registry)
+        for name, member in summary["members"].items():
+            member_id = self.registry.id_of(name)
+            if member_id == UNMATCHED:
+                continue
+            self.totals[member_id] += member["total"]
+            self.paid_bits[member_id] |= member["paid_weeks"]
+        member_ids = {self.registry.id_of(name) for name in summary["members"]} - {UNMATCHED}
+        self.member_ids = sorted(member_ids, key=self.registry.name_of)
+
+    @property
+    def unmatched(self) -> list[str]:
+        return self.registry.unmatched
+
+    def name_of(self, member_id: int) -> str:
+        return self.registry.name_of(member_id)
+
+    def paying(self, mask: int) -> list[int]:
+        return [member_id for member_id in self.member_ids if self.paid_bits[member_id] & mask]
+
+    def combined_bits(self, mask: int) -> int:
+        bits = 0
+        for member_id in self.member_ids:
+            bits |= self.paid_bits[member_id] & mask
+        return bits
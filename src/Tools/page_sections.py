@@ -0,0 +1,51 @@
+import streamlit as st
+
+SKELETON_HEIGHT = 160
+
+
+def skeleton(height: int = SKELETON_HEIGHT) -> None:
+    st.markdown(
+        f"<div style='height:{height}px; border-radius:10px; background:#f1f5f1;'></div>",
+        unsafe_allow_html=True,
+    )
+
+
+class ProgressivePage:
+    """Lay a page out in reading order but compute heavy parts last.
+
+    ``section`` reserves a slot showing a skeleton and queues its body; lazy
+    sections sit behind a toggle and cost nothing until opened. ``flush``
+    fills the queued slots in page order, after the cheap content (KPI cards)
+    is already on screen, since Streamlit sends elements as they are created.
+    """
+
+    def __init__(self):
+        self._queue = []
+
+    def section(
+        self,
+        render,
+        title: str | None = None,
+        key: str | None = None,
+        lazy: bool = False,
+        height: int = SKELETON_HEIGHT,
+    ) -> None:
+        if lazy and not st.toggle(title, key=key):
+            return
+        slot = st.empty()
+        with slot.container():
+            skeleton(height)
+        self._queue.append((slot, render))
+
+    def defer(self, render) -> None:
+        # Work that only updates placeholders that already exist on the page.
+        self._queue.append((None, render))
+
+    def flush(self) -> None:
+        while self._queue:
+            slot, render = self._queue.pop(0)
+            if slot is None:
+                render()
+                continue
+            with slot.container():
+                render()
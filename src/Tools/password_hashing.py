@@ -0,0 +1,154 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+LEGACY_SALT = "super_random_secret_string"
+
+PBKDF2_ALGORITHM = "pbkdf2_sha256"
+SCRYPT_ALGORITHM = "scrypt"
+
+PASSWORD_KDF = os.getenv("PASSWORD_KDF", PBKDF2_ALGORITHM).strip().lower()
+PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "260000"))
+SCRYPT_LOG2_N = int(os.getenv("PASSWORD_SCRYPT_LOG2_N", "14"))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+
+# hashlib releases the GIL inside pbkdf2_hmac/scrypt, so a small thread pool
+# runs KDFs in parallel while capping how many burn CPU at once.
+HASH_WORKERS = max(int(os.getenv("PASSWORD_HASH_WORKERS", "2")), 1)
+HASH_TIMEOUT_SECONDS = 30
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class HashPoolBusyError(RuntimeError):
+    pass
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.b64decode(data.encode("ascii"))
+
+
+def _legacy_hash(password: str) -> str:
+    return hashlib.sha256((LEGACY_SALT + password).encode("utf-8")).hexdigest()
+
+
+def is_legacy_hash(stored: str) -> bool:
+    stored = str(stored or "")
+    return len(stored) == 64 and "$" not in stored
+
+
+def hash_password_sync(password: str, algorithm: str | None = None, cost: int | None = None) -> str:
+    algorithm = algorithm or PASSWORD_KDF
+    salt = secrets.token_bytes(SALT_BYTES)
+    secret = str(password).encode("utf-8")
+
+    if algorithm == SCRYPT_ALGORITHM:
+        log2_n = cost or SCRYPT_LOG2_N
+        digest = hashlib.scrypt(
+            secret, salt=salt, n=2**log2_n, r=SCRYPT_R, p=SCRYPT_P, maxmem=256 * 1024 * 1024
+        )
+        return f"{SCRYPT_ALGORITHM}${log2_n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+    iterations = cost or PBKDF2_ITERATIONS
+    digest = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations)
+    return f"{PBKDF2_ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password_sync(password: str, stored: str) -> bool:
+    stored = str(stored or "")
+    secret = str(password).encode("utf-8")
+
+    if is_legacy_hash(stored):
+        return hmac.compare_digest(_legacy_hash(str(password)), stored)
+
+    parts = stored.split("$")
+    try:
+        if parts[0] == PBKDF2_ALGORITHM and len(parts) == 4:
+            expected = _unb64(parts[3])
+            digest = hashlib.pbkdf2_hmac("sha256", secret, _unb64(parts[2]), int(parts[1]))
+            return hmac.compare_digest(digest, expected)
+
+        if parts[0] == SCRYPT_ALGORITHM and len(parts) == 6:
+            expected = _unb64(parts[5])
+            digest = hashlib.scrypt(
+                secret,
+                salt=_unb64(parts[4]),
+                n=2 ** int(parts[1]),
+                r=int(parts[2]),
+                p=int(parts[3]),
+                maxmem=256 * 1024 * 1024,
+                dklen=len(expected),
+            )
+            return hmac.compare_digest(digest, expected)
+    except (ValueError, TypeError):
+        return False
+
+    return False
+
+
+def needs_rehash(stored: str) -> bool:
+    stored = str(stored or "")
+    if is_legacy_hash(stored):
+        return True
+
+    parts = stored.split("$")
+    if parts[0] != PASSWORD_KDF:
+        return True
+    try:
+        if parts[0] == PBKDF2_ALGORITHM:
+            return int(parts[1]) < PBKDF2_ITERATIONS
+        if parts[0] == SCRYPT_ALGORITHM:
+            return int(parts[1]) < SCRYPT_LOG2_N
+    except (IndexError, ValueError):
+        return True
+    return True
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+def set_hash_workers(workers: int) -> None:
+    """Resize the KDF pool; in-flight hashes finish on the old pool."""
+    global HASH_WORKERS, _executor
+    with _executor_lock:
+        HASH_WORKERS = max(int(workers), 1)
+        previous, _executor = _executor, None
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _run_on_pool(fn, *args):
+    # The caller still waits for the answer (a login needs it), but the pool
+    # bounds how many KDFs run at once; a request that cannot get a worker in
+    # time is dropped instead of queueing behind everyone else.
+    future = _get_executor().submit(fn, *args)
+    try:
+        return future.result(timeout=HASH_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        future.cancel()
+        raise HashPoolBusyError("Password hashing is saturated; try again shortly.") from None
+
+
+def hash_password(password: str) -> str:
+    return _run_on_pool(hash_password_sync, password)
+
+
+def verify_password(password: str, stored: str) -> bool:
+    return _run_on_pool(verify_password_sync, password, stored)
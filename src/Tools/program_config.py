@@ -0,0 +1,109 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+import json
+import os
+
+PROGRAMS_PATH = os.getenv("PROGRAMS_PATH", "").strip()
+ACTIVE_PROGRAM_YEAR = os.getenv("ACTIVE_PROGRAM_YEAR", "").strip()
+
+
+@dataclass(frozen=True)
+class ProgramConfig:
+    year: int
+    worksheet: str
+    start_date: date  # Monday on which start_week opens
+    start_week: int = 7
+    legacy_week: int | None = 6
+    total_weeks: int = 52
+    target_fund: float = 364000.0
+    weekly_contribution: float = 1000.0
+
+    @property
+    def end_week(self) -> int:
+        return self.total_weeks
+
+    @property
+    def first_week(self) -> int:
+        return self.legacy_week if self.legacy_week is not None else self.start_week
+
+    @property
+    def label(self) -> str:
+        return f"{self.year} Program"
+
+    def current_open_week(self, today: date) -> int:
+        if today <= self.start_date:
+            return self.start_week
+        weeks_elapsed = (today - self.start_date).days // 7
+        return min(self.start_week + weeks_elapsed, self.end_week)
+
+    def scheduled_weeks(self) -> list[int]:
+        weeks = [self.legacy_week] if self.legacy_week is not None else []
+        weeks.extend(range(self.start_week, self.end_week + 1))
+        return weeks
+
+    def unpaid_weeks(self, paid_weeks: set[int], through_week: int) -> list[int]:
+        return [week for week in self.scheduled_weeks() if week <= through_week and week not in paid_weeks]
+
+
+# Partition per program year: the first cycle keeps the original TRANSACTION
+# worksheet, later cycles get their own TRANSACTION_<year> worksheet.
+PROGRAMS: dict[int, ProgramConfig] = {
+    2026: ProgramConfig(year=2026, worksheet="TRANSACTION", start_date=date(2026, 2, 23)),
+}
+
+
+def register_program(program: ProgramConfig) -> None:
+    PROGRAMS[program.year] = program
+
+
+def parse_programs(items: list[dict]) -> dict[int, ProgramConfig]:
+    programs = {}
+    for item in items:
+        item = dict(item)
+        year = int(item.pop("year"))
+        worksheet = str(item.pop("worksheet", f"TRANSACTION_{year}"))
+        start_date = date.fromisoformat(str(item.pop("start_date")))
+        programs[year] = ProgramConfig(year=year, worksheet=worksheet, start_date=start_date, **item)
+    return programs
+
+
+if PROGRAMS_PATH and Path(PROGRAMS_PATH).exists():
+    for program in parse_programs(json.loads(Path(PROGRAMS_PATH).read_text(encoding="utf-8"))).values():
+        register_program(program)
+
+# Set per request by the tenant router; unset means the module-level PROGRAMS.
+_scoped_programs: ContextVar[tuple[dict[int, ProgramConfig], int | None] | None] = ContextVar(
+    "scoped_programs", default=None
+)
+
+
+def use_programs(programs: dict[int, ProgramConfig], active_year: int | None = None):
+    return _scoped_programs.set((programs, active_year))
+
+
+def _registry() -> tuple[dict[int, ProgramConfig], int | None]:
+    scoped = _scoped_programs.get()
+    if scoped is not None:
+        return scoped
+    return PROGRAMS, int(ACTIVE_PROGRAM_YEAR) if ACTIVE_PROGRAM_YEAR else None
+
+
+def list_programs() -> list[ProgramConfig]:
+    programs, _ = _registry()
+    return [programs[year] for year in sorted(programs)]
+
+
+def get_program(year: int | None = None) -> ProgramConfig:
+    if year is None:
+        return get_active_program()
+    programs, _ = _registry()
+    return programs[int(year)]
+
+
+def get_active_program() -> ProgramConfig:
+    programs, active_year = _registry()
+    if active_year is not None and active_year in programs:
+        return programs[active_year]
+    return programs[max(programs)]
@@ -0,0 +1,71 @@
+import numpy as np
+
+try:
+    from src.Tools.fund_summary import week_bits
+    from src.Tools.program_config import ProgramConfig
+except ModuleNotFoundError:
+    from Tools.fund_summary import week_bits
+    from Tools.program_config import ProgramConfig
+
+PROJECTION_PATHS = 10000
+PROJECTION_SEED = 20260223
+# Cells (paths x members) drawn per chunk: about 8 MB of rates at a time,
+# whatever the group size.
+PROJECTION_CHUNK_CELLS = 1_000_000
+
+
+def project_fund(
+    summary: dict,
+    program: ProgramConfig,
+    open_week: int,
+    paths: int = PROJECTION_PATHS,
+    seed: int = PROJECTION_SEED,
+) -> dict:
+    """Monte Carlo projection of the fund total at the end of the program.
+
+    Each member's payment rate is drawn per path from Beta(paid + 1, missed + 1)
+    over the weeks due so far, and their remaining scheduled weeks (future and
+    unpaid past) are paid Binomial(remaining, rate). Paths are drawn in
+    vectorized chunks of ``PROJECTION_CHUNK_CELLS`` and only their totals are
+    kept, so memory stays flat as membership grows.
+    """
+    fund_total = float(summary["fund_total"])
+    target = float(program.target_fund)
+    members = list(summary["members"].values())
+
+    scheduled = program.scheduled_weeks()
+    due_mask = week_bits(week for week in scheduled if week <= open_week)
+    scheduled_mask = week_bits(scheduled)
+    due = bin(due_mask).count("1")
+
+    paid_due = np.array([bin(m["paid_weeks"] & due_mask).count("1") for m in members], dtype=float)
+    paid_all = np.array([bin(m["paid_weeks"] & scheduled_mask).count("1") for m in members], dtype=int)
+    remaining = len(scheduled) - paid_all
+
+    finals = np.full(paths, fund_total)
+    # Members with nothing left to pay add nothing; skip their draws.
+    owing = remaining > 0
+    if owing.any():
+        rng = np.random.default_rng(seed)
+        alpha = paid_due[owing] + 1
+        beta = np.maximum(due - paid_due[owing], 0) + 1
+        remaining = remaining[owing]
+        chunk = max(PROJECTION_CHUNK_CELLS // len(remaining), 1)
+        for start in range(0, paths, chunk):
+            stop = min(start + chunk, paths)
+            rates = rng.beta(alpha, beta, size=(stop - start, len(remaining)))
+            payments = rng.binomial(remaining, rates).sum(axis=1)
+            finals[start:stop] += payments * program.weekly_contribution
+
+    shortfall = np.maximum(target - finals, 0.0)
+    p10, p50, p90 = np.percentile(finals, [10, 50, 90])
+    return {
+        "paths": paths,
+        "target": target,
+        "probability": float((finals >= target).mean()),
+        "expected_shortfall": float(shortfall.mean()),
+        "expected_total": float(finals.mean()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+    }
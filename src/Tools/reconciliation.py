@@ -0,0 +1,125 @@
+import pandas as pd
+
+try:
+    from src.Tools.data_clean import clean_transaction_data
+except ModuleNotFoundError:
+    from Tools.data_clean import clean_transaction_data
+
+MATCHED = "Matched"
+AMOUNT_MISMATCH = "Amount mismatch"
+MISSING_IN_LOG = "Missing in log"
+MISSING_IN_BANK = "Missing in bank"
+UNREADABLE = "Unreadable bank row"
+
+DATE_WINDOW_DAYS = 3
+STATEMENT_ALIASES = {
+    "NAME": ["NAME", "MEMBER", "PAYER", "DESCRIPTION", "NARRATION"],
+    "AMOUNT PAID": ["AMOUNT PAID", "AMOUNT", "CREDIT", "CREDIT AMOUNT"],
+    "DATE": ["DATE", "VALUE DATE", "TRANSACTION DATE", "POSTING DATE"],
+}
+RESULT_COLUMNS = ["STATUS", "NAME", "BANK DATE", "BANK AMOUNT", "LOG DATE", "LOG AMOUNT", "LOG WEEK", "DAYS APART"]
+# Every status frame is cast to these before the concat, so a side that is
+# all-NA for one status (no log date for "Missing in log") cannot change the
+# result dtypes.
+RESULT_DTYPES = {
+    "STATUS": object,
+    "NAME": object,
+    "BANK DATE": "datetime64[ns]",
+    "BANK AMOUNT": float,
+    "LOG DATE": "datetime64[ns]",
+    "LOG AMOUNT": float,
+    "LOG WEEK": object,
+    "DAYS APART": float,
+}
+
+
+def normalize_statement(statement: pd.DataFrame) -> pd.DataFrame:
+    df = statement.rename(columns=lambda col: str(col).strip().upper())
+    renames = {}
+    for target, aliases in STATEMENT_ALIASES.items():
+        source = next((alias for alias in aliases if alias in df.columns), None)
+        if source is None:
+            raise ValueError(f"Bank statement needs a {target} column (any of: {', '.join(aliases)})")
+        renames[source] = target
+    df = df[list(renames)].rename(columns=renames).astype(str)
+
+    bank = clean_transaction_data(df.assign(WEEK=""))
+    other_dates = pd.to_datetime(df["DATE"], errors="coerce", dayfirst=True, format="mixed")
+    bank["DATE"] = bank["DATE"].fillna(other_dates)
+    return bank[["NAME", "AMOUNT PAID", "DATE"]]
+
+
+def _match(bank: pd.DataFrame, log: pd.DataFrame, keys: list[str], window_days: int) -> pd.DataFrame:
+    # Hash join on ``keys`` (pandas merge), keep pairs inside the date window,
+    # then pair rows one-to-one, closest dates first. Each round keeps every
+    # pair whose bank and log rows are both still unclaimed.
+    pairs = bank.merge(log, on=keys, suffixes=(" BANK", " LOG"))
+    pairs["DAYS APART"] = (pairs["DATE BANK"] - pairs["DATE LOG"]).dt.days.abs()
+    pairs = pairs[pairs["DAYS APART"] <= window_days].sort_values(["DAYS APART", "BANK ID", "LOG ID"])
+
+    rounds = []
+    while not pairs.empty:
+        best = pairs.drop_duplicates("BANK ID").drop_duplicates("LOG ID")
+        rounds.append(best)
+        pairs = pairs[~pairs["BANK ID"].isin(best["BANK ID"]) & ~pairs["LOG ID"].isin(best["LOG ID"])]
+    if not rounds:
+        return pairs
+    return pd.concat(rounds, ignore_index=True)
+
+
+def _result(frame: pd.DataFrame, status: str, bank_cols: dict[str, str], log_cols: dict[str, str]) -> pd.DataFrame:
+    if frame.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+    out = pd.DataFrame({"STATUS": status}, index=frame.index)
+    for target, source in {**bank_cols, **log_cols}.items():
+        out[target] = frame[source]
+    return out.reindex(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+
+
+def reconcile(statement: pd.DataFrame, log: pd.DataFrame, window_days: int = DATE_WINDOW_DAYS) -> pd.DataFrame:
+    """Classify bank statement lines against the cleaned contribution log."""
+    bank = normalize_statement(statement)
+    bank["BANK ID"] = range(len(bank))
+    readable = bank["AMOUNT PAID"].notna() & bank["DATE"].notna() & (bank["NAME"].str.strip() != "")
+    unreadable = bank[~readable]
+    bank = bank[readable]
+
+    log = log.dropna(subset=["NAME", "AMOUNT PAID", "DATE"])[["NAME", "AMOUNT PAID", "DATE", "WEEK"]]
+    if not bank.empty:
+        window = pd.Timedelta(days=window_days)
+        log = log[(log["DATE"] >= bank["DATE"].min() - window) & (log["DATE"] <= bank["DATE"].max() + window)]
+    log = log.assign(**{"LOG ID": range(len(log))})
+
+    matched = _match(bank, log, ["NAME", "AMOUNT PAID"], window_days)
+    bank_left = bank[~bank["BANK ID"].isin(matched.get("BANK ID", []))]
+    log_left = log[~log["LOG ID"].isin(matched.get("LOG ID", []))]
+
+    mismatched = _match(bank_left, log_left, ["NAME"], window_days)
+    bank_left = bank_left[~bank_left["BANK ID"].isin(mismatched.get("BANK ID", []))]
+    log_left = log_left[~log_left["LOG ID"].isin(mismatched.get("LOG ID", []))]
+
+    bank_cols = {"NAME": "NAME", "BANK DATE": "DATE", "BANK AMOUNT": "AMOUNT PAID"}
+    log_cols = {"NAME": "NAME", "LOG DATE": "DATE", "LOG AMOUNT": "AMOUNT PAID", "LOG WEEK": "WEEK"}
+    results = [
+        _result(
+            matched,
+            MATCHED,
+            {"NAME": "NAME", "BANK DATE": "DATE BANK", "BANK AMOUNT": "AMOUNT PAID", "DAYS APART": "DAYS APART"},
+            {"LOG DATE": "DATE LOG", "LOG AMOUNT": "AMOUNT PAID", "LOG WEEK": "WEEK"},
+        ),
+        _result(
+            mismatched,
+            AMOUNT_MISMATCH,
+            {"NAME": "NAME", "BANK DATE": "DATE BANK", "BANK AMOUNT": "AMOUNT PAID BANK", "DAYS APART": "DAYS APART"},
+            {"LOG DATE": "DATE LOG", "LOG AMOUNT": "AMOUNT PAID LOG", "LOG WEEK": "WEEK"},
+        ),
+        _result(bank_left, MISSING_IN_LOG, bank_cols, {}),
+        _result(log_left, MISSING_IN_BANK, {}, log_cols),
+        _result(unreadable, UNREADABLE, bank_cols, {}),
+    ]
+    results = [frame for frame in results if not frame.empty]
+    if results:
+        result = pd.concat(results, ignore_index=True)
+    else:
+        result = pd.DataFrame(columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+    return result.sort_values(["STATUS", "NAME", "BANK DATE", "LOG DATE"], ignore_index=True)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from src.Tools.program_config import ProgramConfig
+except ModuleNotFoundError:
+    from Tools.program_config import ProgramConfig
+
+RETURNS_COLUMNS = ["DATE", "AMOUNT", "NOTE"]
+ALLOCATION_COLUMNS = ["NAME", "DEPOSITS", "CAPITAL WEEKS", "RETURNS", "BALANCE", "SHARE %"]
+
+
+def program_week_index(dates: pd.Series, program: ProgramConfig) -> pd.Series:
+    # Week of the program in which money actually arrived (0 = before the
+    # start date), so late payers are not credited for weeks they were behind.
+    days = (pd.to_datetime(dates) - pd.Timestamp(program.start_date)).dt.days
+    return (days // 7 + 1).clip(lower=0)
+
+
+def parse_return_events(rows: list[list], program: ProgramConfig) -> tuple[tuple[int, float], ...]:
+    if len(rows) < 2:
+        return ()
+    header = [str(h).strip().upper() for h in rows[0]]
+    if "DATE" not in header or "AMOUNT" not in header:
+        return ()
+    width = len(header)
+    frame = pd.DataFrame([list(row) + [""] * (width - len(row)) for row in rows[1:]], columns=header)
+    amounts = pd.to_numeric(frame["AMOUNT"].astype(str).str.replace(",", "", regex=False), errors="coerce")
+    dates = pd.to_datetime(frame["DATE"], format="%d/%m/%Y", errors="coerce")
+    valid = amounts.notna() & dates.notna()
+    weeks = program_week_index(dates[valid], program)
+    events = pd.Series(amounts[valid].to_numpy(), index=weeks.to_numpy()).groupby(level=0).sum()
+    return tuple((int(week), float(amount)) for week, amount in events.items())
+
+
+def allocate_returns(
+    snapshot: pd.DataFrame,
+    events: tuple[tuple[int, float], ...],
+    program: ProgramConfig,
+) -> pd.DataFrame:
+    """Distribute each return event pro-rata on capital-weeks since the
+    previous event. Capital includes returns already allocated, so earlier
+    returns compound for the members who earned them."""
+    df = snapshot.dropna(subset=["NAME", "AMOUNT PAID", "DATE"])
+    if df.empty:
+        return pd.DataFrame(columns=ALLOCATION_COLUMNS)
+
+    weeks = program_week_index(df["DATE"], program)
+    last_week = int(max(weeks.max(), max((week for week, _ in events), default=0)))
+    deposits = (
+        df.assign(INDEX=weeks)
+        .pivot_table(index="NAME", columns="INDEX", values="AMOUNT PAID", aggfunc="sum", fill_value=0.0)
+        .reindex(columns=range(last_week + 1), fill_value=0.0)
+    )
+    # member x week matrix of capital held at the end of each week
+    capital = np.cumsum(deposits.to_numpy(dtype=float), axis=1)
+    capital_weeks = np.cumsum(capital, axis=1)
+
+    returns = np.zeros(len(deposits))
+    previous_week = -1
+    for week, amount in sorted(events):
+        span = capital_weeks[:, week] - (capital_weeks[:, previous_week] if previous_week >= 0 else 0.0)
+        weight = span + returns * (week - previous_week)
+        total_weight = weight.sum()
+        if total_weight > 0:
+            returns = returns + amount * weight / total_weight
+        previous_week = week
+
+    balance = capital[:, -1] + returns
+    total_balance = balance.sum()
+    return pd.DataFrame(
+        {
+            "NAME": deposits.index,
+            "DEPOSITS": capital[:, -1],
+            "CAPITAL WEEKS": capital_weeks[:, -1],
+            "RETURNS": returns,
+            "BALANCE": balance,
+            "SHARE %": balance / total_balance * 100 if total_balance > 0 else 0.0,
+        }
+    ).sort_values("BALANCE", ascending=False, ignore_index=True)
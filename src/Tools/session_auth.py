@@ -3,14 +3,24 @@ import os
 
 import streamlit as st
 
+try:
+    from src.Tools.member_registry import normalize_name
+    from src.Tools.tenants import DEFAULT_TENANT, activate_tenant, count, current_tenant
+except ModuleNotFoundError:
+    from Tools.member_registry import normalize_name
+    from Tools.tenants import DEFAULT_TENANT, activate_tenant, count, current_tenant
+
 _SECRET = os.getenv("SESSION_SECRET", "family-investment-session-secret")
 _QP_USER = "u"
 _QP_ROLE = "r"
 _QP_SIG = "s"
+_QP_TENANT = "t"
 
 
 def _sign(username: str, role: str) -> str:
-    payload = f"{username}|{role}|{_SECRET}"
+    # Links are bound to their tenant; default-tenant links keep the old payload.
+    tenant = current_tenant()
+    payload = f"{username}|{role}|{_SECRET}" if tenant.is_default else f"{username}|{role}|{tenant.slug}|{_SECRET}"
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
@@ -49,8 +59,25 @@ def _remove_query_params(keys: list[str]) -> None:
         st.experimental_set_query_params(**merged)
 
 
+def _activate_session_tenant() -> None:
+    params = _get_query_params()
+    slug = str(params.get(_QP_TENANT) or st.session_state.get("tenant") or DEFAULT_TENANT).strip().lower()
+    try:
+        activate_tenant(slug)
+    except KeyError:
+        st.error(f"Unknown family program '{slug}'.")
+        st.stop()
+    if st.session_state.get("tenant") not in (None, slug):
+        # A session never carries a login across tenants.
+        st.session_state["authenticated"] = False
+        st.session_state["username"] = None
+        st.session_state["role"] = "user"
+    st.session_state["tenant"] = slug
+    count("page_views")
+
+
 def persist_login(username: str, role: str) -> None:
-    username = str(username or "").strip().title()
+    username = normalize_name(username)
     if not username:
         return
     role = str(role or "user").strip().lower()
@@ -59,17 +86,23 @@ def persist_login(username: str, role: str) -> None:
     st.session_state["username"] = username
     st.session_state["role"] = role
     signature = _sign(username, role)
+    tenant = current_tenant()
     params = _get_query_params()
     if (
         params.get(_QP_USER) == username
         and params.get(_QP_ROLE) == role
         and params.get(_QP_SIG) == signature
+        and (tenant.is_default or params.get(_QP_TENANT) == tenant.slug)
     ):
         return
-    _set_query_params({_QP_USER: username, _QP_ROLE: role, _QP_SIG: signature})
+    updates = {_QP_USER: username, _QP_ROLE: role, _QP_SIG: signature}
+    if not tenant.is_default:
+        updates[_QP_TENANT] = tenant.slug
+    _set_query_params(updates)
 
 
 def restore_login() -> None:
+    _activate_session_tenant()
     if st.session_state.get("logged_out"):
         return
 
@@ -77,7 +110,7 @@ def restore_login() -> None:
         return
 
     params = _get_query_params()
-    username = str(params.get(_QP_USER, "")).strip().title()
+    username = normalize_name(params.get(_QP_USER))
     role = str(params.get(_QP_ROLE, "user")).strip().lower()
     sig = str(params.get(_QP_SIG, "")).strip()
     if not username or not sig:
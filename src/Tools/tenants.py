@@ -0,0 +1,142 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+import json
+import os
+import threading
+
+try:
+    from src.Tools.program_config import ACTIVE_PROGRAM_YEAR, PROGRAMS, ProgramConfig, parse_programs, use_programs
+except ModuleNotFoundError:
+    from Tools.program_config import ACTIVE_PROGRAM_YEAR, PROGRAMS, ProgramConfig, parse_programs, use_programs
+
+TENANTS_PATH = os.getenv("TENANTS_PATH", "").strip()
+DEFAULT_TENANT = os.getenv("DEFAULT_TENANT", "default").strip().lower() or "default"
+DEFAULT_SHEET_ID = os.getenv("SHEETS_ID", "").strip() or "1B8A_dYd9HpO7tjKDtofsby_cXvGqouCrklhZ-iSiO8Q"
+DEFAULT_AUTH_SHEET_ID = os.getenv("AUTH_SHEET_ID", "").strip() or DEFAULT_SHEET_ID
+
+
+@dataclass(frozen=True)
+class TenantConfig:
+    slug: str
+    label: str
+    sheet_id: str
+    auth_sheet_id: str
+    programs: dict[int, ProgramConfig] = field(hash=False, compare=False)
+    active_year: int | None = None
+    cache_mb: float | None = None
+
+    @property
+    def is_default(self) -> bool:
+        return self.slug == DEFAULT_TENANT
+
+
+# The default tenant reads the module-level program registry, so single-family
+# deployments behave exactly as before.
+TENANTS: dict[str, TenantConfig] = {
+    DEFAULT_TENANT: TenantConfig(
+        slug=DEFAULT_TENANT,
+        label="Family Investment",
+        sheet_id=DEFAULT_SHEET_ID,
+        auth_sheet_id=DEFAULT_AUTH_SHEET_ID,
+        programs=PROGRAMS,
+        active_year=int(ACTIVE_PROGRAM_YEAR) if ACTIVE_PROGRAM_YEAR else None,
+    ),
+}
+
+
+def register_tenant(tenant: TenantConfig) -> None:
+    TENANTS[tenant.slug] = tenant
+
+
+def _load_tenants_file(path: Path) -> None:
+    for item in json.loads(path.read_text(encoding="utf-8")):
+        slug = str(item["slug"]).strip().lower()
+        sheet_id = str(item["sheet_id"]).strip()
+        register_tenant(
+            TenantConfig(
+                slug=slug,
+                label=str(item.get("label") or slug.title()),
+                sheet_id=sheet_id,
+                auth_sheet_id=str(item.get("auth_sheet_id") or sheet_id).strip(),
+                programs=parse_programs(item["programs"]) if item.get("programs") else PROGRAMS,
+                active_year=int(item["active_year"]) if item.get("active_year") else None,
+                cache_mb=float(item["cache_mb"]) if item.get("cache_mb") else None,
+            )
+        )
+
+
+if TENANTS_PATH and Path(TENANTS_PATH).exists():
+    _load_tenants_file(Path(TENANTS_PATH))
+
+_current: ContextVar[str] = ContextVar("tenant", default=DEFAULT_TENANT)
+_metrics: dict[str, Counter] = {}
+_metrics_lock = threading.Lock()
+
+
+def list_tenants() -> list[TenantConfig]:
+    return [TENANTS[slug] for slug in sorted(TENANTS)]
+
+
+def get_tenant(slug: str | None = None) -> TenantConfig:
+    if slug is None:
+        return current_tenant()
+    return TENANTS[str(slug).strip().lower()]
+
+
+def current_tenant() -> TenantConfig:
+    return TENANTS.get(_current.get()) or TENANTS[DEFAULT_TENANT]
+
+
+def activate_tenant(slug: str | None) -> TenantConfig:
+    """Route the rest of this run (or thread) to ``slug``; unknown slugs raise KeyError."""
+    tenant = get_tenant(slug or DEFAULT_TENANT)
+    _current.set(tenant.slug)
+    use_programs(tenant.programs, tenant.active_year)
+    return tenant
+
+
+@contextmanager
+def tenant_scope(slug: str):
+    previous = current_tenant().slug
+    tenant = activate_tenant(slug)
+    try:
+        yield tenant
+    finally:
+        activate_tenant(previous)
+
+
+def tenant_bound(fn):
+    # Background threads start with the default tenant; capture the caller's.
+    slug = current_tenant().slug
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tenant_scope(slug):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def tenant_key(name: str, slug: str | None = None) -> str:
+    """Qualify a cache, snapshot, topic or file key with the tenant.
+
+    The default tenant keeps bare keys so existing snapshots and files stay valid.
+    """
+    slug = slug or current_tenant().slug
+    return name if slug == DEFAULT_TENANT else f"{slug}.{name}"
+
+
+def count(metric: str, amount: int = 1) -> None:
+    slug = current_tenant().slug
+    with _metrics_lock:
+        _metrics.setdefault(slug, Counter())[metric] += amount
+
+
+def tenant_metrics(slug: str | None = None) -> dict[str, int]:
+    slug = slug or current_tenant().slug
+    with _metrics_lock:
+        return dict(_metrics.get(slug, {}))
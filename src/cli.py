@@ -0,0 +1,116 @@
+"""Batch commands against the data layer, without a Streamlit session.
+
+Run from the project root:
+
+    python -m src.cli export-log [--program 2026 | --all] [--output log.csv]
+    python -m src.cli arrears [--program 2026] [--as-of 2026-06-01] [--output arrears.csv]
+    python -m src.cli rebuild-snapshots [--program 2026 | --all]
+
+Every command takes ``--tenant <slug>`` (before the command name) to target one
+family program in a multi-tenant deployment.
+"""
+from datetime import date
+import argparse
+import sys
+
+import pandas as pd
+
+from src.Database.GOOGLE_SHEETS import (
+    TRANSACTION_COLUMNS,
+    get_fund_summary,
+    get_transaction_history_snapshot,
+    get_transaction_snapshot,
+    rebuild_fund_summary,
+)
+from src.Tools.fund_summary import paid_weeks_from_bits
+from src.Tools.program_config import ProgramConfig, get_program, list_programs
+from src.Tools.tenants import DEFAULT_TENANT, activate_tenant
+
+
+def selected_programs(args) -> list[ProgramConfig]:
+    if getattr(args, "all", False):
+        return list_programs()
+    return [get_program(args.program)]
+
+
+def write_csv(df: pd.DataFrame, output: str | None) -> None:
+    df.to_csv(output or sys.stdout, index=False)
+    if output:
+        print(f"Wrote {len(df)} rows to {output}", file=sys.stderr)
+
+
+def export_log(args) -> None:
+    if args.all:
+        df = get_transaction_history_snapshot()
+        columns = ["PROGRAM YEAR"] + TRANSACTION_COLUMNS
+    else:
+        df = get_transaction_snapshot(program=get_program(args.program))
+        columns = TRANSACTION_COLUMNS
+    df = df.dropna(subset=["NAME", "AMOUNT PAID"]).sort_values("DATE")
+    df["DATE"] = df["DATE"].dt.strftime("%d/%m/%Y")
+    write_csv(df[columns], args.output)
+
+
+def arrears(args) -> None:
+    program = get_program(args.program)
+    as_of = date.fromisoformat(args.as_of) if args.as_of else date.today()
+    open_week = program.current_open_week(as_of)
+    summary = get_fund_summary(program=program)
+
+    rows = []
+    for name, member in sorted(summary["members"].items()):
+        unpaid = program.unpaid_weeks(paid_weeks_from_bits(member["paid_weeks"]), open_week)
+        rows.append(
+            {
+                "NAME": name,
+                "TOTAL PAID": member["total"],
+                "DUE WEEK": unpaid[0] if unpaid else None,
+                "WEEKS OWED": len(unpaid),
+                "AMOUNT OWED": len(unpaid) * program.weekly_contribution,
+            }
+        )
+    df = pd.DataFrame(rows, columns=["NAME", "TOTAL PAID", "DUE WEEK", "WEEKS OWED", "AMOUNT OWED"])
+    write_csv(df.sort_values(["WEEKS OWED", "NAME"], ascending=[False, True]), args.output)
+
+
+def rebuild_snapshots(args) -> None:
+    for program in selected_programs(args):
+        summary = rebuild_fund_summary(program=program)
+        print(
+            f"{program.label}: {len(summary['members'])} members, {summary['entries']} entries, "
+            f"version {summary['version']}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description=__doc__.splitlines()[0])
+    parser.add_argument("--tenant", default=DEFAULT_TENANT, help="tenant slug (defaults to DEFAULT_TENANT)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-log", help="export the contribution log as CSV")
+    export.add_argument("--program", type=int, default=None, help="program year (defaults to the active one)")
+    export.add_argument("--all", action="store_true", help="export every program year")
+    export.add_argument("--output", default=None, help="CSV path (defaults to stdout)")
+    export.set_defaults(handler=export_log)
+
+    owed = commands.add_parser("arrears", help="weeks and amount owed per member")
+    owed.add_argument("--program", type=int, default=None, help="program year (defaults to the active one)")
+    owed.add_argument("--as-of", default=None, help="ISO date to compute the open week for (defaults to today)")
+    owed.add_argument("--output", default=None, help="CSV path (defaults to stdout)")
+    owed.set_defaults(handler=arrears)
+
+    rebuild = commands.add_parser("rebuild-snapshots", help="re-read the sheet and rebuild the fund summary")
+    rebuild.add_argument("--program", type=int, default=None, help="program year (defaults to the active one)")
+    rebuild.add_argument("--all", action="store_true", help="rebuild every program year")
+    rebuild.set_defaults(handler=rebuild_snapshots)
+
+    args = parser.parse_args(argv)
+    try:
+        activate_tenant(args.tenant)
+    except KeyError:
+        parser.error(f"unknown tenant: {args.tenant}")
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,44 @@
-import re
-
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
 try:
-    from src.Database.GOOGLE_SHEETS import get_transaction_data
-    from src.Tools.data_clean import clean_transaction_data
+    from src.Database.GOOGLE_SHEETS import (
+        get_fund_summary,
+        get_leaderboard,
+        get_transaction_data,
+        get_transaction_data_status,
+        get_transaction_snapshot,
+    )
+    from src.Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from src.Database.runtime import cache_stats, tenant_budget
+    from src.Tools.charts import line_chart
+    from src.Tools.fund_summary import week_bits
+    from src.Tools.page_sections import ProgressivePage
+    from src.Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
     from src.Tools.session_auth import clear_login, persist_login, restore_login
+    from src.Tools.tenants import current_tenant, tenant_metrics
 except ModuleNotFoundError:
-    from Database.GOOGLE_SHEETS import get_transaction_data
-    from Tools.data_clean import clean_transaction_data
+    from Database.GOOGLE_SHEETS import (
+        get_fund_summary,
+        get_leaderboard,
+        get_transaction_data,
+        get_transaction_data_status,
+        get_transaction_snapshot,
+    )
+    from Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from Database.runtime import cache_stats, tenant_budget
+    from Tools.charts import line_chart
+    from Tools.fund_summary import week_bits
+    from Tools.page_sections import ProgressivePage
+    from Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
     from Tools.session_auth import clear_login, persist_login, restore_login
+    from Tools.tenants import current_tenant, tenant_metrics
 
 st.set_page_config(page_title="Admin Dashboard", layout="wide")
 
 GREEN = "#1b8a3a"
 CURRENCY_PREFIX = "N"
-START_WEEK = 7
-LEGACY_WEEK = 6
-TOTAL_WEEKS = 52
-END_WEEK = TOTAL_WEEKS
 
 
 def hide_sidebar() -> None:
@@ -52,11 +70,6 @@ def hide_sidebar() -> None:
     )
 
 
-def extract_week_number(value: str) -> float:
-    match = re.search(r"(\d+)", str(value))
-    return float(match.group(1)) if match else float("nan")
-
-
 def to_csv_bytes(df: pd.DataFrame) -> bytes:
     return df.to_csv(index=False).encode("utf-8")
 
@@ -65,22 +78,30 @@ def format_money(value: float) -> str:
     return f"{CURRENCY_PREFIX}{value:,.2f}"
 
 
-def load_data() -> pd.DataFrame:
-    raw_df = get_transaction_data()
-    df = clean_transaction_data(raw_df)
+def select_program() -> ProgramConfig:
+    programs = list_programs()
+    active = get_active_program()
+    if len(programs) < 2:
+        return active
+    years = [p.year for p in reversed(programs)]
+    selected_year = st.selectbox(
+        "Program Year",
+        years,
+        index=years.index(active.year),
+        format_func=lambda year: f"{year} (active)" if year == active.year else str(year),
+    )
+    return get_program(selected_year)
+
+
+def load_data(program: ProgramConfig) -> pd.DataFrame:
+    df = get_transaction_snapshot(program=program)
     required_cols = {"NAME", "AMOUNT PAID", "DATE", "WEEK"}
     missing = required_cols - set(df.columns)
     if missing:
         st.error(f"Missing required columns in sheet: {', '.join(sorted(missing))}")
         st.stop()
 
-    df["NAME"] = df["NAME"].astype(str).str.strip().str.title()
-    df["AMOUNT PAID"] = pd.to_numeric(df["AMOUNT PAID"], errors="coerce")
-    df["DATE"] = pd.to_datetime(df["DATE"], errors="coerce")
-    df["WEEK NUMBER"] = df["WEEK"].apply(extract_week_number)
-    df["YEAR-MONTH"] = df["DATE"].dt.strftime("%Y-%m")
-    df = df.dropna(subset=["NAME", "AMOUNT PAID"]).copy()
-    return df
+    return df.dropna(subset=["NAME", "AMOUNT PAID"])
 
 
 hide_sidebar()
@@ -96,146 +117,208 @@ persist_login(st.session_state.get("username"), "admin")
 
 st.markdown(f"<h1 style='text-align:center; color:{GREEN};'>Admin Dashboard</h1>", unsafe_allow_html=True)
 
-main_df = load_data()
+program = select_program()
+start_week = program.start_week
+end_week = program.end_week
+page = ProgressivePage()
 
-if main_df.empty:
-    st.info("No transaction data available yet.")
-else:
-    latest_date = main_df["DATE"].dropna().max()
-    cutoff = latest_date - pd.Timedelta(days=30) if pd.notna(latest_date) else pd.Timestamp.min
+# KPI cards come from the fund summary; the full log is only loaded by the
+# lazy sections queued on ``page``, once an admin opens one of them.
+summary = get_fund_summary(program=program)
 
-    total_fund = float(main_df["AMOUNT PAID"].sum())
-    total_txns = int(main_df["AMOUNT PAID"].count())
-    unique_members = int(main_df["NAME"].nunique())
-    recent_30 = float(main_df[main_df["DATE"] >= cutoff]["AMOUNT PAID"].sum()) if pd.notna(latest_date) else 0.0
+data_status = get_transaction_data_status(program)
+if data_status["degraded"] and data_status["as_of"] is not None:
+    st.warning(
+        "Live data is temporarily unavailable. "
+        f"Showing data as of {data_status['as_of'].strftime('%d/%m/%Y %H:%M')}."
+    )
 
-    in_scope = main_df[(main_df["WEEK NUMBER"] >= START_WEEK) & (main_df["WEEK NUMBER"] <= END_WEEK)]
-    expected_member_weeks = unique_members * max(END_WEEK - START_WEEK, 0)
-    submitted_member_weeks = int(in_scope.dropna(subset=["WEEK NUMBER"]).drop_duplicates(subset=["NAME", "WEEK NUMBER"]).shape[0])
+if not summary["members"]:
+    st.info("No transaction data available yet.")
+else:
+    unique_members = len(summary["members"])
+    scope_mask = week_bits(range(start_week, end_week + 1))
+    expected_member_weeks = unique_members * max(end_week - start_week, 0)
+    submitted_member_weeks = sum(bin(m["paid_weeks"] & scope_mask).count("1") for m in summary["members"].values())
     coverage_pct = (submitted_member_weeks / expected_member_weeks * 100) if expected_member_weeks > 0 else 0.0
 
     k1, k2, k3, k4, k5 = st.columns([1, 1, 1, 1, 1], gap="small")
 
     with k1:
-        st.metric("TOTAL FUND", format_money(total_fund))
+        st.metric("TOTAL FUND", format_money(summary["fund_total"]))
 
     with k2:
-        st.metric("TRANSACTIONS", f"{total_txns}")
+        st.metric("TRANSACTIONS", f"{summary['entries']}")
 
     with k3:
         st.metric("ACTIVE MEMBERS", f"{unique_members}")
 
     with k4:
-        st.metric("LAST 30 DAYS", format_money(recent_30))
+        # Recent inflow from the summary's monthly series, so the card needs
+        # no log download; months are "YYYY-MM" keys in order.
+        months = list(summary["fund_monthly"].items())
+        if months:
+            latest_month, latest_amount = months[-1]
+            delta = None
+            if len(months) > 1:
+                change = latest_amount - months[-2][1]
+                # Sign first, so Streamlit colours a drop red.
+                delta = f"{'-' if change < 0 else '+'}{format_money(abs(change))}"
+            st.metric(
+                "LATEST MONTH",
+                format_money(latest_amount),
+                delta=delta,
+                help=f"Contributions dated {pd.Timestamp(f'{latest_month}-01').strftime('%B %Y')}",
+            )
+        else:
+            st.metric("LATEST MONTH", format_money(0.0))
 
     with k5:
         st.metric("WEEK COVERAGE", f"{coverage_pct:.1f}%")
 
-    st.markdown("")
-
-    f1, f2, f3 = st.columns([2, 1, 1])
-    member_options = ["All"] + sorted(main_df["NAME"].dropna().unique().tolist())
-    selected_member = f1.selectbox("Filter by Member", member_options, index=0)
+    def render_explorer() -> None:
+        main_df = load_data(program)
+
+        f1, f2, f3 = st.columns([2, 1, 1])
+        member_options = ["All"] + sorted(main_df["NAME"].dropna().unique().tolist())
+        selected_member = f1.selectbox("Filter by Member", member_options, index=0)
+
+        month_options = ["All"]
+        dated = main_df.dropna(subset=["DATE"])
+        if not dated.empty:
+            month_options.extend(sorted(dated["YEAR-MONTH"].unique().tolist()))
+        selected_month = f2.selectbox("Filter by Month", month_options, index=0)
+
+        week_values = sorted(
+            set(main_df["WEEK NUMBER"].dropna().astype(int).tolist()) | set(range(start_week, end_week + 1))
+        )
+        week_options = ["All"] + [f"Week {w}" for w in week_values]
+        selected_week = f3.selectbox("Filter by Week", week_options, index=0)
+
+        filtered = main_df
+        if selected_member != "All":
+            filtered = filtered[filtered["NAME"] == selected_member]
+        if selected_month != "All":
+            filtered = filtered[filtered["YEAR-MONTH"] == selected_month]
+        if selected_week != "All":
+            week_num = int(selected_week.split()[1])
+            filtered = filtered[filtered["WEEK NUMBER"] == week_num]
+
+        c1, c2 = st.columns(2)
+
+        with c1:
+            with st.container(border=True):
+                if selected_member == "All" and selected_month == "All" and selected_week == "All":
+                    member_totals = pd.DataFrame(
+                        get_leaderboard(get_member_registry(), program=program).top(10), columns=["RANK", "NAME", "AMOUNT PAID"]
+                    )
+                else:
+                    member_totals = (
+                        filtered.groupby("NAME", as_index=False)["AMOUNT PAID"]
+                        .sum()
+                        .sort_values("AMOUNT PAID", ascending=False)
+                        .head(10)
+                    )
+                if member_totals.empty:
+                    st.info("No contributor data for selected filters.")
+                else:
+                    fig = px.bar(
+                        member_totals.sort_values("AMOUNT PAID"),
+                        x="AMOUNT PAID",
+                        y="NAME",
+                        orientation="h",
+                        text="AMOUNT PAID",
+                        title="Top Contributors",
+                        color_discrete_sequence=[GREEN],
+                    )
+                    fig.update_traces(texttemplate=f"{CURRENCY_PREFIX}%{{text:,.0f}}", textposition="outside")
+                    fig.update_layout(height=340, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
+                    fig.update_xaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True)
+                    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+        with c2:
+            with st.container(border=True):
+                monthly = filtered.dropna(subset=["DATE"])
+                if monthly.empty:
+                    st.info("No valid dates for selected filters.")
+                else:
+                    monthly = monthly.assign(MONTH=monthly["DATE"].dt.to_period("M").dt.to_timestamp())
+                    monthly = monthly.groupby("MONTH", as_index=False)["AMOUNT PAID"].sum()
+                    fig = line_chart(monthly, "MONTH", "AMOUNT PAID", "Monthly Inflow", GREEN)
+                    fig.update_traces(marker=dict(size=7))
+                    fig.update_layout(height=340)
+                    fig.update_yaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True)
+                    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
-    month_options = ["All"]
-    dated = main_df.dropna(subset=["DATE"])
-    if not dated.empty:
-        month_options.extend(sorted(dated["YEAR-MONTH"].unique().tolist()))
-    selected_month = f2.selectbox("Filter by Month", month_options, index=0)
-
-    week_values = sorted(
-        set(main_df["WEEK NUMBER"].dropna().astype(int).tolist()) | set(range(START_WEEK, END_WEEK + 1))
-    )
-    week_options = ["All"] + [f"Week {w}" for w in week_values]
-    selected_week = f3.selectbox("Filter by Week", week_options, index=0)
-
-    filtered = main_df
-    if selected_member != "All":
-        filtered = filtered[filtered["NAME"] == selected_member]
-    if selected_month != "All":
-        filtered = filtered[filtered["YEAR-MONTH"] == selected_month]
-    if selected_week != "All":
-        week_num = int(selected_week.split()[1])
-        filtered = filtered[filtered["WEEK NUMBER"] == week_num]
-
-    c1, c2 = st.columns(2)
-
-    with c1:
         with st.container(border=True):
-            member_totals = (
-                filtered.groupby("NAME", as_index=False)["AMOUNT PAID"]
-                .sum()
-                .sort_values("AMOUNT PAID", ascending=False)
-                .head(10)
-            )
-            if member_totals.empty:
-                st.info("No contributor data for selected filters.")
+            recent = filtered.sort_values("DATE", ascending=False).head(20)
+            if recent.empty:
+                st.info("No submissions found for selected filters.")
             else:
-                fig = px.bar(
-                    member_totals.sort_values("AMOUNT PAID"),
-                    x="AMOUNT PAID",
-                    y="NAME",
-                    orientation="h",
-                    text="AMOUNT PAID",
-                    title="Top Contributors",
-                    color_discrete_sequence=[GREEN],
+                recent_display = recent[["NAME", "AMOUNT PAID", "DATE", "WEEK"]].assign(
+                    DATE=recent["DATE"].dt.strftime("%d/%m/%Y")
                 )
-                fig.update_traces(texttemplate=f"{CURRENCY_PREFIX}%{{text:,.0f}}", textposition="outside")
-                fig.update_layout(height=340, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
-                fig.update_xaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True)
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-
-    with c2:
-        with st.container(border=True):
-            monthly = filtered.dropna(subset=["DATE"]).copy()
-            if monthly.empty:
-                st.info("No valid dates for selected filters.")
-            else:
-                monthly["MONTH"] = monthly["DATE"].dt.to_period("M").dt.to_timestamp()
-                monthly = monthly.groupby("MONTH", as_index=False)["AMOUNT PAID"].sum()
-                fig = px.line(
-                    monthly,
-                    x="MONTH",
-                    y="AMOUNT PAID",
-                    markers=True,
-                    title="Monthly Inflow",
-                    color_discrete_sequence=[GREEN],
+                st.markdown(f"<h4 style='color:{GREEN};'>Recent Submissions</h4>", unsafe_allow_html=True)
+                st.dataframe(recent_display, use_container_width=True)
+                st.download_button(
+                    "Download Recent Submissions (CSV)",
+                    data=to_csv_bytes(recent_display),
+                    file_name="recent_submissions.csv",
+                    mime="text/csv",
+                    use_container_width=True,
                 )
-                fig.update_traces(line_width=3, marker=dict(size=7))
-                fig.update_layout(height=340, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
-                fig.update_yaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True)
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-
-    with st.container(border=True):
-        recent = filtered.sort_values("DATE", ascending=False).head(20).copy()
-        if recent.empty:
-            st.info("No submissions found for selected filters.")
-        else:
-            recent_display = recent[["NAME", "AMOUNT PAID", "DATE", "WEEK"]].copy()
-            recent_display["DATE"] = recent_display["DATE"].dt.strftime("%d/%m/%Y")
-            st.markdown(f"<h4 style='color:{GREEN};'>Recent Submissions</h4>", unsafe_allow_html=True)
-            st.dataframe(recent_display, use_container_width=True)
-            st.download_button(
-                "Download Recent Submissions (CSV)",
-                data=to_csv_bytes(recent_display),
-                file_name="recent_submissions.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
+
+
+    st.markdown("")
+    page.section(render_explorer, title="Explore Transactions", key="explorer", lazy=True, height=720)
+
+
+def render_cache_usage() -> None:
+    tenant = current_tenant()
+    metrics = tenant_metrics(tenant.slug)
+    m1, m2, m3 = st.columns(3)
+    m1.metric("PAGE VIEWS", f"{metrics.get('page_views', 0):,}")
+    m2.metric("SHEET READS", f"{metrics.get('sheet_reads', 0):,}")
+    m3.metric("SHEET WRITES", f"{metrics.get('sheet_writes', 0):,}")
+
+    usage = pd.DataFrame(cache_stats(tenant.slug))
+    if usage.empty:
+        st.info("Nothing cached yet.")
+        return
+    tenant_usage = usage[usage["TENANT"] == tenant.slug]
+    total_mb = tenant_usage["BYTES"].sum() / (1024 * 1024)
+    lookups = tenant_usage["HITS"].sum() + tenant_usage["MISSES"].sum()
+    hit_rate = tenant_usage["HITS"].sum() / lookups * 100 if lookups else 0.0
+    u1, u2, u3 = st.columns(3)
+    u1.metric("RESIDENT", f"{total_mb:,.1f} MB")
+    u2.metric("TENANT BUDGET", f"{tenant_budget() / (1024 * 1024):,.0f} MB")
+    u3.metric("HIT RATE", f"{hit_rate:.1f}%")
+    for col in ["BYTES", "BUDGET"]:
+        usage[col] = (usage[col] / (1024 * 1024)).round(2)
+    st.dataframe(usage.rename(columns={"BYTES": "MB", "BUDGET": "BUDGET MB"}), use_container_width=True, hide_index=True)
+
+
+page.section(render_cache_usage, title="Cache Usage", key="cache_usage", lazy=True)
 
 st.markdown("")
-a1, a2, a3 = st.columns(3)
+a1, a4, a2, a3 = st.columns(4)
 
 with a1:
     if st.button("Open Admin Review", use_container_width=True):
         st.switch_page("pages/Admin_review.py")
 
+with a4:
+    if st.button("Bulk Import", use_container_width=True):
+        st.switch_page("pages/Admin_import.py")
+
 with a2:
     if st.button("Refresh Dashboard", use_container_width=True):
-        get_transaction_data(force_refresh=True)
+        get_transaction_data(force_refresh=True, program=program)
         st.rerun()
 
 with a3:
     if st.button("Logout", use_container_width=True):
         clear_login()
         st.switch_page("pages/login.py")
+
+page.flush()
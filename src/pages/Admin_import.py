@@ -0,0 +1,144 @@
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+try:
+    from src.Database.GOOGLE_SHEETS import append_transactions, get_fund_summary, get_pending_submissions
+    from src.Tools.bulk_import import IMPORT_COLUMNS, validate_import
+    from src.Tools.fund_summary import paid_weeks_from_bits
+    from src.Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
+    from src.Tools.session_auth import clear_login, persist_login, restore_login
+except ModuleNotFoundError:
+    from Database.GOOGLE_SHEETS import append_transactions, get_fund_summary, get_pending_submissions
+    from Tools.bulk_import import IMPORT_COLUMNS, validate_import
+    from Tools.fund_summary import paid_weeks_from_bits
+    from Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
+    from Tools.session_auth import clear_login, persist_login, restore_login
+
+st.set_page_config(page_title="Bulk Import", layout="wide")
+
+GREEN = "#1b8a3a"
+RED = "#c62828"
+CURRENCY_PREFIX = "N"
+
+
+def hide_sidebar() -> None:
+    st.markdown(
+        """
+        <style>
+        [data-testid="stSidebar"] {display:none;}
+        [data-testid="collapsedControl"] {display:none;}
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def select_program() -> ProgramConfig:
+    programs = list_programs()
+    active = get_active_program()
+    if len(programs) < 2:
+        return active
+    years = [p.year for p in reversed(programs)]
+    selected_year = st.selectbox(
+        "Program Year",
+        years,
+        index=years.index(active.year),
+        format_func=lambda year: f"{year} (active)" if year == active.year else str(year),
+    )
+    return get_program(selected_year)
+
+
+hide_sidebar()
+restore_login()
+
+if not st.session_state.get("authenticated"):
+    st.switch_page("pages/login.py")
+
+if st.session_state.get("role") != "admin":
+    st.switch_page("pages/user_dashboard.py")
+
+persist_login(st.session_state.get("username"), "admin")
+
+st.markdown(f"<h1 style='text-align:center; color:{GREEN};'>Bulk Import</h1>", unsafe_allow_html=True)
+
+if st.session_state.get("import_success_message"):
+    st.success(st.session_state.pop("import_success_message"))
+
+program = select_program()
+
+st.markdown(
+    f"Upload a CSV with columns <b>{', '.join(IMPORT_COLUMNS)}</b> (dates as dd/mm/YYYY or YYYY-MM-DD, "
+    "weeks as <i>week 7</i> or <i>7</i>). Rows follow the same rules as the Submit page: fixed weekly amount, "
+    "weeks paid in order, no duplicates.",
+    unsafe_allow_html=True,
+)
+uploaded = st.file_uploader("Bank statement CSV", type=["csv"])
+
+if uploaded is not None:
+    try:
+        upload_df = pd.read_csv(uploaded, dtype=str, keep_default_na=False)
+        summary = get_fund_summary(program=program)
+        paid_weeks = {name: paid_weeks_from_bits(m["paid_weeks"]) for name, m in summary["members"].items()}
+        accepted, rejected = validate_import(upload_df, program, paid_weeks, get_pending_submissions(program), date.today())
+    except ValueError as exc:
+        st.error(str(exc))
+        st.stop()
+    except Exception:
+        st.error("We could not load contribution records right now. Please try again in a moment.")
+        st.stop()
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("ROWS", f"{len(upload_df)}")
+    k2.metric("ACCEPTED", f"{len(accepted)}")
+    k3.metric("REJECTED", f"{len(rejected)}")
+
+    if not rejected.empty:
+        with st.container(border=True):
+            st.markdown(f"<h4 style='color:{RED};'>Rejected Rows</h4>", unsafe_allow_html=True)
+            st.dataframe(rejected, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Rejected Rows (CSV)",
+                data=to_csv_bytes(rejected),
+                file_name="rejected_rows.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+
+    if not accepted.empty:
+        with st.container(border=True):
+            st.markdown(f"<h4 style='color:{GREEN};'>Rows To Import</h4>", unsafe_allow_html=True)
+            st.dataframe(accepted, use_container_width=True, hide_index=True)
+            total = float(accepted["AMOUNT PAID"].sum())
+            if st.button(
+                f"Import {len(accepted)} rows ({CURRENCY_PREFIX}{total:,.2f})", use_container_width=True
+            ):
+                # append_transactions only raises when the append itself failed;
+                # a summary update failing afterwards is logged and the rows count.
+                try:
+                    written = append_transactions(accepted, program=program)
+                except Exception:
+                    st.error("We could not write the rows right now. Nothing was imported; please try again.")
+                    st.stop()
+                message = f"Imported {written} rows into {program.label}."
+                if written < len(accepted):
+                    message += f" {len(accepted) - written} rows were already submitted and were skipped."
+                st.session_state["import_success_message"] = message
+                st.rerun()
+
+st.markdown("")
+a1, a2 = st.columns(2)
+
+with a1:
+    if st.button("Back to Admin Dashboard", use_container_width=True):
+        st.switch_page("pages/Admin_dashboard.py")
+
+with a2:
+    if st.button("Logout", use_container_width=True):
+        clear_login()
+        st.switch_page("pages/login.py")
@@ -1,16 +1,66 @@
-import re
+from datetime import date
 
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
 try:
-    from src.Database.GOOGLE_SHEETS import get_transaction_data
-    from src.Tools.data_clean import clean_transaction_data
+    from src.Database.GOOGLE_SHEETS import (
+        compact_closed_weeks,
+        get_fund_summary,
+        get_leaderboard,
+        get_log_index,
+        get_member_coverage,
+        get_transaction_data,
+        get_transaction_data_status,
+        get_transaction_snapshot,
+    )
+    from src.Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from src.Tools.charts import (
+        CHART_PAGE_SIZE,
+        CHART_TOP_N,
+        HEATMAP_PAGE_SIZE,
+        bar_chart,
+        heatmap_chart,
+        member_week_matrix,
+        page_count,
+        paginate,
+        top_n_with_others,
+    )
+    from src.Tools.fund_summary import paid_weeks_from_bits, week_bits
+    from src.Tools.log_viewer import render_log_viewer
+    from src.Tools.page_sections import ProgressivePage
+    from src.Tools.reconciliation import DATE_WINDOW_DAYS, reconcile
+    from src.Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
     from src.Tools.session_auth import clear_login, persist_login, restore_login
 except ModuleNotFoundError:
-    from Database.GOOGLE_SHEETS import get_transaction_data
-    from Tools.data_clean import clean_transaction_data
+    from Database.GOOGLE_SHEETS import (
+        compact_closed_weeks,
+        get_fund_summary,
+        get_leaderboard,
+        get_log_index,
+        get_member_coverage,
+        get_transaction_data,
+        get_transaction_data_status,
+        get_transaction_snapshot,
+    )
+    from Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from Tools.charts import (
+        CHART_PAGE_SIZE,
+        CHART_TOP_N,
+        HEATMAP_PAGE_SIZE,
+        bar_chart,
+        heatmap_chart,
+        member_week_matrix,
+        page_count,
+        paginate,
+        top_n_with_others,
+    )
+    from Tools.fund_summary import paid_weeks_from_bits, week_bits
+    from Tools.log_viewer import render_log_viewer
+    from Tools.page_sections import ProgressivePage
+    from Tools.reconciliation import DATE_WINDOW_DAYS, reconcile
+    from Tools.program_config import ProgramConfig, get_active_program, get_program, list_programs
     from Tools.session_auth import clear_login, persist_login, restore_login
 
 st.set_page_config(page_title="Admin Review", layout="wide")
@@ -20,10 +70,6 @@ GREEN_LIGHT = "#a5d6a7"
 GREEN_FAINT = "#e8f5e9"
 RED = "#c62828"
 CURRENCY_PREFIX = "N"
-START_WEEK = 7
-LEGACY_WEEK = 6
-TOTAL_WEEKS = 52
-END_WEEK = TOTAL_WEEKS
 
 
 def hide_sidebar() -> None:
@@ -38,33 +84,51 @@ def hide_sidebar() -> None:
     )
 
 
-def extract_week_number(value: str) -> float:
-    match = re.search(r"(\d+)", str(value))
-    return float(match.group(1)) if match else float("nan")
-
-
 def to_csv_bytes(df: pd.DataFrame) -> bytes:
     return df.to_csv(index=False).encode("utf-8")
 
 
-def next_due_week_for_member(paid_weeks: set[int]) -> int:
-    if LEGACY_WEEK not in paid_weeks:
-        return LEGACY_WEEK
+def show_chart(fig) -> None:
+    # The chart builders already enforce MAX_FIGURE_BYTES.
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+def page_selector(rows: int, page_size: int, key: str) -> int:
+    pages = page_count(rows, page_size)
+    if pages == 1:
+        return 1
+    return int(st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, step=1, key=key))
+
 
-    for week in range(START_WEEK, END_WEEK + 1):
+def next_due_week_for_member(paid_weeks: set[int], program: ProgramConfig) -> int:
+    for week in program.scheduled_weeks():
         if week not in paid_weeks:
             return week
 
-    return END_WEEK + 1
+    return program.end_week + 1
 
 
-def weeks_left_from_due(due_week: int) -> int:
-    return max(END_WEEK - due_week, 0)
+def weeks_left_from_due(due_week: int, program: ProgramConfig) -> int:
+    return max(program.end_week - due_week, 0)
 
 
-def load_data() -> pd.DataFrame:
-    raw_df = get_transaction_data()
-    df = clean_transaction_data(raw_df)
+def select_program() -> ProgramConfig:
+    programs = list_programs()
+    active = get_active_program()
+    if len(programs) < 2:
+        return active
+    years = [p.year for p in reversed(programs)]
+    selected_year = st.selectbox(
+        "Program Year",
+        years,
+        index=years.index(active.year),
+        format_func=lambda year: f"{year} (active)" if year == active.year else str(year),
+    )
+    return get_program(selected_year)
+
+
+def load_data(program: ProgramConfig) -> pd.DataFrame:
+    df = get_transaction_snapshot(program=program)
 
     required_cols = {"NAME", "AMOUNT PAID", "DATE", "WEEK"}
     missing = required_cols - set(df.columns)
@@ -72,11 +136,7 @@ def load_data() -> pd.DataFrame:
         st.error(f"Missing required columns in sheet: {', '.join(sorted(missing))}")
         st.stop()
 
-    df["NAME"] = df["NAME"].astype(str).str.strip().str.title()
-    df["AMOUNT PAID"] = pd.to_numeric(df["AMOUNT PAID"], errors="coerce")
-    df["DATE"] = pd.to_datetime(df["DATE"], errors="coerce")
-    df["WEEK NUMBER"] = df["WEEK"].apply(extract_week_number)
-    return df.dropna(subset=["NAME", "AMOUNT PAID"]).copy()
+    return df.dropna(subset=["NAME", "AMOUNT PAID"])
 
 
 hide_sidebar()
@@ -92,45 +152,42 @@ persist_login(st.session_state.get("username"), "admin")
 
 st.markdown(f"<h1 style='text-align:center; color:{GREEN};'>Admin Review</h1>", unsafe_allow_html=True)
 
-main_df = load_data()
-
-if main_df.empty:
-    st.info("No contribution data available yet.")
-else:
-    expected_weeks_left = max(END_WEEK - START_WEEK, 0)
+program = select_program()
+start_week = program.start_week
+end_week = program.end_week
+page = ProgressivePage()
 
-    valid_week_df = main_df[(main_df["WEEK NUMBER"] >= LEGACY_WEEK) & (main_df["WEEK NUMBER"] <= END_WEEK)].copy()
-    current_window_df = valid_week_df[(valid_week_df["WEEK NUMBER"] >= START_WEEK) & (valid_week_df["WEEK NUMBER"] <= END_WEEK)]
+# Coverage, KPIs and charts come from the paid-week bitsets in the fund
+# summary; only the log viewer, reconciliation and archiving load the log.
+summary = get_fund_summary(program=program)
 
-    unique_members = sorted(valid_week_df["NAME"].dropna().unique().tolist())
-    if not unique_members:
-        unique_members = sorted(main_df["NAME"].dropna().unique().tolist())
+data_status = get_transaction_data_status(program)
+if data_status["degraded"] and data_status["as_of"] is not None:
+    st.warning(
+        "Live data is temporarily unavailable. "
+        f"Showing data as of {data_status['as_of'].strftime('%d/%m/%Y %H:%M')}."
+    )
 
-    submitted_weeks = int(current_window_df["WEEK NUMBER"].dropna().astype(int).nunique())
-    submitted_weeks = min(submitted_weeks, expected_weeks_left)
+if not summary["members"]:
+    st.info("No contribution data available yet.")
+else:
+    expected_weeks_left = max(end_week - start_week, 0)
+
+    valid_mask = week_bits(range(program.first_week, end_week + 1))
+    window_mask = week_bits(range(start_week, end_week + 1))
+    # Members are registry IDs from here on; names are only looked up for display.
+    registry = get_member_registry()
+    coverage = get_member_coverage(registry, program=program)
+    unique_members = coverage.paying(valid_mask) or coverage.member_ids
+    member_paid_weeks: dict[int, set[int]] = {
+        member_id: paid_weeks_from_bits(coverage.paid_bits[member_id] & valid_mask) for member_id in unique_members
+    }
+
+    window_bits = coverage.combined_bits(window_mask)
+    submitted_weeks = min(bin(window_bits).count("1"), expected_weeks_left)
     missing_total = max(expected_weeks_left - submitted_weeks, 0)
     completion_pct = (submitted_weeks / expected_weeks_left * 100) if expected_weeks_left > 0 else 0.0
 
-    member_progress_rows = []
-    member_paid_weeks: dict[str, set[int]] = {}
-    for member in unique_members:
-        paid_weeks = set(
-            valid_week_df[valid_week_df["NAME"] == member]["WEEK NUMBER"].dropna().astype(int).tolist()
-        )
-        member_paid_weeks[member] = paid_weeks
-        due_week = next_due_week_for_member(paid_weeks)
-        weeks_left = weeks_left_from_due(due_week)
-        member_progress_rows.append(
-            {
-                "NAME": member,
-                "SUBMITTED WEEKS": max(expected_weeks_left - weeks_left, 0),
-                "MISSING WEEKS": weeks_left,
-                "DUE WEEK": due_week if due_week <= END_WEEK else None,
-            }
-        )
-
-    member_progress = pd.DataFrame(member_progress_rows)
-
     k1, k2, k3, k4 = st.columns(4)
 
     with k1:
@@ -158,65 +215,93 @@ else:
         unsafe_allow_html=True,
     )
 
-    st.markdown("")
-
-    c1, c2 = st.columns(2)
+    if coverage.unmatched:
+        with st.expander(f"{len(coverage.unmatched)} contributor name(s) have no account"):
+            st.caption("These names in the log match no USERNAME in AUTHENTICATION; check for typos or missing sign-ups.")
+            st.dataframe(pd.DataFrame({"NAME": coverage.unmatched}), use_container_width=True, hide_index=True)
 
-    with c1:
-        with st.container(border=True):
-            if valid_week_df.empty:
-                st.info("No valid in-range week data yet (weeks 7-52).")
-            else:
-                member_progress = member_progress.sort_values(["MISSING WEEKS", "NAME"], ascending=[False, True])
-
-                fig = px.bar(
-                    member_progress,
-                    x="NAME",
-                    y="MISSING WEEKS",
-                    text="MISSING WEEKS",
-                    title="Missing Weeks By Member",
-                    color_discrete_sequence=[GREEN],
-                )
-                fig.update_layout(height=320, xaxis_title="", yaxis_title="", margin=dict(l=10, r=10, t=50, b=10))
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-                st.download_button(
-                    "Download Missing Weeks By Member (CSV)",
-                    data=to_csv_bytes(member_progress),
-                    file_name="missing_weeks_by_member.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                )
+    st.markdown("")
 
-    with c2:
-        with st.container(border=True):
-            total_by_member = (
-                main_df.groupby("NAME", as_index=False)["AMOUNT PAID"].sum().sort_values("AMOUNT PAID", ascending=False)
+    def member_progress_frame() -> pd.DataFrame:
+        rows = []
+        for member in unique_members:
+            due_week = next_due_week_for_member(member_paid_weeks[member], program)
+            weeks_left = weeks_left_from_due(due_week, program)
+            rows.append(
+                {
+                    "NAME": coverage.name_of(member),
+                    "SUBMITTED WEEKS": max(expected_weeks_left - weeks_left, 0),
+                    "MISSING WEEKS": weeks_left,
+                    "DUE WEEK": due_week if due_week <= end_week else None,
+                }
+            )
+        return pd.DataFrame(rows).sort_values(["MISSING WEEKS", "NAME"], ascending=[False, True])
+
+    def render_missing_weeks() -> None:
+        if not any(member_paid_weeks.values()):
+            st.info(f"No valid in-range week data yet (weeks {start_week}-{end_week}).")
+            return
+        member_progress = member_progress_frame()
+        chart_view = st.radio(
+            "Chart view",
+            [f"Top {CHART_TOP_N}", "All members (paged)", "Paid weeks heatmap"],
+            horizontal=True,
+            label_visibility="collapsed",
+        )
+        if chart_view == "Paid weeks heatmap":
+            page_ids = paginate(
+                pd.DataFrame({"MEMBER ID": unique_members}),
+                page_selector(len(unique_members), HEATMAP_PAGE_SIZE, "heatmap_page"),
+                HEATMAP_PAGE_SIZE,
+            )["MEMBER ID"]
+            weeks = [week for week in program.scheduled_weeks() if week <= end_week]
+            matrix = member_week_matrix(
+                {coverage.name_of(member_id): member_paid_weeks[member_id] for member_id in page_ids}, weeks
             )
-            if total_by_member.empty:
-                st.info("No member totals yet.")
+            show_chart(heatmap_chart(matrix, "Paid Weeks By Member", [GREEN_FAINT, GREEN]))
+        else:
+            if chart_view == "All members (paged)":
+                page_number = page_selector(len(member_progress), CHART_PAGE_SIZE, "missing_weeks_page")
+                chart_df = paginate(member_progress, page_number)
             else:
-                fig = px.pie(
-                    total_by_member.head(8),
-                    names="NAME",
-                    values="AMOUNT PAID",
-                    hole=0.55,
-                    title="Fund Share (Top Members)",
-                    color_discrete_sequence=[GREEN, GREEN_LIGHT, GREEN_FAINT, "#7cb342", "#66bb6a", "#43a047", "#2e7d32", "#1b5e20"],
-                )
-                fig.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent}")
-                fig.update_layout(height=320, margin=dict(l=10, r=10, t=50, b=10))
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-
-    st.markdown("")
+                chart_df = top_n_with_others(member_progress, "NAME", "MISSING WEEKS")
+            fig = bar_chart(chart_df, "NAME", "MISSING WEEKS", "Missing Weeks By Member", GREEN)
+            fig.update_layout(height=320)
+            show_chart(fig)
+        st.download_button(
+            "Download Missing Weeks By Member (CSV)",
+            data=to_csv_bytes(member_progress),
+            file_name="missing_weeks_by_member.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
 
-    if unique_members:
-        selected_member = st.selectbox("Inspect Member", unique_members, index=0)
-        selected_paid_weeks = member_paid_weeks.get(selected_member, set())
-        selected_due_week = next_due_week_for_member(selected_paid_weeks)
-        selected_missing_weeks_left = weeks_left_from_due(selected_due_week)
+    def render_fund_share() -> None:
+        top_members = pd.DataFrame(get_leaderboard(registry, program=program).top(8), columns=["RANK", "NAME", "AMOUNT PAID"])
+        if top_members.empty:
+            st.info("No member totals yet.")
+            return
+        fig = px.pie(
+            top_members,
+            names="NAME",
+            values="AMOUNT PAID",
+            hole=0.55,
+            title="Fund Share (Top Members)",
+            color_discrete_sequence=[GREEN, GREEN_LIGHT, GREEN_FAINT, "#7cb342", "#66bb6a", "#43a047", "#2e7d32", "#1b5e20"],
+        )
+        fig.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent}")
+        fig.update_layout(height=320, margin=dict(l=10, r=10, t=50, b=10))
+        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+    def render_member_detail() -> None:
+        selected_id = st.selectbox("Inspect Member", unique_members, index=0, format_func=coverage.name_of)
+        selected_member = coverage.name_of(selected_id)
+        selected_paid_weeks = member_paid_weeks.get(selected_id, set())
+        selected_due_week = next_due_week_for_member(selected_paid_weeks, program)
+        selected_missing_weeks_left = weeks_left_from_due(selected_due_week, program)
         selected_submitted_weeks = max(expected_weeks_left - selected_missing_weeks_left, 0)
-        if selected_due_week <= END_WEEK:
-            missing_weeks = [w for w in range(selected_due_week, END_WEEK)]
+        if selected_due_week <= end_week:
+            missing_weeks = [w for w in range(selected_due_week, end_week)]
         else:
             missing_weeks = []
 
@@ -224,7 +309,7 @@ else:
         with d1:
             with st.container(border=True):
                 st.markdown(f"<h4 style='color:{GREEN};'>Member Detail: {selected_member}</h4>", unsafe_allow_html=True)
-                total_paid = float(main_df[main_df["NAME"] == selected_member]["AMOUNT PAID"].sum())
+                total_paid = float(coverage.totals[selected_id])
                 st.markdown(f"<div>Total Paid: <b>{CURRENCY_PREFIX}{total_paid:,.2f}</b></div>", unsafe_allow_html=True)
                 st.markdown(f"<div>Weeks Submitted: <b>{selected_submitted_weeks}</b> / {expected_weeks_left}</div>", unsafe_allow_html=True)
                 st.markdown(f"<div>Weeks Missing: <b>{selected_missing_weeks_left}</b></div>", unsafe_allow_html=True)
@@ -245,18 +330,101 @@ else:
                 else:
                     st.success("No missing weeks for this member in the contribution window.")
 
-    with st.expander("View Full Contribution Log"):
-        display_df = main_df.sort_values("DATE", ascending=False).copy()
-        display_df["DATE"] = display_df["DATE"].dt.strftime("%d/%m/%Y")
-        st.dataframe(display_df[["NAME", "AMOUNT PAID", "DATE", "WEEK"]], use_container_width=True)
+    def render_full_log() -> None:
+        with st.container(border=True):
+            render_log_viewer(get_log_index(program=program, registry=registry), "admin_log", file_name="full_contribution_log.csv")
+
+    def render_reconciliation() -> None:
+        statement_file = st.file_uploader("Bank statement CSV (name, amount, date)", type=["csv"], key="reconcile_csv")
+        window_days = st.number_input(
+            "Date window (days)", min_value=0, max_value=14, value=DATE_WINDOW_DAYS, step=1
+        )
+        if statement_file is None:
+            return
+        main_df = load_data(program)
+        try:
+            statement = pd.read_csv(statement_file, dtype=str, keep_default_na=False)
+            # Compacted rows are per-week totals, so only live rows are matched.
+            reconciliation = reconcile(statement, main_df[~main_df["COMPACTED"]], int(window_days))
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+        counts = reconciliation["STATUS"].value_counts()
+        status_cols = st.columns(max(len(counts), 1))
+        for col, (status, count) in zip(status_cols, counts.items()):
+            col.metric(status.upper(), f"{count}")
+        display = reconciliation.assign(
+            **{
+                "BANK DATE": reconciliation["BANK DATE"].dt.strftime("%d/%m/%Y"),
+                "LOG DATE": reconciliation["LOG DATE"].dt.strftime("%d/%m/%Y"),
+            }
+        )
+        st.dataframe(display, use_container_width=True, hide_index=True)
         st.download_button(
-            "Download Full Contribution Log (CSV)",
-            data=to_csv_bytes(display_df[["NAME", "AMOUNT PAID", "DATE", "WEEK"]]),
-            file_name="full_contribution_log.csv",
+            "Download Reconciliation (CSV)",
+            data=to_csv_bytes(display),
+            file_name="reconciliation.csv",
             mime="text/csv",
             use_container_width=True,
         )
 
+    def render_archive() -> None:
+        if st.session_state.get("archive_success_message"):
+            st.success(st.session_state.pop("archive_success_message"))
+        last_closed_week = program.current_open_week(date.today()) - 1
+        if last_closed_week < program.first_week:
+            st.info("No closed weeks to archive yet.")
+            return
+        through_week = st.number_input(
+            "Archive weeks up to and including",
+            min_value=program.first_week,
+            max_value=last_closed_week,
+            value=last_closed_week,
+            step=1,
+        )
+        main_df = load_data(program)
+        live_closed = main_df[~main_df["COMPACTED"] & (main_df["WEEK NUMBER"] <= through_week)]
+        summary_rows = int(live_closed[["NAME", "WEEK"]].drop_duplicates().shape[0])
+        st.caption(
+            f"{len(live_closed)} live rows will move to the archive sheet and be replaced by "
+            f"{summary_rows} member/week summary rows. Totals are unchanged."
+        )
+        # Compaction rewrites the live sheet, so it takes an explicit
+        # confirmation, keyed per cut-off so a new week starts unchecked.
+        confirmed = st.checkbox(
+            f"I understand weeks up to {int(through_week)} will be moved out of the live sheet",
+            key=f"archive_confirm_{program.worksheet}_{int(through_week)}",
+            disabled=live_closed.empty,
+        )
+        if st.button(
+            "Archive Closed Weeks", use_container_width=True, disabled=live_closed.empty or not confirmed
+        ):
+            result = compact_closed_weeks(int(through_week), program=program)
+            st.session_state["archive_success_message"] = (
+                f"Archived {result['archived_rows']} rows into {result['summary_rows']} summary rows."
+            )
+            st.rerun()
+
+    c1, c2 = st.columns(2)
+
+    with c1:
+        with st.container(border=True):
+            page.section(render_missing_weeks, height=420)
+
+    with c2:
+        with st.container(border=True):
+            page.section(render_fund_share, height=320)
+
+    st.markdown("")
+
+    if unique_members:
+        page.section(render_member_detail, height=300)
+
+    # Toggles rather than expanders: expander bodies run on every rerun.
+    page.section(render_full_log, title="View Full Contribution Log", key="full_log", lazy=True)
+    page.section(render_reconciliation, title="Reconcile Bank Statement", key="reconcile", lazy=True)
+    page.section(render_archive, title="Archive Closed Weeks", key="archive", lazy=True)
+
 st.markdown("")
 a1, a2, a3 = st.columns(3)
 
@@ -266,10 +434,12 @@ with a1:
 
 with a2:
     if st.button("Refresh Review", use_container_width=True):
-        get_transaction_data(force_refresh=True)
+        get_transaction_data(force_refresh=True, program=program)
         st.rerun()
 
 with a3:
     if st.button("Logout", use_container_width=True):
         clear_login()
         st.switch_page("pages/login.py")
+
+page.flush()
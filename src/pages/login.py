@@ -2,10 +2,12 @@ import streamlit as st
 try:
     from src.Tools.Auth import verify_creds, store_creds
     from src.Tools.background import set_background
+    from src.Tools.member_registry import normalize_name
     from src.Tools.session_auth import persist_login, restore_login
 except ModuleNotFoundError:
     from Tools.Auth import verify_creds, store_creds
     from Tools.background import set_background
+    from Tools.member_registry import normalize_name
     from Tools.session_auth import persist_login, restore_login
 from pathlib import Path
 
@@ -54,7 +56,7 @@ with center:
             if submitted:
                 success, message = verify_creds(username, password)
                 if success:
-                    clean_user = str(username).strip().title()
+                    clean_user = normalize_name(username)
                     if clean_user.lower() == "admin":
                         persist_login(clean_user, "admin")
                         st.switch_page("pages/Admin_dashboard.py")
@@ -74,7 +76,7 @@ with center:
             if submitted:
                 success, message = store_creds(new_username, new_password)
                 if success:
-                    clean_user = str(new_username).strip().title()
+                    clean_user = normalize_name(new_username)
                     if clean_user.lower() == "admin":
                         persist_login(clean_user, "admin")
                         st.switch_page("pages/Admin_dashboard.py")
@@ -3,22 +3,22 @@ import streamlit as st
 from datetime import date, datetime, timedelta
 
 try:
-    from src.Database.GOOGLE_SHEETS import append_transaction, get_transaction_data
-    from src.Tools.data_clean import clean_transaction_data
+    from src.Database.GOOGLE_SHEETS import get_fund_summary, get_pending_submission_weeks, get_transaction_data_status, submit_transaction
+    from src.Tools.data_clean import extract_week_numbers
+    from src.Tools.fund_summary import paid_weeks_from_bits
+    from src.Tools.member_registry import normalize_name
+    from src.Tools.program_config import get_active_program
     from src.Tools.session_auth import clear_login, persist_login, restore_login
 except ModuleNotFoundError:
-    from Database.GOOGLE_SHEETS import append_transaction, get_transaction_data
-    from Tools.data_clean import clean_transaction_data
+    from Database.GOOGLE_SHEETS import get_fund_summary, get_pending_submission_weeks, get_transaction_data_status, submit_transaction
+    from Tools.data_clean import extract_week_numbers
+    from Tools.fund_summary import paid_weeks_from_bits
+    from Tools.member_registry import normalize_name
+    from Tools.program_config import get_active_program
     from Tools.session_auth import clear_login, persist_login, restore_login
 
 GREEN = "#1b8a3a"
 GREEN_LIGHT = "#a5d6a7"
-WEEKLY_CONTRIBUTION = 1000.0
-START_WEEK = 7
-LEGACY_WEEK = 6
-TOTAL_WEEKS = 52
-END_WEEK = TOTAL_WEEKS
-WEEK7_START_DATE = date(2026, 2, 23)  # Monday
 
 
 def hide_sidebar() -> None:
@@ -34,10 +34,7 @@ def hide_sidebar() -> None:
 
 
 def current_open_week(today: date) -> int:
-    if today <= WEEK7_START_DATE:
-        return START_WEEK
-    weeks_elapsed = (today - WEEK7_START_DATE).days // 7
-    return min(START_WEEK + weeks_elapsed, END_WEEK)
+    return PROGRAM.current_open_week(today)
 
 
 def next_monday(today: date) -> date:
@@ -48,7 +45,7 @@ def next_monday(today: date) -> date:
 
 def required_weeks_through(open_week: int) -> list[int]:
     capped_open_week = min(open_week, END_WEEK)
-    weeks = [LEGACY_WEEK] if capped_open_week >= LEGACY_WEEK else []
+    weeks = [LEGACY_WEEK] if LEGACY_WEEK is not None and capped_open_week >= LEGACY_WEEK else []
     if capped_open_week >= START_WEEK:
         weeks.extend(range(START_WEEK, capped_open_week + 1))
     return weeks
@@ -66,6 +63,13 @@ def next_due_week(paid_weeks: set[int], open_week: int) -> tuple[int, list[int]]
 
 hide_sidebar()
 restore_login()
+PROGRAM = get_active_program()
+WEEKLY_CONTRIBUTION = PROGRAM.weekly_contribution
+START_WEEK = PROGRAM.start_week
+LEGACY_WEEK = PROGRAM.legacy_week
+TOTAL_WEEKS = PROGRAM.total_weeks
+END_WEEK = TOTAL_WEEKS
+
 st.markdown(f"<h1 style='text-align:center; color:{GREEN};'>Submit Contribution</h1>", unsafe_allow_html=True)
 
 if not st.session_state.get("authenticated"):
@@ -79,30 +83,34 @@ if not username:
     clear_login()
     st.switch_page("pages/login.py")
 
-normalized_user = str(username).strip().title()
+normalized_user = normalize_name(username)
 persist_login(normalized_user, "user")
 st.markdown(f"<h3 style='color:{GREEN};'>User: {normalized_user}</h3>", unsafe_allow_html=True)
 
 records_available = True
 try:
-    existing_df = clean_transaction_data(get_transaction_data())
+    summary = get_fund_summary(program=PROGRAM)
 except Exception:
     records_available = False
-    existing_df = pd.DataFrame(columns=["NAME", "AMOUNT PAID", "DATE", "WEEK"])
+    summary = {"members": {}}
     st.error(
         "We could not load contribution records right now. Please refresh and try again in a moment."
     )
 
-if not existing_df.empty:
-    existing_df["NAME"] = existing_df["NAME"].astype(str).str.strip().str.title()
-    user_existing = existing_df[existing_df["NAME"] == normalized_user].copy()
-    user_existing["WEEK NUMBER"] = pd.to_numeric(
-        user_existing["WEEK"].astype(str).str.extract(r"(\d+)")[0],
-        errors="coerce",
+data_status = get_transaction_data_status()
+if data_status["degraded"] and data_status["as_of"] is not None:
+    st.warning(
+        "Live data is temporarily unavailable. Payments are still saved and will sync automatically. "
+        f"Showing data as of {data_status['as_of'].strftime('%d/%m/%Y %H:%M')}."
     )
-    paid_weeks = set(user_existing["WEEK NUMBER"].dropna().astype(int).tolist())
-else:
-    paid_weeks = set()
+
+paid_weeks = paid_weeks_from_bits(summary["members"].get(normalized_user, {}).get("paid_weeks", 0))
+
+try:
+    pending_weeks = get_pending_submission_weeks(normalized_user, PROGRAM)
+except Exception:
+    pending_weeks = []
+paid_weeks |= {int(w) for w in extract_week_numbers(pd.Series(pending_weeks, dtype=object)).dropna()}
 
 today = date.today()
 open_week = current_open_week(today)
@@ -129,7 +137,7 @@ with c:
             max_value=WEEKLY_CONTRIBUTION,
             step=100.0,
             format="%.2f",
-            help="Weekly contribution is fixed at N1,000.",
+            help=f"Weekly contribution is fixed at N{WEEKLY_CONTRIBUTION:,.0f}.",
         )
 
         if due_week > END_WEEK:
@@ -163,24 +171,19 @@ with c:
         week = f"week {due_week}"
 
         try:
-            fresh_df = clean_transaction_data(get_transaction_data(force_refresh=True))
-            if not fresh_df.empty:
-                fresh_df["NAME"] = fresh_df["NAME"].astype(str).str.strip().str.title()
-                fresh_df["WEEK"] = fresh_df["WEEK"].astype(str).str.strip().str.lower()
-                is_duplicate = ((fresh_df["NAME"] == normalized_user) & (fresh_df["WEEK"] == week)).any()
-                if is_duplicate:
-                    st.warning(
-                        f"Week {due_week} has already been submitted for your account. "
-                        "No action was taken."
-                    )
-                    st.stop()
-
-            append_transaction(
+            accepted = submit_transaction(
                 name=normalized_user,
                 amount_paid=float(amount),
                 week=week,
                 date_str=date_str,
+                program=PROGRAM,
             )
+            if not accepted:
+                st.warning(
+                    f"Week {due_week} has already been submitted for your account. "
+                    "No action was taken."
+                )
+                st.stop()
 
             st.session_state["submission_success_message"] = (
                 f"Saved {week.title()} contribution: N{float(amount):,.2f}."
@@ -4,12 +4,22 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 try:
-    from src.Database.GOOGLE_SHEETS import get_transaction_data
-    from src.Tools.data_clean import clean_transaction_data
+    from src.Database.GOOGLE_SHEETS import get_fund_projection, get_leaderboard, get_log_index, get_member_payloads, get_return_allocation, get_transaction_data_status
+    from src.Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from src.Tools.fund_summary import empty_member_payload
+    from src.Tools.log_viewer import render_log_viewer
+    from src.Tools.member_registry import normalize_name
+    from src.Tools.page_sections import ProgressivePage
+    from src.Tools.program_config import get_active_program
     from src.Tools.session_auth import clear_login, persist_login, restore_login
 except ModuleNotFoundError:
-    from Database.GOOGLE_SHEETS import get_transaction_data
-    from Tools.data_clean import clean_transaction_data
+    from Database.GOOGLE_SHEETS import get_fund_projection, get_leaderboard, get_log_index, get_member_payloads, get_return_allocation, get_transaction_data_status
+    from Database.GOOGLE_SHEETS_AUTH import get_member_registry
+    from Tools.fund_summary import empty_member_payload
+    from Tools.log_viewer import render_log_viewer
+    from Tools.member_registry import normalize_name
+    from Tools.page_sections import ProgressivePage
+    from Tools.program_config import get_active_program
     from Tools.session_auth import clear_login, persist_login, restore_login
 
 st.set_page_config(page_title="User Dashboard", layout="wide")
@@ -18,7 +28,6 @@ GREEN = "#1b8a3a"
 GREEN_LIGHT = "#a5d6a7"
 GREEN_FAINT = "#e8f5e9"
 DARK = "#0b3d1a"
-TARGET_FUND = 364000.0
 CURRENCY_PREFIX = "N"
 
 
@@ -36,6 +45,8 @@ def hide_sidebar() -> None:
 
 hide_sidebar()
 restore_login()
+PROGRAM = get_active_program()
+TARGET_FUND = PROGRAM.target_fund
 
 if not st.session_state.get("authenticated"):
     st.switch_page("pages/login.py")
@@ -43,7 +54,7 @@ if not st.session_state.get("authenticated"):
 if st.session_state.get("role") == "admin":
     st.switch_page("pages/Admin_dashboard.py")
 
-username = str(st.session_state.get("username") or "").strip().title()
+username = normalize_name(st.session_state.get("username"))
 if not username:
     clear_login()
     st.switch_page("pages/login.py")
@@ -52,30 +63,29 @@ persist_login(username, "user")
 st.markdown(f"<h1 style='text-align: center; color: {GREEN};'>My Dashboard</h1>", unsafe_allow_html=True)
 st.markdown(f"<h3 style='text-align:left; color: {GREEN};'>WELCOME: {username}</h3>", unsafe_allow_html=True)
 
-raw_df = get_transaction_data()
-df_all = clean_transaction_data(raw_df)
+# KPI cards come from the per-member payloads; everything heavier is queued
+# on ``page`` and computed after the cards are on screen.
+registry = get_member_registry()
+payloads = get_member_payloads(registry)
+board = get_leaderboard(registry)
+page = ProgressivePage()
+
+data_status = get_transaction_data_status()
+if data_status["degraded"] and data_status["as_of"] is not None:
+    st.warning(
+        "Live data is temporarily unavailable. "
+        f"Showing data as of {data_status['as_of'].strftime('%d/%m/%Y %H:%M')}."
+    )
 
 if st.session_state.get("submission_success_message"):
     st.success(st.session_state.pop("submission_success_message"))
 
-required_cols = {"NAME", "AMOUNT PAID", "DATE"}
-missing = required_cols - set(df_all.columns)
-if missing:
-    st.error(f"Missing required columns in sheet: {', '.join(sorted(missing))}")
-    st.stop()
-
-df_all["NAME"] = df_all["NAME"].astype(str).str.strip().str.title()
-df_all["AMOUNT PAID"] = pd.to_numeric(df_all["AMOUNT PAID"], errors="coerce")
-df_all = df_all.dropna(subset=["NAME", "AMOUNT PAID"]).copy()
-
-df_all["DATE"] = pd.to_datetime(df_all["DATE"], errors="coerce")
-
-user_key = username.lower()
-user_df = df_all[df_all["NAME"].str.lower() == user_key].copy()
+member_id = payloads["registry"].id_of(username)
+member = payloads["members"].get(member_id) or empty_member_payload(username)
 
-user_total = float(user_df["AMOUNT PAID"].sum()) if not user_df.empty else 0.0
-fund_total = float(df_all["AMOUNT PAID"].sum()) if not df_all.empty else 0.0
-equity_pct = (user_total / fund_total * 100) if fund_total > 0 else 0.0
+user_total = member["total"]
+fund_total = payloads["fund_total"]
+equity_pct = member["equity_pct"]
 remaining = max(TARGET_FUND - fund_total, 0.0)
 progress_pct = (fund_total / TARGET_FUND * 100) if TARGET_FUND > 0 else 0.0
 
@@ -84,54 +94,50 @@ with col1:
     with st.container(border=True):
         st.markdown("<h2 style='text-align:center;'>TOTAL (YOU)</h2>", unsafe_allow_html=True)
         st.markdown(f"<h2 style='text-align:center; color:{GREEN};'>{CURRENCY_PREFIX}{user_total:,.2f}</h2>", unsafe_allow_html=True)
+        returns_slot = st.empty()
 
 with col2:
     with st.container(border=True):
         st.markdown("<h2 style='text-align:center;'>EQUITY %</h2>", unsafe_allow_html=True)
-        st.markdown(f"<h2 style='text-align:center; color:{GREEN};'>{equity_pct:.2f}%</h2>", unsafe_allow_html=True)
+        equity_slot = st.empty()
+        equity_slot.markdown(f"<h2 style='text-align:center; color:{GREEN};'>{equity_pct:.2f}%</h2>", unsafe_allow_html=True)
+        member_rank = board.rank(member_id)
+        if member_rank is not None:
+            st.markdown(
+                f"<div style='text-align:center;'>Rank #{member_rank} of {len(board)}</div>",
+                unsafe_allow_html=True,
+            )
 
 with col3:
     with st.container(border=True):
         st.markdown("<h2 style='text-align:center;'>TOTAL FUND</h2>", unsafe_allow_html=True)
         st.markdown(f"<h2 style='text-align:center; color:{GREEN};'>{CURRENCY_PREFIX}{fund_total:,.2f}</h2>", unsafe_allow_html=True)
 
-st.markdown("")
-
-user_time = user_df.dropna(subset=["DATE"]).copy()
-fund_time = df_all.dropna(subset=["DATE"]).copy()
 
-if not user_time.empty:
-    user_time["MONTH"] = user_time["DATE"].dt.to_period("M").dt.to_timestamp()
-else:
-    user_time = pd.DataFrame(columns=["MONTH", "AMOUNT PAID"])
-
-if not fund_time.empty:
-    fund_time["MONTH"] = fund_time["DATE"].dt.to_period("M").dt.to_timestamp()
-else:
-    fund_time = pd.DataFrame(columns=["MONTH", "AMOUNT PAID"])
+def render_returns() -> None:
+    allocation = get_return_allocation()
+    if allocation is None:
+        return
+    if member["name"] not in allocation.index:
+        return
+    member_allocation = allocation.loc[member["name"]]
+    equity_slot.markdown(
+        f"<h2 style='text-align:center; color:{GREEN};'>{float(member_allocation['SHARE %']):.2f}%</h2>",
+        unsafe_allow_html=True,
+    )
+    returns_slot.markdown(
+        f"<div style='text-align:center;'>Returns: {CURRENCY_PREFIX}{member_allocation['RETURNS']:,.2f} | "
+        f"Balance: {CURRENCY_PREFIX}{member_allocation['BALANCE']:,.2f}</div>",
+        unsafe_allow_html=True,
+    )
 
-user_monthly = (
-    user_time.groupby("MONTH", as_index=False)["AMOUNT PAID"].sum()
-    if not user_time.empty
-    else pd.DataFrame(columns=["MONTH", "AMOUNT PAID"])
-)
 
-fund_monthly = (
-    fund_time.groupby("MONTH", as_index=False)["AMOUNT PAID"].sum()
-    if not fund_time.empty
-    else pd.DataFrame(columns=["MONTH", "AMOUNT PAID"])
-)
+page.defer(render_returns)
 
-equity_df = pd.DataFrame(
-    {
-        "Share": ["You", "Others"],
-        "Amount": [user_total, max(fund_total - user_total, 0.0)],
-    }
-)
+st.markdown("")
 
-contributors = (
-    df_all.groupby("NAME", as_index=False)["AMOUNT PAID"].sum().sort_values("AMOUNT PAID", ascending=False)
-)
+user_monthly = member["monthly"]
+fund_monthly = payloads["fund_monthly"]
 
 
 def style_axes(fig, height=260):
@@ -148,109 +154,152 @@ def style_axes(fig, height=260):
     return fig
 
 
+def render_user_monthly() -> None:
+    if user_monthly.empty:
+        st.info("No valid dated contributions found for you yet.")
+        return
+    fig = px.line(user_monthly, x="MONTH", y="AMOUNT PAID", markers=True, title="Your Contributions Per Month")
+    fig.update_traces(line_width=3, marker=dict(size=8), line=dict(color=GREEN))
+    style_axes(fig, height=270)
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+def render_fund_monthly() -> None:
+    if fund_monthly.empty:
+        st.info("No valid dated contributions found in the fund yet.")
+        return
+    fig = px.line(fund_monthly, x="MONTH", y="AMOUNT PAID", markers=True, title="Total Fund Inflow Per Month")
+    fig.update_traces(line_width=3, marker=dict(size=8), line=dict(color=GREEN))
+    style_axes(fig, height=270)
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+def render_gauge() -> None:
+    fig = go.Figure(
+        go.Indicator(
+            mode="gauge+number+delta",
+            value=fund_total,
+            number={"prefix": CURRENCY_PREFIX, "valueformat": ",.0f"},
+            delta={"reference": TARGET_FUND, "valueformat": ",.0f", "position": "top"},
+            title={"text": f"Target: {CURRENCY_PREFIX}{TARGET_FUND:,.0f} | Progress: {progress_pct:.1f}%", "font": {"size": 16}},
+            gauge={
+                "axis": {"range": [0, TARGET_FUND], "tickformat": ",.0f"},
+                "bar": {"color": GREEN},
+                "bgcolor": "white",
+                "steps": [
+                    {"range": [0, TARGET_FUND * 0.5], "color": GREEN_FAINT},
+                    {"range": [TARGET_FUND * 0.5, TARGET_FUND * 0.85], "color": "#c8e6c9"},
+                    {"range": [TARGET_FUND * 0.85, TARGET_FUND], "color": GREEN_LIGHT},
+                ],
+                "threshold": {"line": {"color": DARK, "width": 5}, "thickness": 0.85, "value": TARGET_FUND},
+            },
+        )
+    )
+    fig.update_layout(height=280, margin=dict(l=10, r=10, t=65, b=10))
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+    st.markdown(
+        f"<div style='text-align:center; color:{GREEN}; font-size:16px;'>Remaining: {CURRENCY_PREFIX}{remaining:,.0f}</div>",
+        unsafe_allow_html=True,
+    )
+
+
+def render_projection() -> None:
+    projection = get_fund_projection()
+    st.markdown(
+        f"<div style='text-align:center; font-size:14px;'>"
+        f"Chance of reaching target by Week {PROGRAM.end_week}: <b>{projection['probability'] * 100:.0f}%</b> | "
+        f"Expected shortfall: <b>{CURRENCY_PREFIX}{projection['expected_shortfall']:,.0f}</b><br>"
+        f"Projected final fund (10th-90th percentile): {CURRENCY_PREFIX}{projection['p10']:,.0f} - "
+        f"{CURRENCY_PREFIX}{projection['p90']:,.0f}</div>",
+        unsafe_allow_html=True,
+    )
+
+
+def render_equity_pie() -> None:
+    equity_df = pd.DataFrame(
+        {
+            "Share": ["You", "Others"],
+            "Amount": [user_total, max(fund_total - user_total, 0.0)],
+        }
+    )
+    fig = px.pie(
+        equity_df,
+        names="Share",
+        values="Amount",
+        hole=0.55,
+        color="Share",
+        color_discrete_map={"You": GREEN, "Others": GREEN_LIGHT},
+    )
+    fig.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent}")
+    fig.update_layout(
+        height=280,
+        margin=dict(l=10, r=10, t=50, b=10),
+        title=dict(text="Equity Breakdown (You vs Others)", x=0.5, xanchor="center"),
+        showlegend=True,
+    )
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+def render_top_contributors() -> None:
+    top_contributors = pd.DataFrame(board.top(10), columns=["RANK", "NAME", "AMOUNT PAID"])
+    if top_contributors.empty:
+        st.info("No contributors yet.")
+        return
+    fig = px.bar(top_contributors.sort_values("AMOUNT PAID"), x="AMOUNT PAID", y="NAME", orientation="h", text="AMOUNT PAID")
+    fig.update_traces(texttemplate=f"{CURRENCY_PREFIX}%{{text:,.0f}}", textposition="outside")
+    fig.update_layout(
+        height=330,
+        margin=dict(l=10, r=10, t=50, b=10),
+        title=dict(text="Top Contributors (Total So Far)", x=0.5, xanchor="center"),
+        xaxis_title="",
+        yaxis_title="",
+    )
+    fig.update_xaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True, showgrid=True)
+    fig.update_yaxes(showgrid=False)
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+def render_leaderboard() -> None:
+    if not len(board):
+        st.info("No leaderboard yet.")
+    else:
+        st.dataframe(pd.DataFrame(board.rows()), use_container_width=True, hide_index=True)
+
+
+def render_my_transactions() -> None:
+    with st.container(border=True):
+        render_log_viewer(get_log_index(registry=registry), "my_log", member=member["name"], file_name="my_transactions.csv")
+
+
 c1, c2 = st.columns(2)
 with c1:
     with st.container(border=True):
-        if user_monthly.empty:
-            st.info("No valid dated contributions found for you yet.")
-        else:
-            fig = px.line(user_monthly, x="MONTH", y="AMOUNT PAID", markers=True, title="Your Contributions Per Month")
-            fig.update_traces(line_width=3, marker=dict(size=8), line=dict(color=GREEN))
-            style_axes(fig, height=270)
-            st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        page.section(render_user_monthly, height=270)
 
 with c2:
     with st.container(border=True):
-        if fund_monthly.empty:
-            st.info("No valid dated contributions found in the fund yet.")
-        else:
-            fig = px.line(fund_monthly, x="MONTH", y="AMOUNT PAID", markers=True, title="Total Fund Inflow Per Month")
-            fig.update_traces(line_width=3, marker=dict(size=8), line=dict(color=GREEN))
-            style_axes(fig, height=270)
-            st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        page.section(render_fund_monthly, height=270)
 
 st.markdown("")
 
 c3, c4 = st.columns(2)
 with c3:
     with st.container(border=True):
-        fig = go.Figure(
-            go.Indicator(
-                mode="gauge+number+delta",
-                value=fund_total,
-                number={"prefix": CURRENCY_PREFIX, "valueformat": ",.0f"},
-                delta={"reference": TARGET_FUND, "valueformat": ",.0f", "position": "top"},
-                title={"text": f"Target: {CURRENCY_PREFIX}{TARGET_FUND:,.0f} | Progress: {progress_pct:.1f}%", "font": {"size": 16}},
-                gauge={
-                    "axis": {"range": [0, TARGET_FUND], "tickformat": ",.0f"},
-                    "bar": {"color": GREEN},
-                    "bgcolor": "white",
-                    "steps": [
-                        {"range": [0, TARGET_FUND * 0.5], "color": GREEN_FAINT},
-                        {"range": [TARGET_FUND * 0.5, TARGET_FUND * 0.85], "color": "#c8e6c9"},
-                        {"range": [TARGET_FUND * 0.85, TARGET_FUND], "color": GREEN_LIGHT},
-                    ],
-                    "threshold": {"line": {"color": DARK, "width": 5}, "thickness": 0.85, "value": TARGET_FUND},
-                },
-            )
-        )
-        fig.update_layout(height=280, margin=dict(l=10, r=10, t=65, b=10))
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-        st.markdown(
-            f"<div style='text-align:center; color:{GREEN}; font-size:16px;'>Remaining: {CURRENCY_PREFIX}{remaining:,.0f}</div>",
-            unsafe_allow_html=True,
-        )
+        page.section(render_gauge, height=300)
+        page.section(render_projection, height=40)
 
 with c4:
     with st.container(border=True):
-        fig = px.pie(
-            equity_df,
-            names="Share",
-            values="Amount",
-            hole=0.55,
-            color="Share",
-            color_discrete_map={"You": GREEN, "Others": GREEN_LIGHT},
-        )
-        fig.update_traces(textposition="inside", texttemplate="%{label}<br>%{percent}")
-        fig.update_layout(
-            height=280,
-            margin=dict(l=10, r=10, t=50, b=10),
-            title=dict(text="Equity Breakdown (You vs Others)", x=0.5, xanchor="center"),
-            showlegend=True,
-        )
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        page.section(render_equity_pie, height=280)
 
 st.markdown("")
 
 with st.container(border=True):
-    if contributors.empty:
-        st.info("No contributors yet.")
-    else:
-        top_contributors = contributors.head(10).sort_values("AMOUNT PAID")
-        fig = px.bar(top_contributors, x="AMOUNT PAID", y="NAME", orientation="h", text="AMOUNT PAID")
-        fig.update_traces(texttemplate=f"{CURRENCY_PREFIX}%{{text:,.0f}}", textposition="outside")
-        fig.update_layout(
-            height=330,
-            margin=dict(l=10, r=10, t=50, b=10),
-            title=dict(text="Top Contributors (Total So Far)", x=0.5, xanchor="center"),
-            xaxis_title="",
-            yaxis_title="",
-        )
-        fig.update_xaxes(tickprefix=CURRENCY_PREFIX, separatethousands=True, showgrid=True)
-        fig.update_yaxes(showgrid=False)
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-
-    with st.expander("View Full Leaderboard"):
-        if contributors.empty:
-            st.info("No leaderboard yet.")
-        else:
-            leaderboard = contributors.copy()
-            leaderboard["RANK"] = range(1, len(leaderboard) + 1)
-            leaderboard = leaderboard[["RANK", "NAME", "AMOUNT PAID"]]
-            st.dataframe(leaderboard, use_container_width=True)
-
-with st.expander("View My Transactions"):
-    st.dataframe(user_df.sort_values("DATE", ascending=False), use_container_width=True)
+    page.section(render_top_contributors, height=330)
+    page.section(render_leaderboard, title="View Full Leaderboard", key="full_leaderboard", lazy=True)
+
+# The full log is only loaded when a member asks for their own rows.
+page.section(render_my_transactions, title="View My Transactions", key="my_transactions", lazy=True)
 
 st.markdown("")
 a1, a2 = st.columns([2, 2])
@@ -264,3 +313,4 @@ with a2:
         clear_login()
         st.switch_page("pages/login.py")
 
+page.flush()
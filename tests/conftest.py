@@ -0,0 +1,212 @@
+import os
+import re
+import tempfile
+
+# On-disk stores read their paths at import time, so point them at a scratch
+# directory before any app module is imported.
+_DATA_DIR = tempfile.mkdtemp(prefix="family-fund-tests-")
+os.environ.setdefault("APP_DATA_DIR", _DATA_DIR)
+os.environ.setdefault("FUND_SUMMARY_DIR", os.path.join(_DATA_DIR, "fund_summary"))
+
+import gspread
+import pytest
+from gspread.utils import a1_range_to_grid_range
+
+FINGERPRINT = re.compile(r"^=COUNTA\((?P<sheet>[^!]+)!A:Z\)")
+
+
+class FakeResponse:
+    def __init__(self, code: int, message: str):
+        self._body = {"error": {"code": code, "message": message, "status": "INVALID_ARGUMENT"}}
+
+    def json(self):
+        return self._body
+
+
+def api_error(code: int = 400, message: str = "Unable to parse range") -> gspread.exceptions.APIError:
+    return gspread.exceptions.APIError(FakeResponse(code, message))
+
+
+class FakeWorksheet:
+    def __init__(self, book: "FakeSpreadsheet", title: str, rows: list[list], sheet_id: int):
+        self.book = book
+        self.title = title
+        self.rows = [[str(v) for v in row] for row in rows]
+        self.id = sheet_id
+        self.row_count = max(len(self.rows), 1000)
+
+    def resize(self, rows: int | None = None, cols: int | None = None) -> None:
+        self.row_count = rows or self.row_count
+
+    def row_values(self, row: int) -> list[str]:
+        return self.book.read(self.title, f"{row}:{row}")[0] if len(self.rows) >= row else []
+
+    def col_values(self, col: int) -> list[str]:
+        return [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def update_cell(self, row: int, col: int, value) -> None:
+        self.book.write(self.title, row - 1, col - 1, [[value]])
+
+    def update(self, values, range_name: str = "A1") -> None:
+        grid = a1_range_to_grid_range(range_name)
+        self.book.write(self.title, grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0), values)
+
+    def batch_clear(self, ranges: list[str]) -> None:
+        for range_name in ranges:
+            grid = a1_range_to_grid_range(range_name)
+            for row in self.rows[grid.get("startRowIndex", 0) : grid.get("endRowIndex")]:
+                start, end = grid.get("startColumnIndex", 0), grid.get("endColumnIndex", len(row))
+                row[start:end] = [""] * len(row[start:end])
+
+    def get_all_values(self) -> list[list[str]]:
+        return self.book.read(self.title, "A:Z")
+
+    def get_all_records(self) -> list[dict]:
+        values = self.get_all_values()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, row + [""] * (len(header) - len(row)))) for row in values[1:]]
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for a ``gspread.Spreadsheet``.
+
+    Implements the calls the data layer makes, with Sheets' conventions:
+    reads return formatted strings trimmed of trailing blanks, ranges on a
+    missing worksheet fail with a 400, and the META fingerprint formula is
+    evaluated on read. Every API call is recorded in ``calls``.
+    """
+
+    def __init__(self, sheets: dict[str, list[list]] | None = None):
+        self.sheets: dict[str, FakeWorksheet] = {}
+        self.calls: list[tuple] = []
+        for title, rows in (sheets or {}).items():
+            self.add_worksheet(title, rows=len(rows), cols=len(rows[0]) if rows else 1, values=rows)
+        self.calls.clear()
+
+    def calls_to(self, method: str) -> list[tuple]:
+        return [call for call in self.calls if call[0] == method]
+
+    def _split(self, range_name: str) -> tuple[str, str]:
+        title, _, cells = range_name.rpartition("!")
+        if title not in self.sheets:
+            raise api_error(400, f"Unable to parse range: {range_name}")
+        return title, cells
+
+    def _display(self, value: str) -> str:
+        match = FINGERPRINT.match(value)
+        if not match:
+            return value
+        cells = [cell for row in self.sheets[match["sheet"]].rows for cell in row[:26] if cell != ""]
+        return f"{len(cells)}-{sum(len(cell) for cell in cells)}"
+
+    def read(self, title: str, cells: str, major: str = "ROWS") -> list[list[str]]:
+        grid = a1_range_to_grid_range(cells)
+        rows = self.sheets[title].rows[grid.get("startRowIndex", 0) : grid.get("endRowIndex")]
+        start = grid.get("startColumnIndex", 0)
+        values = [[self._display(v) for v in row[start : grid.get("endColumnIndex")]] for row in rows]
+        values = [_trim(row) for row in values]
+        while values and not values[-1]:
+            values.pop()
+        if major == "COLUMNS":
+            width = max((len(row) for row in values), default=0)
+            columns = [[row[i] if i < len(row) else "" for row in values] for i in range(width)]
+            values = [_trim(col) for col in columns]
+        return values
+
+    def write(self, title: str, row: int, col: int, values: list[list]) -> None:
+        rows = self.sheets[title].rows
+        for offset, row_values in enumerate(values):
+            while len(rows) <= row + offset:
+                rows.append([])
+            target = rows[row + offset]
+            while len(target) < col + len(row_values):
+                target.append("")
+            target[col : col + len(row_values)] = [_format(v) for v in row_values]
+
+    def worksheets(self) -> list[FakeWorksheet]:
+        self.calls.append(("worksheets",))
+        return list(self.sheets.values())
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.calls.append(("worksheet", title))
+        if title not in self.sheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title: str, rows: int = 100, cols: int = 26, values=None) -> FakeWorksheet:
+        self.calls.append(("add_worksheet", title))
+        sheet = FakeWorksheet(self, title, values or [], len(self.sheets))
+        self.sheets[title] = sheet
+        return sheet
+
+    def values_get(self, range_name: str, params=None):
+        self.calls.append(("values_get", range_name))
+        title, cells = self._split(range_name)
+        return {"range": range_name, "values": self.read(title, cells)}
+
+    def values_batch_get(self, ranges: list[str], params=None):
+        self.calls.append(("values_batch_get", tuple(ranges)))
+        major = (params or {}).get("majorDimension", "ROWS")
+        split = [self._split(range_name) for range_name in ranges]
+        return {"valueRanges": [{"values": self.read(title, cells, major)} for title, cells in split]}
+
+    def values_update(self, range_name: str, params=None, body=None):
+        self.calls.append(("values_update", range_name))
+        title, cells = self._split(range_name)
+        grid = a1_range_to_grid_range(cells)
+        self.write(title, grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0), body["values"])
+
+    def values_append(self, range_name: str, params=None, body=None):
+        self.calls.append(("values_append", range_name))
+        title, _ = self._split(range_name)
+        rows = self.sheets[title].rows
+        while rows and not any(rows[-1]):
+            rows.pop()
+        self.write(title, len(rows), 0, body["values"])
+
+    def values_batch_update(self, body):
+        self.calls.append(("values_batch_update", len(body["data"])))
+        for item in body["data"]:
+            title, cells = self._split(item["range"])
+            grid = a1_range_to_grid_range(cells)
+            self.write(title, grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0), item["values"])
+
+
+def _format(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return "" if value is None else str(value)
+
+
+def _trim(values: list[str]) -> list[str]:
+    values = list(values)
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+@pytest.fixture
+def workbook(monkeypatch, tmp_path):
+    """A fake workbook wired into the Sheets data layer, with every cache,
+    breaker and snapshot reset around the test."""
+    from src.Database import GOOGLE_SHEETS, snapshot_store
+    from src.Database.cache_manager import get_cache_manager
+
+    def reset() -> None:
+        manager = get_cache_manager()
+        manager.clear()
+        manager._versions.clear()
+        manager._retired.clear()
+        GOOGLE_SHEETS._get_workbook_layout.clear()
+        GOOGLE_SHEETS.clear_transaction_cache()
+        GOOGLE_SHEETS._breakers.clear()
+        GOOGLE_SHEETS._transaction_status.clear()
+
+    book = FakeSpreadsheet()
+    monkeypatch.setattr(GOOGLE_SHEETS, "_get_spreadsheet", lambda: book)
+    monkeypatch.setattr(snapshot_store, "_store", snapshot_store.SQLiteSnapshotStore(tmp_path / "snapshots.sqlite3"))
+    reset()
+    yield book
+    reset()
@@ -0,0 +1,77 @@
+import threading
+
+from src.Tools import Auth
+from src.Tools.password_hashing import HashPoolBusyError, _legacy_hash
+
+
+class FakeAuthSheet:
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    def row_values(self, row):
+        return self.rows[row - 1]
+
+    def col_values(self, col):
+        return [row[col - 1] for row in self.rows]
+
+    def update_cell(self, row, col, value):
+        self.updates.append((row, col, value))
+        self.rows[row - 1][col - 1] = value
+
+
+def _wire(monkeypatch, sheet):
+    records = [dict(zip(sheet.rows[0], row)) for row in sheet.rows[1:]]
+    monkeypatch.setattr(Auth, "get_auth_records", lambda: records)
+    monkeypatch.setattr(Auth, "get_authentication_data", lambda: sheet)
+    monkeypatch.setattr(Auth, "clear_auth_cache", lambda broadcast=False: None)
+
+
+def test_login_upgrades_legacy_hashes_in_the_background(monkeypatch):
+    sheet = FakeAuthSheet([["PASSWORD", "USERNAME"], [_legacy_hash("s3cret"), "Ada Obi"]])
+    _wire(monkeypatch, sheet)
+    started, release = threading.Event(), threading.Event()
+    upgrade = Auth._upgrade_password_hash
+
+    def slow_upgrade(username, password):
+        started.set()
+        release.wait(5)
+        upgrade(username, password)
+
+    monkeypatch.setattr(Auth, "_upgrade_password_hash", slow_upgrade)
+
+    assert Auth.verify_creds("ada obi", "s3cret") == (True, "Logged in successfully!")
+    # The login returned while the upgrade is still waiting to run.
+    assert started.wait(5) and sheet.updates == []
+    release.set()
+    Auth._upgrade_executor.submit(lambda: None).result(5)
+
+    [(row, col, value)] = sheet.updates
+    assert (row, col) == (2, 1)
+    assert value.startswith("pbkdf2_sha256$")
+
+
+def test_wrong_password_is_rejected(monkeypatch):
+    _wire(monkeypatch, FakeAuthSheet([["USERNAME", "PASSWORD"], ["Ada Obi", _legacy_hash("s3cret")]]))
+    assert Auth.verify_creds("Ada Obi", "nope") == (False, "Invalid username or password.")
+
+
+def test_busy_hash_pool_asks_the_user_to_retry(monkeypatch):
+    _wire(monkeypatch, FakeAuthSheet([["USERNAME", "PASSWORD"], ["Ada Obi", _legacy_hash("s3cret")]]))
+
+    def busy(*args):
+        raise HashPoolBusyError("saturated")
+
+    monkeypatch.setattr(Auth, "verify_password", busy)
+    monkeypatch.setattr(Auth, "hash_password", busy)
+    assert Auth.verify_creds("Ada Obi", "s3cret") == (False, Auth.BUSY_MESSAGE)
+    assert Auth.store_creds("Ben Eze", "s3cret") == (False, Auth.BUSY_MESSAGE)
+
+
+def test_failed_upgrade_is_logged_not_raised(monkeypatch, caplog):
+    sheet = FakeAuthSheet([["USERNAME"], ["Ada Obi"]])
+    _wire(monkeypatch, sheet)
+
+    Auth._upgrade_password_hash("Ada Obi", "s3cret")
+    assert sheet.updates == []
+    assert "Could not upgrade the password hash" in caplog.text
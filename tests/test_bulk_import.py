@@ -0,0 +1,99 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.Tools.bulk_import import IMPORT_COLUMNS, normalize_upload, validate_import
+from src.Tools.program_config import ProgramConfig
+
+PROGRAM = ProgramConfig(year=2026, worksheet="TRANSACTION", start_date=date(2026, 2, 23))
+TODAY = date(2026, 3, 9)  # week 9 is open
+
+
+def _upload(rows):
+    return pd.DataFrame(rows, columns=["Member", "Amount", "Date", "Week"])
+
+
+def _reasons(rejected):
+    return dict(zip(rejected["ROW"], rejected["REASON"]))
+
+
+def test_normalize_upload_accepts_aliases_and_rejects_missing_columns():
+    df = normalize_upload(_upload([["ada obi", "1000", "02/03/2026", "week 6"]]))
+    assert list(df.columns) == IMPORT_COLUMNS
+
+    with pytest.raises(ValueError, match="DATE"):
+        normalize_upload(pd.DataFrame({"NAME": ["Ada"], "AMOUNT PAID": ["1000"], "WEEK": ["week 6"]}))
+
+
+def test_valid_rows_are_accepted_in_sheet_format():
+    upload = _upload(
+        [
+            ["ada obi", "1,000", "02/03/2026", "Week 6"],
+            ["ada obi", "1000", "2026-03-09", "week 7"],
+        ]
+    )
+    accepted, rejected = validate_import(upload, PROGRAM, {}, set(), TODAY)
+
+    assert rejected.empty
+    assert accepted.to_dict("records") == [
+        {"NAME": "Ada Obi", "AMOUNT PAID": 1000.0, "DATE": "02/03/2026", "WEEK": "week 6"},
+        {"NAME": "Ada Obi", "AMOUNT PAID": 1000.0, "DATE": "09/03/2026", "WEEK": "week 7"},
+    ]
+
+
+def test_each_rule_rejects_with_a_reason():
+    upload = _upload(
+        [
+            ["", "1000", "02/03/2026", "week 6"],
+            ["Ben", "500", "02/03/2026", "week 6"],
+            ["Ben", "abc", "02/03/2026", "week 6"],
+            ["Cy", "1000", "not a date", "week 6"],
+            ["Cy", "1000", "01/01/2030", "week 6"],
+            ["Cy", "1000", "02/03/2026", "someday"],
+            ["Cy", "1000", "02/03/2026", "week 99"],
+            ["Cy", "1000", "02/03/2026", "week 12"],
+            ["Dee", "1000", "02/03/2026", "week 6"],
+            ["Eve", "1000", "02/03/2026", "week 6"],
+            ["Fay", "1000", "02/03/2026", "week 6"],
+            ["Fay", "1000", "02/03/2026", "week 6"],
+        ]
+    )
+    accepted, rejected = validate_import(upload, PROGRAM, {"Dee": {6}}, {("Eve", 6)}, TODAY)
+
+    assert accepted["NAME"].tolist() == ["Fay"]
+    assert _reasons(rejected) == {
+        2: "Missing name",
+        3: "Amount must be 1,000",
+        4: "Invalid amount",
+        5: "Invalid date",
+        6: "Date is in the future",
+        7: "Invalid week",
+        8: "Week is outside the program",
+        9: "Week is not open yet",
+        10: "Week already paid",
+        11: "Week already submitted (pending sync)",
+        13: "Duplicate row in file",
+    }
+    # Rejected rows keep what was uploaded.
+    assert rejected.loc[rejected["ROW"] == 3, "AMOUNT PAID"].item() == "500"
+
+
+def test_weeks_must_be_paid_in_schedule_order():
+    upload = _upload(
+        [
+            ["Ada", "1000", "02/03/2026", "week 8"],
+            ["Ben", "1000", "02/03/2026", "week 8"],
+            ["Ben", "1000", "02/03/2026", "week 7"],
+            ["Cy", "1000", "02/03/2026", "week 8"],
+        ]
+    )
+    paid = {"Ada": {6}, "Ben": {6}}
+    accepted, rejected = validate_import(upload, PROGRAM, paid, {("Cy", 6), ("Cy", 7)}, TODAY)
+
+    assert sorted(zip(accepted["NAME"], accepted["WEEK"])) == [
+        ("Ben", "week 7"),
+        ("Ben", "week 8"),
+        ("Cy", "week 8"),
+    ]
+    assert _reasons(rejected) == {2: "Week 7 is still unpaid"}
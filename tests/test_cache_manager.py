@@ -0,0 +1,149 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.Database import runtime
+from src.Database.cache_manager import RETIRED_VERSIONS_KEPT, CacheManager, get_cache_manager, sizeof
+
+
+def _array(kb: int) -> np.ndarray:
+    return np.zeros(kb * 1024, dtype=np.uint8)
+
+
+def test_sizeof_measures_frames_and_arrays():
+    assert sizeof(_array(4)) == 4096
+    frame = pd.DataFrame({"a": np.arange(100, dtype=np.int64)})
+    assert sizeof(frame) == frame.memory_usage(deep=True).sum()
+    assert sizeof({"x": _array(1), "y": [_array(1)]}) > 2048
+
+
+def test_get_and_put_track_hits_and_misses():
+    manager = CacheManager(max_bytes=1 << 20, namespace_max_bytes=1 << 20)
+    assert manager.get("fn", "k") == (False, None)
+    manager.put("fn", "k", "value")
+    assert manager.get("fn", "k") == (True, "value")
+
+    [row] = manager.stats()
+    assert (row["HITS"], row["MISSES"], row["ENTRIES"]) == (1, 1, 1)
+
+
+def test_namespace_budget_evicts_least_recently_used():
+    manager = CacheManager(max_bytes=1 << 20, namespace_max_bytes=10 * 1024)
+    manager.put("fn", "a", _array(4))
+    manager.put("fn", "b", _array(4))
+    manager.get("fn", "a")
+    manager.put("fn", "c", _array(4))
+
+    assert manager.get("fn", "b")[0] is False
+    assert manager.get("fn", "a")[0] and manager.get("fn", "c")[0]
+
+
+def test_global_budget_evicts_across_namespaces():
+    manager = CacheManager(max_bytes=10 * 1024, namespace_max_bytes=10 * 1024)
+    manager.put("one", "a", _array(4))
+    manager.put("two", "b", _array(4))
+    manager.put("three", "c", _array(4))
+
+    assert manager.get("one", "a")[0] is False
+    assert manager.total_bytes <= 10 * 1024
+
+
+def test_oversized_values_are_not_stored():
+    manager = CacheManager(max_bytes=1 << 20, namespace_max_bytes=1024)
+    manager.put("fn", "big", _array(2))
+    assert manager.get("fn", "big")[0] is False
+    assert manager.total_bytes == 0
+
+
+def test_tenant_budget():
+    manager = CacheManager(max_bytes=1 << 20, namespace_max_bytes=1 << 20)
+    for key in "abc":
+        manager.put("okafor/fn", key, _array(4), tenant="okafor", tenant_budget=10 * 1024)
+    manager.put("default/fn", "x", _array(4), tenant="default", tenant_budget=10 * 1024)
+
+    assert manager.tenant_bytes("okafor") <= 10 * 1024
+    assert manager.get("okafor/fn", "a")[0] is False
+    assert [row["TENANT"] for row in manager.stats("okafor")] == ["okafor"]
+
+
+def test_ttl_expires_entries(monkeypatch):
+    manager = CacheManager()
+    manager.put("fn", "k", "value")
+    stored = manager._entries[("fn", "k")]["stored_at"]
+    monkeypatch.setattr("src.Database.cache_manager.time.time", lambda: stored + 30)
+    assert manager.get("fn", "k", ttl=60)[0]
+    assert manager.get("fn", "k", ttl=10)[0] is False
+
+
+def test_observe_version_drops_stale_entries_and_refuses_retired_builds():
+    manager = CacheManager()
+    manager.put("fn", "old", "v1 value", scope="TRANSACTION", version="v1")
+    manager.observe_version("TRANSACTION", "v1")
+    assert manager.get("fn", "old")[0]
+
+    manager.put("fn", "new", "v2 value", scope="TRANSACTION", version="v2")
+    manager.observe_version("TRANSACTION", "v2")
+    assert manager.get("fn", "old")[0] is False
+    assert manager.get("fn", "new")[0]
+
+    # A slow build that finishes after v1 was retired is not stored.
+    manager.put("fn", "late", "v1 value", scope="TRANSACTION", version="v1")
+    assert manager.get("fn", "late")[0] is False
+    # Versions not observed yet are accepted.
+    manager.put("fn", "next", "v3 value", scope="TRANSACTION", version="v3")
+    assert manager.get("fn", "next")[0]
+
+
+def test_retired_versions_are_bounded():
+    manager = CacheManager()
+    for number in range(RETIRED_VERSIONS_KEPT + 3):
+        manager.observe_version("TRANSACTION", f"v{number}")
+
+    manager.put("fn", "oldest", "value", scope="TRANSACTION", version="v0")
+    assert manager.get("fn", "oldest")[0]
+
+
+def test_trim_and_clear():
+    manager = CacheManager()
+    for key in "abc":
+        manager.put("fn", key, key)
+    manager.put("other", "x", "x")
+
+    manager.trim_namespace("fn", 1)
+    assert [manager.get("fn", key)[0] for key in "abc"] == [False, False, True]
+    manager.clear("fn")
+    assert manager.get("fn", "c")[0] is False
+    assert manager.get("other", "x")[0]
+
+
+def test_concurrent_misses_build_once():
+    builds = []
+    start = threading.Barrier(8)
+
+    @runtime.MemoryCache().cache_data(ttl=60)
+    def slow_read(worksheet):
+        builds.append(worksheet)
+        time.sleep(0.05)
+        return {"rows": 3}
+
+    results = []
+
+    def session():
+        start.wait()
+        results.append(slow_read("TRANSACTION"))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == ["TRANSACTION"]
+    assert results == [{"rows": 3}] * 8
+    assert runtime._compute_locks == {}
+    [row] = [row for row in get_cache_manager().stats() if row["NAMESPACE"].endswith("slow_read")]
+    # Re-checks under the build lock are not counted twice.
+    assert row["HITS"] + row["MISSES"] == 8
+    slow_read.clear()
@@ -0,0 +1,65 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.Tools.charts import (
+    OVERSIZED_MESSAGE,
+    bar_chart,
+    figure_bytes,
+    heatmap_chart,
+    line_chart,
+    member_week_matrix,
+    page_count,
+    paginate,
+    top_n_with_others,
+)
+
+
+def test_top_n_folds_the_tail_into_others():
+    df = pd.DataFrame({"NAME": ["A", "B", "C", "D"], "TOTAL": [10.0, 30.0, 20.0, 5.0]})
+
+    top = top_n_with_others(df, "NAME", "TOTAL", n=2)
+
+    assert top["NAME"].tolist() == ["B", "C", "Others (2)"]
+    assert top["TOTAL"].tolist() == [30.0, 20.0, 15.0]
+    assert len(top_n_with_others(df, "NAME", "TOTAL", n=4)) == 4
+
+
+def test_pages_are_clamped():
+    df = pd.DataFrame({"N": range(60)})
+
+    assert page_count(60, 25) == 3
+    assert page_count(0, 25) == 1
+    assert paginate(df, 3, 25)["N"].tolist() == list(range(50, 60))
+    assert paginate(df, 99, 25)["N"].tolist() == list(range(50, 60))
+    assert paginate(df, 0, 25)["N"].iloc[0] == 0
+
+
+def test_member_week_matrix_ignores_unscheduled_weeks():
+    matrix = member_week_matrix({"Ben": {7}, "Ada": {6, 8, 99}}, [6, 7, 8])
+
+    assert matrix.index.tolist() == ["Ada", "Ben"]
+    assert matrix.to_numpy().tolist() == [[1, 0, 1], [0, 1, 0]]
+
+
+def test_large_lines_use_webgl_and_are_thinned_to_the_cap():
+    df = pd.DataFrame({"X": range(20000), "Y": range(20000)})
+
+    assert isinstance(line_chart(df, "X", "Y", "Inflow", "#000").data[0], go.Scattergl)
+    capped = line_chart(df, "X", "Y", "Inflow", "#000", max_bytes=20000)
+    assert figure_bytes(capped) <= 20000
+    assert len(capped.data[0].x) < len(df)
+    # The thinned line still ends on the latest point.
+    assert capped.data[0].x[-1] == 19999
+
+
+def test_oversized_bars_and_heatmaps_are_replaced():
+    df = pd.DataFrame({"NAME": [f"Member {i}" for i in range(500)], "TOTAL": range(500)})
+    matrix = member_week_matrix({f"Member {i}": {6} for i in range(500)}, list(range(6, 53)))
+
+    for fig in (
+        bar_chart(df, "NAME", "TOTAL", "Totals", "#000", max_bytes=5000),
+        heatmap_chart(matrix, "Weeks", ["#fff", "#000"], max_bytes=5000),
+    ):
+        assert not fig.data
+        assert fig.layout.annotations[0].text == OVERSIZED_MESSAGE
+    assert bar_chart(df.head(5), "NAME", "TOTAL", "Totals", "#000").data
@@ -0,0 +1,60 @@
+import pytest
+
+from src.Database.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitOpenError
+
+
+def _fail():
+    raise ConnectionError("sheet unavailable")
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("sheets", failure_threshold=2, cooldown_seconds=60)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == STATE_CLOSED
+
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "never called")
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("sheets", failure_threshold=2, cooldown_seconds=60)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.last_success > 0
+
+
+def test_probe_after_cooldown_closes_on_success(monkeypatch):
+    breaker = CircuitBreaker("sheets", failure_threshold=1, cooldown_seconds=60)
+    _trip(breaker)
+
+    now = breaker._opened_at + 61
+    monkeypatch.setattr("src.Database.circuit_breaker.time.time", lambda: now)
+    assert breaker.call(lambda: breaker.state) == STATE_HALF_OPEN
+    assert breaker.state == STATE_CLOSED
+
+
+def test_failed_probe_reopens(monkeypatch):
+    breaker = CircuitBreaker("sheets", failure_threshold=3, cooldown_seconds=60)
+    _trip(breaker)
+
+    now = breaker._opened_at + 61
+    monkeypatch.setattr("src.Database.circuit_breaker.time.time", lambda: now)
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "never called")
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Database.cache_manager import sizeof
+from src.Tools.data_clean import build_transaction_snapshot, clean_transaction_data, freeze_frame
+
+
+def _raw():
+    return pd.DataFrame(
+        {
+            "Name": [" ada obi", "BEN EZE", "Cy"],
+            "Amount Paid": ["1,000", "N1000", "n/a"],
+            "Date": ["02/03/2026", "09/03/2026", "2026-03-09"],
+            "Week": ["Week 7", "week 8 ", ""],
+        }
+    )
+
+
+def test_clean_transaction_data():
+    clean = clean_transaction_data(_raw())
+
+    assert clean["NAME"].tolist() == ["Ada Obi", "Ben Eze", "Cy"]
+    assert clean["AMOUNT PAID"].tolist()[:2] == [1000.0, 1000.0]
+    assert pd.isna(clean["AMOUNT PAID"].iloc[2])
+    assert pd.isna(clean["DATE"].iloc[2])
+    assert clean["WEEK"].tolist() == ["week 7", "week 8", ""]
+
+
+def test_snapshot_is_typed_and_read_only():
+    snapshot = build_transaction_snapshot(_raw())
+
+    assert snapshot["WEEK NUMBER"].tolist()[:2] == [7, 8]
+    assert snapshot["YEAR-MONTH"].tolist()[:2] == ["2026-03", "2026-03"]
+    assert str(snapshot["NAME"].dtype) == "string"
+    with pytest.raises(ValueError):
+        snapshot.loc[0, "AMOUNT PAID"] = 0.0
+    # Derived frames still work.
+    assert snapshot.assign(DOUBLE=snapshot["AMOUNT PAID"] * 2)["DOUBLE"].iloc[0] == 2000.0
+
+
+def test_freeze_frame_shares_memory_and_stays_measurable():
+    frame = pd.DataFrame({"AMOUNT PAID": np.arange(3.0), "NAME": ["Ada", "Ben", "Cy"]})
+    frozen = freeze_frame(frame)
+
+    assert np.shares_memory(frozen["AMOUNT PAID"].to_numpy(), frame["AMOUNT PAID"].to_numpy())
+    with pytest.raises(ValueError):
+        frozen.loc[0, "AMOUNT PAID"] = 5.0
+    assert sizeof(frozen) == frame.memory_usage(deep=True).sum()
+
+
+def test_sizeof_handles_read_only_object_arrays():
+    names = np.array(["Ada", "Ben", "Cy"], dtype=object)
+    names.flags.writeable = False
+    frame = pd.DataFrame({"NAME": names}, copy=False)
+
+    assert sizeof(frame) == sizeof(frame.copy())
@@ -0,0 +1,90 @@
+import pandas as pd
+
+from src.Tools.data_clean import build_transaction_snapshot
+from src.Tools.fund_summary import (
+    apply_contribution,
+    build_fund_summary,
+    build_member_payloads,
+    load_summary_file,
+    paid_weeks_from_bits,
+    save_summary_file,
+    summary_from_rows,
+    summary_path,
+    summary_to_rows,
+)
+from src.Tools.member_registry import MemberRegistry
+from src.Tools.program_config import PROGRAMS
+from src.Tools.tenants import TENANTS, TenantConfig, tenant_scope
+
+
+def _snapshot(*rows):
+    return build_transaction_snapshot(pd.DataFrame(list(rows), columns=["NAME", "AMOUNT PAID", "DATE", "WEEK"]))
+
+
+def test_build_matches_incremental_updates():
+    rows = [
+        ("Ada Obi", "1000", "02/03/2026", "week 7"),
+        ("Ben Eze", "1000", "02/03/2026", "week 7"),
+        ("Ada Obi", "1000", "09/03/2026", "week 8"),
+    ]
+    full = build_fund_summary(_snapshot(*rows), "v3")
+
+    summary = build_fund_summary(_snapshot(rows[0]), "v1")
+    apply_contribution(summary, "Ben Eze", 1000.0, 7, "2026-03", "v2")
+    apply_contribution(summary, "Ada Obi", 1000.0, 8, "2026-03", "v3")
+
+    assert summary == full
+    assert full["fund_total"] == 3000.0
+    assert full["fund_monthly"] == {"2026-03": 3000.0}
+    assert paid_weeks_from_bits(full["members"]["Ada Obi"]["paid_weeks"]) == {7, 8}
+
+
+def test_summary_rows_round_trip_and_reject_mixed_versions():
+    summary = build_fund_summary(
+        _snapshot(("Ada Obi", "1000", "02/03/2026", "week 7"), ("Ben Eze", "500", "28/02/2026", "week 6")), "v1"
+    )
+    rows = summary_to_rows(summary)
+
+    assert summary_from_rows(rows) == summary
+    rows[2][-1] = "v0"
+    assert summary_from_rows(rows) is None
+    assert summary_from_rows(rows[:1]) is None
+
+
+def test_member_payloads_rank_and_split_the_fund():
+    summary = build_fund_summary(
+        _snapshot(
+            ("Ada Obi", "3000", "02/03/2026", "week 7"),
+            ("Ben Eze", "1000", "02/03/2026", "week 7"),
+            ("Cy Udo", "1000", "02/03/2026", "week 7"),
+        ),
+        "v1",
+    )
+    payloads = build_member_payloads(summary, MemberRegistry(["Ben Eze", "Ada Obi"]))
+    by_name = {member["name"]: member for member in payloads["members"].values()}
+
+    assert payloads["member_count"] == 3
+    assert by_name["Ada Obi"]["rank"] == 1
+    assert by_name["Ada Obi"]["equity_pct"] == 60.0
+    assert by_name["Ben Eze"]["rank"] == by_name["Cy Udo"]["rank"] == 2
+    # Cy has no account, so they get an ID after the registered members.
+    assert by_name["Cy Udo"]["id"] > max(by_name["Ada Obi"]["id"], by_name["Ben Eze"]["id"])
+    assert by_name["Ada Obi"]["monthly"]["AMOUNT PAID"].tolist() == [3000.0]
+
+
+def test_summary_files_are_private_and_per_tenant(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.Tools.fund_summary.SUMMARY_DIR", tmp_path)
+    monkeypatch.setitem(TENANTS, "okafor", TenantConfig("okafor", "Okafor Family", "sheet", "sheet", PROGRAMS))
+    summary = {"version": "v1", "members": {}}
+
+    default_path = summary_path("TRANSACTION")
+    with tenant_scope("okafor"):
+        tenant_path = summary_path("TRANSACTION")
+    assert default_path != tenant_path
+    assert tenant_path.parent == tmp_path / "okafor"
+
+    save_summary_file(tenant_path, summary)
+    assert load_summary_file(tenant_path) == summary
+    assert tenant_path.stat().st_mode & 0o777 == 0o600
+    assert tenant_path.parent.stat().st_mode & 0o777 == 0o700
+    assert load_summary_file(default_path) is None
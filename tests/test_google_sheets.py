@@ -0,0 +1,208 @@
+import pytest
+
+from src.Database import GOOGLE_SHEETS as sheets
+
+HEADER = ["NAME", "AMOUNT PAID", "DATE", "WEEK"]
+
+
+def _log(*rows) -> list[list]:
+    return [HEADER, *[list(row) for row in rows]]
+
+
+def test_version_probe_reads_only_the_meta_row(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    workbook.add_worksheet("META", values=[["TRANSACTION_2027", "1-5", "rev0"], ["TRANSACTION", "5-30", "rev1"]])
+    sheets._get_workbook_layout()
+    workbook.calls.clear()
+
+    assert sheets._get_transaction_version("TRANSACTION") == "5-30|rev1"
+    assert workbook.calls == [("values_get", "META!A2:C2")]
+    # Repeated checks inside the probe TTL are served from cache.
+    assert sheets._get_transaction_version("TRANSACTION") == "5-30|rev1"
+    assert len(workbook.calls) == 1
+
+
+def test_missing_meta_falls_back_to_time_based_expiry(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log())
+
+    assert sheets._get_transaction_version("TRANSACTION").startswith("ttl-")
+
+
+def test_bump_creates_the_marker_and_changes_the_version(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+
+    sheets._bump_transaction_version("TRANSACTION")
+    fingerprint, revision = sheets._read_version_marker("TRANSACTION").split("|")
+    assert fingerprint == "8-50"
+    assert len(revision) == 32
+
+    sheets._bump_transaction_version("TRANSACTION")
+    assert sheets._read_version_marker("TRANSACTION") != f"{fingerprint}|{revision}"
+    assert [row[0] for row in workbook.sheets["META"].rows] == ["TRANSACTION"]
+
+
+def test_meta_rows_are_found_by_worksheet_name(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    workbook.add_worksheet("META", values=[["TRANSACTION", "5-30", "rev1"]])
+    sheets._get_workbook_layout()
+
+    # Someone sorts META so another partition's row now sits where ours was.
+    workbook.sheets["META"].rows.insert(0, ["TRANSACTION_2027", "1-5", "rev0"])
+    assert sheets._read_version_marker("TRANSACTION") == ""
+    assert sheets._read_version_marker("TRANSACTION") == "5-30|rev1"
+
+    sheets._bump_transaction_version("TRANSACTION")
+    assert workbook.sheets["META"].rows[0] == ["TRANSACTION_2027", "1-5", "rev0"]
+    assert workbook.sheets["META"].rows[1][2] != "rev1"
+
+
+def test_batch_read_supplies_the_version_without_a_probe(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    workbook.add_worksheet("META", values=[["TRANSACTION", "5-30", "rev1"]])
+
+    batch = sheets.fetch_workbook_batch()
+    workbook.calls.clear()
+
+    assert batch["version"] == "5-30|rev1"
+    assert sheets._get_transaction_version("TRANSACTION") == "5-30|rev1"
+    assert workbook.calls == []
+
+
+def test_reads_reuse_the_snapshot_until_the_version_moves(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    sheets._bump_transaction_version("TRANSACTION")
+
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi"]
+    reads = len(workbook.calls_to("values_batch_get"))
+    sheets.get_transaction_data()
+    assert len(workbook.calls_to("values_batch_get")) == reads
+
+    workbook.values_append("TRANSACTION!A1", body={"values": [["Ben Eze", "1000", "02/03/2026", "week 7"]]})
+    sheets._bump_transaction_version("TRANSACTION")
+    sheets.clear_transaction_cache(broadcast=True)
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi", "Ben Eze"]
+
+
+def test_cached_transaction_frames_are_frozen_and_measurable(workbook):
+    from src.Database.cache_manager import get_cache_manager, sizeof
+
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    sheets._bump_transaction_version("TRANSACTION")
+    version = sheets._get_transaction_version("TRANSACTION")
+
+    frame = sheets._get_transaction_data_cached("TRANSACTION", version)
+    assert frame["NAME"].dtype == object
+    assert sizeof(frame) > 0
+    assert get_cache_manager().total_bytes > 0
+
+    snapshot = sheets._get_transaction_snapshot_cached("TRANSACTION", version)
+    assert str(snapshot["NAME"].dtype) == "string"
+    with pytest.raises(ValueError):
+        snapshot.loc[0, "AMOUNT PAID"] = 0.0
+    assert sheets.get_transaction_data_status()["degraded"] is False
+
+
+def test_summary_failure_after_append_still_counts_as_delivered(workbook, monkeypatch):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    sheets._bump_transaction_version("TRANSACTION")
+    before = sheets._read_version_marker("TRANSACTION")
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi"]
+    workbook.calls.clear()
+
+    def broken(*args):
+        raise KeyError("WEEK")
+
+    monkeypatch.setattr(sheets, "_update_fund_summary", broken)
+    sheets._append_rows("TRANSACTION", [("Ben Eze", 1000.0, "week 7", "02/03/2026")])
+
+    assert workbook.calls_to("values_append") == [("values_append", "TRANSACTION!A1")]
+    assert sheets._read_version_marker("TRANSACTION") != before
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi", "Ben Eze"]
+
+
+def test_outage_serves_the_last_good_snapshot_read_only(workbook, monkeypatch):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    sheets._bump_transaction_version("TRANSACTION")
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi"]
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("sheet unavailable")
+
+    monkeypatch.setattr(workbook, "values_get", unavailable)
+    monkeypatch.setattr(workbook, "values_batch_get", unavailable)
+    sheets.clear_transaction_cache(broadcast=True)
+
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi"]
+    assert sheets.get_transaction_data_status()["degraded"] is True
+
+
+def test_auth_reads_fetch_transactions_only_when_the_version_moved(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    workbook.add_worksheet("AUTHENTICATION", values=[["USERNAME", "PASSWORD"], ["Ada Obi", "hash"]])
+    sheets._bump_transaction_version("TRANSACTION")
+    assert sheets.get_transaction_data()["NAME"].tolist() == ["Ada Obi"]
+    workbook.calls.clear()
+
+    batch = sheets.fetch_workbook_batch(include_auth=True, include_transactions=False)
+    assert batch["auth"] == [{"USERNAME": "Ada Obi", "PASSWORD": "hash"}]
+    assert "transactions" not in batch
+    (ranges,) = [call[1] for call in workbook.calls_to("values_batch_get")]
+    assert not any(r.startswith("TRANSACTION!") for r in ranges)
+
+    workbook.values_append("TRANSACTION!A1", body={"values": [["Ben Eze", "1000", "02/03/2026", "week 7"]]})
+    sheets._bump_transaction_version("TRANSACTION")
+    workbook.calls.clear()
+
+    batch = sheets.fetch_workbook_batch(include_auth=True, include_transactions=False)
+    assert batch["transactions"]["NAME"].tolist() == ["Ada Obi", "Ben Eze"]
+    assert len(workbook.calls_to("values_batch_get")) == 2
+    # The second batch seeded the cache, so the dashboard read is free.
+    workbook.calls.clear()
+    assert sheets._probe_transaction_version("TRANSACTION") == batch["version"]
+    assert sheets._read_transaction_frame("TRANSACTION", batch["version"])["NAME"].tolist() == ["Ada Obi", "Ben Eze"]
+    assert workbook.calls == []
+
+
+def test_append_publishes_the_summary_incrementally(workbook):
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    workbook.add_worksheet("TRANSACTION_SUMMARY", values=[])
+    sheets._bump_transaction_version("TRANSACTION")
+    sheets.rebuild_fund_summary()
+    workbook.calls.clear()
+
+    sheets._append_rows("TRANSACTION", [("Ben Eze", 1000.0, "week 7", "02/03/2026")])
+
+    # Published through the META row's revision cell; no separate bump.
+    writes = [call for call in workbook.calls if call[0] in ("values_update", "values_append")]
+    assert writes == [("values_append", "TRANSACTION!A1")]
+    assert len(workbook.calls_to("values_batch_update")) == 1
+    summary = sheets.get_fund_summary()
+    assert summary["version"] == sheets._read_version_marker("TRANSACTION")
+    assert set(summary["members"]) == {"Ada Obi", "Ben Eze"}
+
+
+def test_redelivery_after_a_lost_acknowledgement_does_not_double_post(workbook, monkeypatch, tmp_path):
+    from src.Database.outbox import SubmissionOutbox
+
+    workbook.add_worksheet("TRANSACTION", values=_log(["Ada Obi", "1000", "02/03/2026", "week 7"]))
+    sheets._bump_transaction_version("TRANSACTION")
+    outbox = SubmissionOutbox(tmp_path / "outbox.sqlite3")
+    outbox.enqueue("TRANSACTION", "Ben Eze", 1000, "week 7", "02/03/2026")
+    append = workbook.values_append
+
+    def lands_then_times_out(range_name, params=None, body=None):
+        append(range_name, params=params, body=body)
+        if range_name.startswith("TRANSACTION!"):
+            raise TimeoutError("read timed out")
+
+    monkeypatch.setattr(workbook, "values_append", lands_then_times_out)
+    assert outbox.replay(sheets._deliver_submission, sheets._delivered_submission_keys) == 0
+    assert outbox.pending_count() == 1
+
+    monkeypatch.setattr(workbook, "values_append", append)
+    outbox._connect().execute("UPDATE submissions SET next_attempt = 0")
+    outbox.replay(sheets._deliver_submission, sheets._delivered_submission_keys)
+
+    names = [row[0] for row in workbook.sheets["TRANSACTION"].rows[1:]]
+    assert names == ["Ada Obi", "Ben Eze"]
+    assert outbox.pending_count() == 0
@@ -0,0 +1,52 @@
+import sqlite3
+import time
+
+from src.Database import invalidation
+from src.Database.invalidation import NullInvalidationBus, SQLiteInvalidationBus
+
+
+def test_replicas_see_each_others_events_once(tmp_path):
+    path = tmp_path / "bus.sqlite3"
+    writer, reader = SQLiteInvalidationBus(path), SQLiteInvalidationBus(path)
+
+    writer.publish("transactions")
+    assert reader.poll("transactions")
+    assert not reader.poll("transactions")
+    assert not reader.poll("auth")
+
+
+def test_own_events_are_ignored(tmp_path):
+    bus = SQLiteInvalidationBus(tmp_path / "bus.sqlite3")
+    bus.publish("transactions")
+    assert not bus.poll("transactions")
+
+
+def test_events_before_start_are_ignored(tmp_path):
+    path = tmp_path / "bus.sqlite3"
+    SQLiteInvalidationBus(path).publish("transactions")
+    assert not SQLiteInvalidationBus(path).poll("transactions")
+
+
+def test_old_events_are_pruned(tmp_path, monkeypatch):
+    path = tmp_path / "bus.sqlite3"
+    bus = SQLiteInvalidationBus(path)
+    bus.publish("transactions")
+
+    later = time.time() + invalidation.EVENT_RETENTION_SECONDS + 1
+    monkeypatch.setattr("src.Database.invalidation.time.time", lambda: later)
+    bus.publish("auth")
+    topics = [row[0] for row in sqlite3.connect(path).execute("SELECT topic FROM events")]
+    assert topics == ["auth"]
+
+
+def test_bus_errors_never_reach_callers(monkeypatch):
+    class BrokenBus(NullInvalidationBus):
+        def publish(self, topic):
+            raise sqlite3.OperationalError("database is locked")
+
+        def poll(self, topic):
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(invalidation, "_bus", BrokenBus())
+    invalidation.publish_invalidation("transactions")
+    assert invalidation.has_pending_invalidation("transactions") is False
@@ -0,0 +1,44 @@
+from src.Tools.leaderboard import DENSE, Leaderboard
+
+
+def test_ranks_with_ties():
+    board = Leaderboard({0: 3000, 1: 2000, 2: 2000, 3: 1000})
+
+    assert [board.rank(key) for key in range(4)] == [1, 2, 2, 4]
+    assert [board.rank(key, DENSE) for key in range(4)] == [1, 2, 2, 3]
+    assert board.rank(9) is None
+
+
+def test_add_moves_a_member_and_records_the_version():
+    board = Leaderboard({0: 3000, 1: 2000}, labels={0: "Ada Obi", 1: "Ben Eze"})
+    board.add(1, 1500, version="v2")
+
+    assert board.total(1) == 3500
+    assert board.rank(1) == 1 and board.rank(0) == 2
+    assert board.version == "v2"
+    assert len(board) == 2
+
+
+def test_add_registers_new_members_with_a_label():
+    board = Leaderboard()
+    board.add(5, 1000, label="Cy Ade")
+
+    assert 5 in board
+    assert board.label(5) == "Cy Ade"
+    assert board.top(1) == [{"RANK": 1, "NAME": "Cy Ade", "AMOUNT PAID": 1000.0}]
+
+
+def test_top_and_rows_use_labels_and_rank_order():
+    board = Leaderboard({0: 1000, 1: 3000, 2: 3000}, labels={0: "Ada", 1: "Ben", 2: "Cy"})
+
+    assert board.top(2) == [
+        {"RANK": 1, "NAME": "Ben", "AMOUNT PAID": 3000.0},
+        {"RANK": 1, "NAME": "Cy", "AMOUNT PAID": 3000.0},
+    ]
+    assert [row["RANK"] for row in board.rows(DENSE)] == [1, 1, 2]
+
+
+def test_names_work_as_keys():
+    board = Leaderboard({"Ada": 1000})
+    board.add("Ben", 2000)
+    assert board.top(1)[0]["NAME"] == "Ben"
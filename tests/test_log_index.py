@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from src.Tools.data_clean import build_transaction_snapshot
+from src.Tools.log_index import LOG_COLUMNS, LogIndex
+from src.Tools.member_registry import MemberRegistry
+
+
+@pytest.fixture
+def index():
+    raw = pd.DataFrame(
+        {
+            "NAME": ["ada obi", "Ben Eze", "Ada Obi", "Zed", "Ben Eze"],
+            "AMOUNT PAID": ["1000", "1,000", "1000", "1000", "oops"],
+            "DATE": ["23/02/2026", "02/03/2026", "02/03/2026", "09/03/2026", "09/03/2026"],
+            "WEEK": ["week 6", "week 7", "Week 7", "week 8", "week 8"],
+        }
+    )
+    return LogIndex(build_transaction_snapshot(raw), "v1", MemberRegistry(["Ada Obi", "Ben Eze"]))
+
+
+def test_rows_are_sorted_newest_first(index):
+    # The row with no readable amount is dropped.
+    assert len(index) == 4
+    assert index.frame["DATE"].is_monotonic_decreasing
+    assert index.frame["NAME"].tolist() == ["Zed", "Ada Obi", "Ben Eze", "Ada Obi"]
+
+
+def test_members_and_weeks(index):
+    assert index.members == ["Ada Obi", "Ben Eze", "Zed"]
+    assert index.weeks == [6, 7, 8]
+    assert index.registry.unmatched == ["Zed"]
+
+
+def test_query_by_member_week_and_search(index):
+    assert index.rows(index.query(member="ada obi"))["WEEK"].tolist() == ["week 7", "week 6"]
+    assert index.rows(index.query(week=7))["NAME"].tolist() == ["Ada Obi", "Ben Eze"]
+    assert index.rows(index.query(member="Ben Eze", week=6)).empty
+    assert index.rows(index.query(search="23/02"))["NAME"].tolist() == ["Ada Obi"]
+    assert len(index.query(member="Nobody")) == 0
+
+
+def test_page_formats_dates(index):
+    positions = index.query()
+    page = index.page(positions, page=2, page_size=3)
+
+    assert list(page.columns) == LOG_COLUMNS
+    assert page.to_dict("records") == [{"NAME": "Ada Obi", "AMOUNT PAID": 1000.0, "DATE": "23/02/2026", "WEEK": "week 6"}]
+    assert index.page(positions, page=9, page_size=3).empty
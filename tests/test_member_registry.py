@@ -0,0 +1,68 @@
+import pickle
+
+import pandas as pd
+
+from src.Tools.member_registry import UNMATCHED, MemberCoverage, MemberRegistry, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name("  ada OBI ") == "Ada Obi"
+    assert normalize_name(None) == ""
+
+
+def test_ids_follow_sheet_order_and_skip_admin():
+    registry = MemberRegistry(["ada obi", "Admin", "Ben Eze", "ADA OBI"])
+
+    assert registry.names == ["Ada Obi", "Ben Eze"]
+    assert registry.id_of(" ben eze") == 1
+    assert registry.id_of("Nobody") == UNMATCHED
+    assert registry.name_of(0) == "Ada Obi"
+    assert "ada obi" in registry
+
+
+def test_extend_adds_unmatched_names_without_changing_the_original():
+    registry = MemberRegistry(["Ada Obi"])
+    extended = registry.extend(["Zed", "ada obi", "Cy"])
+
+    assert len(registry) == 1
+    assert extended.names == ["Ada Obi", "Zed", "Cy"]
+    assert extended.unmatched == ["Zed", "Cy"]
+    assert extended.is_registered(0) and not extended.is_registered(1)
+
+
+def test_equal_names_compare_equal_and_survive_pickling():
+    registry = MemberRegistry(["Ada Obi", "Ben Eze"]).extend(["Cy"])
+    same = MemberRegistry(["ada obi", "ben eze"]).extend(["cy"])
+
+    assert registry == same and hash(registry) == hash(same)
+    assert registry != MemberRegistry(["Ada Obi", "Ben Eze", "Cy"])
+
+    restored = pickle.loads(pickle.dumps(registry))
+    assert restored == registry
+    assert restored.unmatched == ["Cy"]
+
+
+def test_ids_of_maps_a_column():
+    registry = MemberRegistry(["Ada Obi", "Ben Eze"])
+    ids = registry.ids_of(pd.Series(["Ben Eze", "Ada Obi", "Nobody", None, "Ben Eze"]))
+    assert ids.tolist() == [1, 0, UNMATCHED, UNMATCHED, 1]
+
+
+def test_member_coverage():
+    registry = MemberRegistry(["Ben Eze", "Ada Obi"])
+    summary = {
+        "version": "v1",
+        "members": {
+            "Ben Eze": {"total": 2000.0, "paid_weeks": 0b011},
+            "Ada Obi": {"total": 1000.0, "paid_weeks": 0b100},
+            "Zed": {"total": 1000.0, "paid_weeks": 0b001},
+        },
+    }
+    coverage = MemberCoverage(summary, registry)
+
+    assert coverage.version == "v1"
+    assert coverage.unmatched == ["Zed"]
+    assert [coverage.name_of(i) for i in coverage.member_ids] == ["Ada Obi", "Ben Eze", "Zed"]
+    assert coverage.totals[registry.id_of("Ben Eze")] == 2000.0
+    assert [coverage.name_of(i) for i in coverage.paying(0b001)] == ["Ben Eze", "Zed"]
+    assert coverage.combined_bits(0b110) == 0b110
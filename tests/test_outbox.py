@@ -0,0 +1,107 @@
+import sqlite3
+import time
+
+from src.Database.outbox import STATUS_SENT, SubmissionOutbox, idempotency_key
+
+
+def _outbox(tmp_path, **kwargs):
+    return SubmissionOutbox(tmp_path / "outbox.sqlite3", **kwargs)
+
+
+def test_enqueue_is_idempotent_per_partition_member_and_week(tmp_path):
+    outbox = _outbox(tmp_path)
+    assert outbox.enqueue("TRANSACTION", "ada obi", 1000, "Week 7", "02/03/2026")
+    assert not outbox.enqueue("TRANSACTION", " Ada Obi ", 1000, "week 7", "02/03/2026")
+    assert outbox.enqueue("TRANSACTION_2027", "Ada Obi", 1000, "week 7", "01/03/2027")
+
+    assert outbox.pending_weeks("TRANSACTION", "ADA OBI") == ["week 7"]
+    assert outbox.pending_entries("TRANSACTION_2027") == [("Ada Obi", "week 7")]
+    assert outbox.pending_count() == 2
+
+
+def test_replay_delivers_and_marks_sent(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+    delivered = []
+
+    assert outbox.replay(lambda *entry: delivered.append(entry)) == 1
+    assert delivered == [("TRANSACTION", "Ada Obi", 1000.0, "week 7", "02/03/2026")]
+    assert outbox.pending_count() == 0
+    # A sent entry still blocks a duplicate until the sheet shows it.
+    assert not outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+
+
+def test_failed_delivery_backs_off(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+
+    def fail(*entry):
+        raise ConnectionError("sheet unavailable")
+
+    assert outbox.replay(fail) == 0
+    assert outbox.pending_count() == 1
+    # Not due again until the backoff passes.
+    assert outbox.replay(lambda *entry: None) == 0
+
+
+def test_already_delivered_entries_are_not_rewritten(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+    key = idempotency_key("TRANSACTION", "Ada Obi", "week 7")
+    delivered = []
+
+    sent = outbox.replay(lambda *entry: delivered.append(entry), lambda partitions: {key})
+    assert sent == 0
+    assert delivered == []
+    assert outbox.pending_count() == 0
+
+
+def test_sent_entries_are_pruned_once_the_sheet_shows_them(tmp_path):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+    outbox.replay(lambda *entry: None)
+    key = idempotency_key("TRANSACTION", "Ada Obi", "week 7")
+
+    seen = []
+    outbox.replay(lambda *entry: None, lambda partitions: seen.append(partitions) or {key})
+    assert seen == [{"TRANSACTION"}]
+    assert outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+
+
+def test_stale_sent_entries_expire(tmp_path, monkeypatch):
+    outbox = _outbox(tmp_path)
+    outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+    outbox.replay(lambda *entry: None)
+
+    later = time.time() + 2 * 3600
+    monkeypatch.setattr("src.Database.outbox.time.time", lambda: later)
+    outbox.replay(lambda *entry: None, lambda partitions: set())
+    assert outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+
+
+def test_legacy_journal_is_migrated_to_the_legacy_partition(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE submissions ("
+        "key TEXT PRIMARY KEY, name TEXT NOT NULL, amount REAL NOT NULL, week TEXT NOT NULL, "
+        "date_str TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+        "next_attempt REAL NOT NULL DEFAULT 0, claimed_until REAL NOT NULL DEFAULT 0, "
+        "last_error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO submissions (key, name, amount, week, date_str, status, created, updated) "
+        "VALUES ('Ada Obi|week 7', 'Ada Obi', 1000, 'week 7', '02/03/2026', 'pending', 0, 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    outbox = SubmissionOutbox(path, legacy_partition="TRANSACTION")
+    assert outbox.pending_entries("TRANSACTION") == [("Ada Obi", "week 7")]
+    assert not outbox.enqueue("TRANSACTION", "Ada Obi", 1000, "week 7", "02/03/2026")
+
+    delivered = []
+    outbox.replay(lambda *entry: delivered.append(entry))
+    assert delivered[0][0] == "TRANSACTION"
+    status = outbox._connect().execute("SELECT status FROM submissions").fetchone()[0]
+    assert status == STATUS_SENT
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from src.Tools import password_hashing
+from src.Tools.password_hashing import (
+    PBKDF2_ALGORITHM,
+    SCRYPT_ALGORITHM,
+    HashPoolBusyError,
+    _legacy_hash,
+    hash_password_sync,
+    needs_rehash,
+    set_hash_workers,
+    verify_password,
+    verify_password_sync,
+)
+
+
+@pytest.mark.parametrize("algorithm, cost", [(PBKDF2_ALGORITHM, 1000), (SCRYPT_ALGORITHM, 10)])
+def test_hashes_verify_and_are_salted(algorithm, cost):
+    stored = hash_password_sync("s3cret", algorithm=algorithm, cost=cost)
+
+    assert stored.startswith(f"{algorithm}${cost}$")
+    assert verify_password_sync("s3cret", stored)
+    assert not verify_password_sync("wrong", stored)
+    assert stored != hash_password_sync("s3cret", algorithm=algorithm, cost=cost)
+
+
+def test_legacy_hashes_still_verify_and_need_a_rehash():
+    stored = _legacy_hash("s3cret")
+    assert verify_password_sync("s3cret", stored)
+    assert needs_rehash(stored)
+
+
+def test_needs_rehash_follows_the_configured_cost(monkeypatch):
+    monkeypatch.setattr(password_hashing, "PASSWORD_KDF", PBKDF2_ALGORITHM)
+    monkeypatch.setattr(password_hashing, "PBKDF2_ITERATIONS", 2000)
+
+    assert needs_rehash(hash_password_sync("s3cret", algorithm=PBKDF2_ALGORITHM, cost=1000))
+    assert not needs_rehash(hash_password_sync("s3cret", algorithm=PBKDF2_ALGORITHM, cost=2000))
+    assert needs_rehash(hash_password_sync("s3cret", algorithm=SCRYPT_ALGORITHM, cost=10))
+
+
+@pytest.mark.parametrize("stored", ["", "pbkdf2_sha256$x$y$z", "scrypt$14$8$1$%%%$abc", "unknown$1$2"])
+def test_malformed_hashes_never_verify(stored):
+    assert not verify_password_sync("s3cret", stored)
+
+
+def test_saturated_pool_raises_busy(monkeypatch):
+    set_hash_workers(1)
+    monkeypatch.setattr(password_hashing, "HASH_TIMEOUT_SECONDS", 0.05)
+    release = threading.Event()
+    blocker = password_hashing._get_executor().submit(release.wait, 5)
+    try:
+        with pytest.raises(HashPoolBusyError):
+            verify_password("s3cret", _legacy_hash("s3cret"))
+    finally:
+        release.set()
+        blocker.result(5)
+    assert verify_password("s3cret", _legacy_hash("s3cret"))
@@ -0,0 +1,54 @@
+from datetime import date
+
+from src.Tools import projection
+from src.Tools.fund_summary import week_bits
+from src.Tools.program_config import ProgramConfig
+from src.Tools.projection import project_fund
+
+PROGRAM = ProgramConfig(
+    year=2030,
+    worksheet="TRANSACTION_2030",
+    start_date=date(2030, 1, 7),
+    start_week=1,
+    legacy_week=None,
+    total_weeks=10,
+    target_fund=20000.0,
+)
+
+
+def _summary(*paid_weeks):
+    members = {
+        f"Member {i}": {"total": 1000.0 * len(weeks), "entries": len(weeks), "paid_weeks": week_bits(weeks), "monthly": {}}
+        for i, weeks in enumerate(paid_weeks)
+    }
+    return {"fund_total": sum(m["total"] for m in members.values()), "members": members}
+
+
+def test_fully_paid_fund_is_certain():
+    result = project_fund(_summary(range(1, 11), range(1, 11)), PROGRAM, open_week=5, paths=500)
+
+    assert result["probability"] == 1.0
+    assert result["expected_shortfall"] == 0.0
+    assert result["p10"] == result["p90"] == 20000.0
+
+
+def test_projection_is_bounded_and_reproducible():
+    summary = _summary(range(1, 6), [1, 3], [])
+    result = project_fund(summary, PROGRAM, open_week=5, paths=2000)
+
+    # Nothing paid can be lost and no member can pay more than they still owe.
+    assert summary["fund_total"] <= result["p10"] <= result["p50"] <= result["p90"] <= 30000.0
+    assert 0.0 <= result["probability"] < 1.0
+    assert result["expected_shortfall"] > 0.0
+    assert project_fund(summary, PROGRAM, open_week=5, paths=2000) == result
+
+
+def test_chunked_draws_cover_every_path(monkeypatch):
+    monkeypatch.setattr(projection, "PROJECTION_CHUNK_CELLS", 7)
+    summary = _summary(range(1, 6), [1, 3], [])
+
+    result = project_fund(summary, PROGRAM, open_week=5, paths=101)
+
+    assert result["paths"] == 101
+    # A path left undrawn would sit at the current total.
+    assert result["p10"] > summary["fund_total"]
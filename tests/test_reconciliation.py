@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from src.Tools.data_clean import clean_transaction_data
+from src.Tools.reconciliation import (
+    AMOUNT_MISMATCH,
+    MATCHED,
+    MISSING_IN_BANK,
+    MISSING_IN_LOG,
+    RESULT_COLUMNS,
+    UNREADABLE,
+    normalize_statement,
+    reconcile,
+)
+
+
+def _log(rows):
+    return clean_transaction_data(pd.DataFrame(rows, columns=["NAME", "AMOUNT PAID", "DATE", "WEEK"]))
+
+
+def _statuses(result):
+    return sorted(zip(result["STATUS"], result["NAME"]))
+
+
+def test_normalize_statement_uses_column_aliases():
+    statement = pd.DataFrame({"Payer": ["ada obi"], "Credit": ["1,000"], "Value Date": ["2026-03-02"]})
+    bank = normalize_statement(statement)
+
+    assert bank.to_dict("records") == [
+        {"NAME": "Ada Obi", "AMOUNT PAID": 1000.0, "DATE": pd.Timestamp("2026-03-02")}
+    ]
+    with pytest.raises(ValueError, match="AMOUNT PAID"):
+        normalize_statement(pd.DataFrame({"NAME": ["Ada"], "DATE": ["02/03/2026"]}))
+
+
+# Mixed statuses leave all-NA columns per status; the concat must not warn.
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_reconcile_classifies_every_line():
+    statement = pd.DataFrame(
+        {
+            "Payer": ["ada obi", "Ben", "Eve", "Cy", "Fay"],
+            "Credit": ["1000", "500", "1000", "1000", "abc"],
+            "Date": ["03/03/2026", "02/03/2026", "02/03/2026", "2026-03-10", "02/03/2026"],
+        }
+    )
+    log = _log(
+        [
+            ["Ada Obi", "1000", "02/03/2026", "week 7"],
+            ["Ben", "1000", "02/03/2026", "week 7"],
+            ["Cy", "1000", "03/03/2026", "week 7"],
+            ["Dee", "1000", "04/03/2026", "week 7"],
+        ]
+    )
+    result = reconcile(statement, log)
+
+    assert list(result.columns) == RESULT_COLUMNS
+    assert _statuses(result) == [
+        (AMOUNT_MISMATCH, "Ben"),
+        (MATCHED, "Ada Obi"),
+        (MISSING_IN_BANK, "Cy"),
+        (MISSING_IN_BANK, "Dee"),
+        (MISSING_IN_LOG, "Cy"),
+        (MISSING_IN_LOG, "Eve"),
+        (UNREADABLE, "Fay"),
+    ]
+    matched = result[result["STATUS"] == MATCHED].iloc[0]
+    assert (matched["DAYS APART"], matched["LOG WEEK"]) == (1, "week 7")
+    mismatch = result[result["STATUS"] == AMOUNT_MISMATCH].iloc[0]
+    assert (mismatch["BANK AMOUNT"], mismatch["LOG AMOUNT"]) == (500.0, 1000.0)
+
+
+def test_each_log_entry_matches_one_bank_line_closest_date_first():
+    statement = pd.DataFrame(
+        {"NAME": ["Ada", "Ada"], "AMOUNT": ["1000", "1000"], "DATE": ["02/03/2026", "09/03/2026"]}
+    )
+    log = _log([["Ada", "1000", "08/03/2026", "week 8"], ["Ada", "1000", "02/03/2026", "week 7"]])
+    result = reconcile(statement, log)
+
+    assert result["STATUS"].tolist() == [MATCHED, MATCHED]
+    assert sorted(zip(result["LOG WEEK"], result["DAYS APART"])) == [("week 7", 0), ("week 8", 1)]
+
+
+def test_log_entries_outside_the_statement_period_are_ignored():
+    statement = pd.DataFrame({"NAME": ["Ada"], "AMOUNT": ["1000"], "DATE": ["02/03/2026"]})
+    log = _log([["Ada", "1000", "02/03/2026", "week 7"], ["Ben", "1000", "23/02/2026", "week 6"]])
+
+    assert reconcile(statement, log)["STATUS"].tolist() == [MATCHED]
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.Tools.data_clean import build_transaction_snapshot
+from src.Tools.program_config import ProgramConfig
+from src.Tools.returns_allocation import ALLOCATION_COLUMNS, allocate_returns, parse_return_events
+
+PROGRAM = ProgramConfig(year=2030, worksheet="TRANSACTION_2030", start_date=date(2030, 1, 7), start_week=1)
+
+
+def _snapshot(*rows):
+    return build_transaction_snapshot(pd.DataFrame(list(rows), columns=["NAME", "AMOUNT PAID", "DATE", "WEEK"]))
+
+
+def test_parse_return_events_groups_by_program_week():
+    rows = [
+        ["DATE", "AMOUNT", "NOTE"],
+        ["28/01/2030", "200", "T-bill"],
+        ["29/01/2030", "1,000"],
+        ["bad date", "50", ""],
+        ["04/02/2030", "n/a", ""],
+    ]
+
+    assert parse_return_events(rows, PROGRAM) == ((4, 1200.0),)
+    assert parse_return_events([["WHEN", "AMOUNT"], ["28/01/2030", "1"]], PROGRAM) == ()
+
+
+def test_returns_follow_capital_weeks():
+    snapshot = _snapshot(["Ada Obi", "1000", "07/01/2030", "week 1"], ["Ben Eze", "1000", "21/01/2030", "week 1"])
+
+    allocation = allocate_returns(snapshot, ((4, 300.0),), PROGRAM).set_index("NAME")
+
+    # Ada held 1000 for four weeks, Ben (who paid late) for two.
+    assert allocation.loc["Ada Obi", "CAPITAL WEEKS"] == 4000.0
+    assert allocation.loc["Ben Eze", "CAPITAL WEEKS"] == 2000.0
+    assert allocation.loc["Ada Obi", "RETURNS"] == pytest.approx(200.0)
+    assert allocation.loc["Ben Eze", "RETURNS"] == pytest.approx(100.0)
+    assert allocation["SHARE %"].sum() == pytest.approx(100.0)
+
+
+def test_earlier_returns_compound_for_the_members_who_earned_them():
+    snapshot = _snapshot(["Ada Obi", "1000", "07/01/2030", "week 1"], ["Ben Eze", "1000", "21/01/2030", "week 1"])
+
+    allocation = allocate_returns(snapshot, ((2, 100.0), (4, 300.0)), PROGRAM).set_index("NAME")
+
+    assert allocation["RETURNS"].sum() == pytest.approx(400.0)
+    # Ben held nothing before week 3, so the first return is all Ada's. Both
+    # hold 1000 over weeks 3-4, but Ada's earlier return weighs in too.
+    assert allocation.loc["Ada Obi", "RETURNS"] == pytest.approx(100.0 + 300.0 * 2200 / 4200)
+
+
+def test_empty_log_allocates_nothing():
+    assert allocate_returns(_snapshot(), ((4, 300.0),), PROGRAM).columns.tolist() == ALLOCATION_COLUMNS
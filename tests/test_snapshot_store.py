@@ -0,0 +1,97 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from src.Database import snapshot_store
+from src.Database.snapshot_store import (
+    KIND_JSON,
+    KIND_PARQUET,
+    NullSnapshotStore,
+    SQLiteSnapshotStore,
+    decode_value,
+    encode_value,
+)
+
+
+def test_frames_round_trip_as_parquet_and_the_rest_as_json():
+    frame = pd.DataFrame({"NAME": ["Ada Obi"], "AMOUNT PAID": [1000.0]})
+    kind, payload = encode_value(frame)
+    assert kind == KIND_PARQUET
+    pd.testing.assert_frame_equal(decode_value(kind, payload), frame)
+
+    assert decode_value(*encode_value("12-80|rev1")) == "12-80|rev1"
+    assert encode_value(["x"])[0] == KIND_JSON
+    with pytest.raises(TypeError):
+        encode_value(object())
+    with pytest.raises(ValueError):
+        decode_value("pickle", b"")
+
+
+def test_store_files_are_private(tmp_path):
+    SQLiteSnapshotStore(tmp_path / "store" / "snapshots.sqlite3")
+    assert (tmp_path / "store" / "snapshots.sqlite3").stat().st_mode & 0o777 == 0o600
+
+
+def test_get_or_refresh_loads_once_per_version(tmp_path):
+    store = SQLiteSnapshotStore(tmp_path / "snapshots.sqlite3")
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"rows": len(loads)}
+
+    assert store.get_or_refresh("k", loader, version="v1") == {"rows": 1}
+    assert store.get_or_refresh("k", loader, version="v1") == {"rows": 1}
+    assert store.get_or_refresh("k", loader, version="v2") == {"rows": 2}
+    assert store.get("k")[0] == "v2"
+
+
+def test_max_age_expires_entries(tmp_path, monkeypatch):
+    store = SQLiteSnapshotStore(tmp_path / "snapshots.sqlite3")
+    store.put("k", "old")
+    updated = store.get("k")[2]
+
+    monkeypatch.setattr("src.Database.snapshot_store.time.time", lambda: updated + 5)
+    assert store.get_or_refresh("k", lambda: "new", max_age=10) == "old"
+    monkeypatch.setattr("src.Database.snapshot_store.time.time", lambda: updated + 11)
+    assert store.get_or_refresh("k", lambda: "new", max_age=10) == "new"
+
+
+def test_replicas_share_one_refresh(tmp_path):
+    path = tmp_path / "snapshots.sqlite3"
+    replicas = [SQLiteSnapshotStore(path) for _ in range(4)]
+    started, release = threading.Event(), threading.Event()
+    loads, results = [], []
+
+    def loader():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return "frame"
+
+    def read(store):
+        results.append(store.get_or_refresh("k", loader, version="v1"))
+
+    first = threading.Thread(target=read, args=(replicas[0],))
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=read, args=(store,)) for store in replicas[1:]]
+    for thread in others:
+        thread.start()
+    release.set()
+    for thread in [first, *others]:
+        thread.join(10)
+
+    assert loads == [1]
+    assert results == ["frame"] * 4
+
+
+def test_store_errors_fall_back_to_the_loader(monkeypatch):
+    class BrokenStore(NullSnapshotStore):
+        def get(self, key):
+            raise ValueError("corrupt parquet")
+
+    monkeypatch.setattr(snapshot_store, "_store", BrokenStore())
+    assert snapshot_store.shared_snapshot("k", lambda: "fresh") == "fresh"
+    assert snapshot_store.peek_snapshot("k") is None
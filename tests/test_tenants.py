@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+from src.Database import runtime
+from src.Tools import tenants
+from src.Tools.program_config import get_active_program, list_programs
+from src.Tools.tenants import (
+    DEFAULT_TENANT,
+    TENANTS,
+    count,
+    current_tenant,
+    tenant_bound,
+    tenant_key,
+    tenant_metrics,
+    tenant_scope,
+)
+
+
+@pytest.fixture
+def okafor(tmp_path, monkeypatch):
+    monkeypatch.setattr(tenants, "TENANTS", dict(TENANTS))
+    path = tmp_path / "tenants.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "slug": " Okafor ",
+                    "sheet_id": "okafor-sheet",
+                    "programs": [{"year": 2027, "start_date": "2027-02-22"}],
+                    "cache_mb": 32,
+                }
+            ]
+        ),
+        encoding="utf-8",
+    )
+    tenants._load_tenants_file(path)
+    return tenants.TENANTS["okafor"]
+
+
+def test_tenants_file_defaults(okafor):
+    assert okafor.label == "Okafor"
+    assert okafor.auth_sheet_id == "okafor-sheet"
+    assert okafor.cache_mb == 32.0
+    assert [p.worksheet for p in okafor.programs.values()] == ["TRANSACTION_2027"]
+
+
+def test_scope_routes_programs_and_restores_the_caller(okafor):
+    default_programs = list_programs()
+    with tenant_scope("okafor"):
+        assert current_tenant() is okafor
+        assert get_active_program().year == 2027
+    assert current_tenant().slug == DEFAULT_TENANT
+    assert list_programs() == default_programs
+    with pytest.raises(KeyError):
+        with tenant_scope("nobody"):
+            pass
+
+
+def test_bound_callables_keep_the_tenant_in_other_threads(okafor):
+    seen = []
+    with tenant_scope("okafor"):
+        bound = tenant_bound(lambda: seen.append(current_tenant().slug))
+    thread = threading.Thread(target=bound)
+    thread.start()
+    thread.join()
+
+    assert seen == ["okafor"]
+
+
+def test_keys_and_metrics_are_per_tenant(okafor):
+    assert tenant_key("transactions") == "transactions"
+    assert tenant_key("transactions", "okafor") == "okafor.transactions"
+
+    before = tenant_metrics().get("sheet_reads", 0)
+    with tenant_scope("okafor"):
+        count("sheet_reads", 2)
+        assert tenant_metrics()["sheet_reads"] >= 2
+    assert tenant_metrics().get("sheet_reads", 0) == before
+
+
+def test_memoized_reads_are_isolated_per_tenant(okafor):
+    @runtime.MemoryCache().cache_data(ttl=60)
+    def sheet_id():
+        return current_tenant().sheet_id
+
+    default = sheet_id()
+    with tenant_scope("okafor"):
+        assert sheet_id() == "okafor-sheet"
+        assert runtime.tenant_budget() == 32 * 1024 * 1024
+    assert sheet_id() == default
+    with tenant_scope("okafor"):
+        sheet_id.clear()
+    sheet_id.clear()
@@ -0,0 +1,49 @@
+from src.Database.write_coordinator import CLAIM_TTL_SECONDS, WriteCoordinator
+
+
+def test_claim_writes_once_per_key():
+    coordinator = WriteCoordinator()
+    writes = []
+
+    assert coordinator.claim("submissions", "k", lambda: writes.append("k"), set)
+    assert not coordinator.claim("submissions", "k", lambda: writes.append("k"), set)
+    assert coordinator.claim("signups", "k", lambda: writes.append("k"), set)
+    assert writes == ["k", "k"]
+
+
+def test_known_keys_block_and_release_claims():
+    coordinator = WriteCoordinator()
+    assert not coordinator.claim("submissions", "k", lambda: None, lambda: {"k"})
+
+    coordinator.claim("submissions", "j", lambda: None, set)
+    assert coordinator.is_claimed("submissions", "j")
+    # Once the cached reads show the write, the claim is no longer needed.
+    coordinator.claim("submissions", "x", lambda: None, lambda: {"j"})
+    assert not coordinator.is_claimed("submissions", "j")
+
+
+def test_failed_write_does_not_claim():
+    coordinator = WriteCoordinator()
+    assert not coordinator.claim("submissions", "k", lambda: False, set)
+    assert not coordinator.is_claimed("submissions", "k")
+
+
+def test_claims_expire(monkeypatch):
+    coordinator = WriteCoordinator()
+    coordinator.claim("submissions", "k", lambda: None, set)
+
+    later = coordinator._claimed["submissions"]["k"] + CLAIM_TTL_SECONDS + 1
+    monkeypatch.setattr("src.Database.write_coordinator.time.monotonic", lambda: later)
+    assert coordinator.claim("submissions", "k", lambda: None, set)
+
+
+def test_claim_many_writes_only_fresh_keys():
+    coordinator = WriteCoordinator()
+    coordinator.claim("submissions", "b", lambda: None, set)
+    batches = []
+
+    written = coordinator.claim_many("submissions", ["c", "a", "b", "a", "d"], batches.append, lambda: {"d"})
+    assert written == ["c", "a"]
+    assert batches == [["c", "a"]]
+    assert coordinator.claim_many("submissions", ["a", "d"], batches.append, lambda: {"d"}) == []
+    assert len(batches) == 1